@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+
+import pandas as pd
+
+# Directory holding the builds written by precompute.py. Each build lives in
+# its own sub-directory; the LATEST file names the one the dashboards serve.
+# Can be overridden with the COVID_ARTIFACT_DIR environment variable.
+ARTIFACT_DIR = os.environ.get(
+    'COVID_ARTIFACT_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'artifacts')
+)
+
+MANIFEST = 'manifest.json'
+LATEST = 'LATEST'
+
+_manifest = {}
+_lock = threading.Lock()
+
+
+def latest_build():
+    """Return the directory of the build named by LATEST, or None if nothing was built yet."""
+    try:
+        with open(os.path.join(ARTIFACT_DIR, LATEST)) as f:
+            build_id = f.read().strip()
+    except OSError:
+        return None
+    return os.path.join(ARTIFACT_DIR, build_id) if build_id else None
+
+
+def load_manifest():
+    """Return ``(build_dir, manifest)`` for the latest build, or ``(None, None)``."""
+    build_dir = latest_build()
+    if build_dir is None:
+        return None, None
+    with _lock:
+        if _manifest.get('dir') != build_dir:
+            try:
+                with open(os.path.join(build_dir, MANIFEST)) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                return None, None
+            _manifest.update({'dir': build_dir, 'manifest': manifest})
+        return build_dir, _manifest['manifest']
+
+
+def _entry(section, name, version):
+    build_dir, manifest = load_manifest()
+    if manifest is None:
+        return None, None
+    entry = manifest.get(section, {}).get(name)
+    if entry is None or (version is not None and entry['version'] != version):
+        return None, None
+    return build_dir, entry
+
+
+def write_aggregate(directory, name, value):
+    """Write a node output (frame, series or tuple of them) as Parquet; return its manifest entry."""
+    items = value if isinstance(value, tuple) else (value,)
+    parts = []
+    for i, item in enumerate(items):
+        filename = f"{name}.parquet" if len(items) == 1 else f"{name}.{i}.parquet"
+        if isinstance(item, pd.Series):
+            part = {'file': filename, 'type': 'series', 'name': item.name}
+            item = item.to_frame('value')
+        elif isinstance(item, pd.DataFrame):
+            part = {'file': filename, 'type': 'frame'}
+        else:
+            raise TypeError(f"cannot store {type(item).__name__} output of {name!r}")
+        # Parquet reads text back as the string dtype; object columns are recorded so loading restores them
+        part['object_columns'] = [column for column, dtype in item.dtypes.items() if dtype == object]
+        part['object_index'] = bool(item.index.dtype == object)
+        item.to_parquet(os.path.join(directory, filename))
+        parts.append(part)
+    return {'parts': parts, 'tuple': isinstance(value, tuple)}
+
+
+def load_aggregate(name, version=None):
+    """Return the precomputed output of node ``name`` if it was built for ``version``, else None.
+
+    With ``version=None`` the output in the latest build is returned whatever its version.
+    """
+    build_dir, entry = _entry('aggregates', name, version)
+    if entry is None:
+        return None
+    items = []
+    for part in entry['parts']:
+        try:
+            item = pd.read_parquet(os.path.join(build_dir, 'aggregates', part['file']))
+        except (ImportError, ValueError, OSError):
+            return None
+        item = item.astype({column: object for column in part.get('object_columns', [])})
+        if part.get('object_index'):
+            item.index = item.index.astype(object)
+        if part['type'] == 'series':
+            item = item['value'].rename(part['name'])
+        items.append(item)
+    return tuple(items) if entry['tuple'] else items[0]
+
+
+def entry_version(section, name):
+    """Return the version recorded for an aggregate or figure in the latest build, or None."""
+    _, entry = _entry(section, name, None)
+    return entry['version'] if entry is not None else None
+
+
+def load_figure(view_id, version):
+    """Return the precomputed figure ``view_id`` if it was built for ``version``, else None.
+
+    Plotly figures are returned as ``go.Figure``, matplotlib figures as PNG bytes.
+    """
+    build_dir, entry = _entry('figures', view_id, version)
+    if entry is None:
+        return None
+    path = os.path.join(build_dir, 'figures', entry['file'])
+    try:
+        if entry['kind'] == 'plotly':
+            import plotly.io as pio
+            return pio.read_json(path)
+        with open(path, 'rb') as f:
+            return f.read()
+    except (OSError, ValueError):
+        return None
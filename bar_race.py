@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+import topn
+
+FRAME_DURATION = 1000  # ms per frame while playing
+TRANSITION_DURATION = 500
+
+# Styling shared by the two annotations of every frame
+_ANNOTATION_STYLE = dict(xref="paper", yref="paper", showarrow=False, align="center",
+                         bgcolor="white", bordercolor="black", borderwidth=1)
+
+
+def frame_dates(dates, step=1, freq=None):
+    """Return the dates that get a frame: every ``step``-th date, or the last date of each ``freq`` period.
+
+    ``dates`` must be sorted; the last date is always kept so the race ends
+    on the latest numbers.
+    """
+    dates = pd.DatetimeIndex(dates)
+    if freq is not None:
+        kept = pd.Series(dates, index=dates).resample(freq).last().dropna()
+        kept = pd.DatetimeIndex(kept.to_numpy())
+    else:
+        kept = dates[::step]
+    if len(dates) and kept[-1] != dates[-1]:
+        kept = kept.append(dates[-1:])
+    return kept
+
+
+def rank_frames(df, entity, time, value):
+    """Split a long frame into per-date arrays of entities and values, largest value first.
+
+    Done with one sort by (time, -value); the frames are slices of the
+    sorted arrays between consecutive date boundaries.
+    """
+    times = df[time].to_numpy()
+    values = df[value].to_numpy()
+    entities = df[entity].astype(str).to_numpy()
+    order = np.lexsort((-values, times))
+    times, values, entities = times[order], values[order], entities[order]
+
+    bounds = np.flatnonzero(times[1:] != times[:-1]) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [len(times)]))
+    return [(pd.Timestamp(times[start]), entities[start:end], values[start:end])
+            for start, end in zip(starts, ends)]
+
+
+def _annotations(leader, leader_value, label):
+    return [
+        dict(_ANNOTATION_STYLE, x=0.5, y=1.05, text=f"Leading State: {leader} ({leader_value:,.0f} cases)",
+             font=dict(size=16, color='darkblue')),
+        dict(_ANNOTATION_STYLE, x=0.5, y=-0.1, text=f"Date: {label}", font=dict(size=16, color='black')),
+    ]
+
+
+def build_figure(df, entity='state', time='date', value='cases', top_k=10, entities=None,
+                 step=1, freq=None, title="COVID-19 Confirmed Cases by State"):
+    """Build an animated horizontal bar race from a long frame.
+
+    The race shows ``entities`` or, if not given, the ``top_k`` entities with
+    the highest peak ``value``. ``step`` / ``freq`` thin the frames (see
+    ``frame_dates``). Each frame only carries its bar values and the layout
+    items that change (x range and annotations); trace styling, sliders and
+    buttons are set once on the figure.
+    """
+    if entities is None:
+        entities = topn.max_rows(df, entity, value, n=top_k)[entity].astype(str).tolist()
+    df = df[df[entity].astype(str).isin(entities)]
+    dates = frame_dates(np.unique(df[time].to_numpy()), step=step, freq=freq)
+    ranked = rank_frames(df[df[time].isin(dates)], entity, time, value)
+
+    # Frames are plain dicts: the figure validates them once when it is built
+    frames = []
+    for date, names, values in ranked:
+        label = date.strftime('%Y-%m-%d')
+        frames.append({
+            'name': label,
+            'data': [{'type': 'bar', 'x': values, 'y': names, 'marker': {'color': values}}],
+            'traces': [0],
+            'layout': {
+                'xaxis': {'range': [0, values.max() * 1.1]},
+                'annotations': _annotations(names[0], values[0], label),
+            },
+        })
+
+    first_date, first_names, first_values = ranked[0]
+    first_label = first_date.strftime('%Y-%m-%d')
+    return go.Figure(
+        data=[go.Bar(
+            x=first_values,
+            y=first_names,
+            orientation='h',
+            texttemplate='%{x:,.0f}',
+            hoverinfo='x+y+text',
+            marker=dict(color=first_values, colorscale='Cividis'),
+        )],
+        layout=go.Layout(
+            title=title,
+            xaxis=dict(title="Confirmed Cases", range=[0, first_values.max() * 1.1]),
+            yaxis=dict(title="State", autorange='reversed'),  # Reversed to have the highest on top
+            showlegend=False,
+            height=600,
+            plot_bgcolor='lightgray',
+            margin=dict(t=50, b=80, l=50, r=50),
+            annotations=_annotations(first_names[0], first_values[0], first_label),
+            sliders=[{
+                'steps': [
+                    {
+                        'args': [[frame['name']], {'frame': {'duration': FRAME_DURATION, 'redraw': True}, 'mode': 'immediate'}],
+                        'label': frame['name'],
+                        'method': 'animate',
+                    } for frame in frames
+                ],
+                'transition': {'duration': TRANSITION_DURATION},
+                'x': 0.1,
+                'len': 0.9,
+                'currentvalue': {'font': {'size': 16}, 'prefix': 'Date: ', 'visible': True, 'xanchor': 'center'},
+                'pad': {'b': 10, 't': 50},
+            }],
+            updatemenus=[{
+                'buttons': [
+                    {
+                        'args': [None, {'frame': {'duration': FRAME_DURATION, 'redraw': True}, 'fromcurrent': True}],
+                        'label': 'Play',
+                        'method': 'animate',
+                    },
+                    {
+                        'args': [[None], {'frame': {'duration': 0, 'redraw': True}, 'mode': 'immediate'}],
+                        'label': 'Pause',
+                        'method': 'animate',
+                    },
+                ],
+                'direction': 'left',
+                'pad': {'r': 10, 't': 70},
+                'showactive': False,
+                'type': 'buttons',
+                'x': 0.1,
+                'xanchor': 'right',
+                'y': 0,
+                'yanchor': 'top',
+            }],
+        ),
+        frames=frames,
+    )
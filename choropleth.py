@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from bar_race import FRAME_DURATION, frame_dates
+from dimensions import COUNTRIES
+
+# Cadences offered by the dashboard: label -> resampling frequency (None keeps every day)
+CADENCES = {'Daily': None, 'Weekly': 'W', 'Monthly': 'ME'}
+
+# Frames sent to the browser at once; later frames are sent when their page is selected
+PAGE_SIZE = 60
+
+# Decimals kept for the rates in the generated page
+VALUE_DECIMALS = 2
+
+
+def prepare(df_map, value, freq=None):
+    """Reduce ``df_map`` to one row per frame and one column per country.
+
+    Only the last reporting day of each ``freq`` period is kept (all days if
+    None); the rates are ratios of cumulative counts, so that day describes
+    the whole period. Returns a frame indexed by Date with one column per
+    ISO3 code; rates that cannot be computed (no cases yet) are NaN.
+    """
+    df_map = df_map[df_map['iso_alpha'].notna()]
+    dates = frame_dates(np.unique(df_map['Date'].to_numpy()), freq=freq)
+    df_map = df_map[df_map['Date'].isin(dates)]
+    values = df_map.pivot_table(index='Date', columns='iso_alpha', values=value, aggfunc='last')
+    values.columns = values.columns.astype(str)
+    return values.replace([np.inf, -np.inf], np.nan).round(VALUE_DECIMALS)
+
+
+def pages(n_frames, page_size=PAGE_SIZE):
+    """Return the ``(start, end)`` frame positions of each page."""
+    return [(start, min(start + page_size, n_frames)) for start in range(0, max(n_frames, 1), page_size)]
+
+
+def _z(row):
+    # NaN is not valid JSON; plotly leaves countries without a value blank
+    return [None if np.isnan(value) else value for value in row.tolist()]
+
+
+def build_figure(values, title, colorscale, label, page=0, page_size=PAGE_SIZE):
+    """Build an animated choropleth of the frames of ``values`` (see ``prepare``) on page ``page``.
+
+    The countries, their names and the colour range are set once on the
+    trace; each frame only carries its array of z values. The colour range
+    covers all pages, so colours mean the same on every page. Without
+    any frames the map is drawn empty.
+    """
+    start, end = pages(len(values), page_size)[page]
+    locations = values.columns.tolist()
+    names = COUNTRIES.names(COUNTRIES.resolve(pd.Series(locations), warn=False)).tolist()
+    matrix = values.to_numpy(dtype='float64')
+    zmin, zmax = (float(np.nanmin(matrix)), float(np.nanmax(matrix))) if np.isfinite(matrix).any() else (0, 1)
+    labels = pd.DatetimeIndex(values.index).strftime('%Y-%m-%d').tolist()
+
+    # Frames are plain dicts: the figure validates them once when it is built
+    frames = [{'name': labels[i], 'data': [{'type': 'choropleth', 'z': _z(matrix[i])}], 'traces': [0]}
+              for i in range(start, end)]
+    return go.Figure(
+        data=[go.Choropleth(
+            locations=locations,
+            z=frames[0]['data'][0]['z'] if frames else [],
+            hovertext=names,
+            hovertemplate='%{hovertext}<br>' + label + ': %{z}<extra></extra>',
+            colorscale=colorscale,
+            zmin=zmin,
+            zmax=zmax,
+            colorbar=dict(title=label),
+        )],
+        layout=go.Layout(
+            title=title,
+            geo=dict(showframe=False, showcoastlines=True),
+            margin=dict(t=50, b=0, l=0, r=0),
+            sliders=[{
+                'steps': [
+                    {
+                        'args': [[frame['name']], {'frame': {'duration': 0, 'redraw': True}, 'mode': 'immediate'}],
+                        'label': frame['name'],
+                        'method': 'animate',
+                    } for frame in frames
+                ],
+                'currentvalue': {'prefix': 'Date: '},
+                'x': 0.1,
+                'len': 0.9,
+                'pad': {'b': 10, 't': 30},
+            }],
+            updatemenus=[{
+                'buttons': [
+                    {
+                        'args': [None, {'frame': {'duration': FRAME_DURATION, 'redraw': True}, 'fromcurrent': True}],
+                        'label': 'Play',
+                        'method': 'animate',
+                    },
+                    {
+                        'args': [[None], {'frame': {'duration': 0, 'redraw': True}, 'mode': 'immediate'}],
+                        'label': 'Pause',
+                        'method': 'animate',
+                    },
+                ],
+                'direction': 'left',
+                'pad': {'r': 10, 't': 40},
+                'showactive': False,
+                'type': 'buttons',
+                'x': 0.1,
+                'xanchor': 'right',
+                'y': 0,
+                'yanchor': 'top',
+            }],
+        ),
+        frames=frames,
+    )
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+from sklearn.preprocessing import StandardScaler
+
+from dimensions import COUNTRIES
+
+# Columns of the feature matrix used for clustering
+FEATURES = [
+    'log_confirmed', 'log_deaths',                   # latest totals
+    'cases_per_100k', 'deaths_per_100k',             # per-capita rates
+    'deaths_per_100_cases', 'recovered_per_100_cases',
+    'peak_timing', 'current_vs_peak', 'growth_rate',  # shape of the daily curve
+]
+
+# Above this many entities MiniBatchKMeans is used instead of KMeans
+MINIBATCH_THRESHOLD = 10_000
+
+# Silhouette scores are computed on at most this many entities
+SILHOUETTE_SAMPLE = 5_000
+
+RANDOM_STATE = 42
+
+
+def population(vaccination):
+    """Return the population per country id, derived from total vaccinations and vaccinations per 100 people."""
+    df = vaccination.dropna(subset=['TOTAL_VACCINATIONS', 'TOTAL_VACCINATIONS_PER100'])
+    df = df[df['TOTAL_VACCINATIONS_PER100'] > 0]
+    return (df['TOTAL_VACCINATIONS'] / df['TOTAL_VACCINATIONS_PER100'] * 100).groupby(df['country_id']).first()
+
+
+def country_features(metrics_cube, population, exclude=()):
+    """Build the per-entity feature matrix from a metrics cube (see ``metrics.derive``).
+
+    Totals are the latest gap-filled cumulative counts. Per-capita rates use
+    ``population`` (indexed by country id); entities without a population get the
+    median rate. The curve-shape features describe the rolling mean of daily
+    confirmed cases: when it peaked (0 = first report, 1 = latest date), its
+    latest value relative to the peak, and the latest growth rate.
+    """
+    cube = metrics_cube
+    plane = lambda metric: np.asarray(cube.values[:, :, cube.metric_index(metric)], dtype=np.float64)
+    confirmed, deaths, recovered = plane('Confirmed')[-1], plane('Deaths')[-1], plane('Recovered')[-1]
+    average = np.nan_to_num(plane('7_day_avg_confirmed'))
+
+    observed = np.asarray(cube.observed)
+    first = observed.argmax(axis=0)
+    duration = np.maximum(len(cube.dates) - 1 - first, 1)
+    peak = average.max(axis=0)
+
+    features = pd.DataFrame({
+        'Confirmed': confirmed,
+        'Deaths': deaths,
+        'Recovered': recovered,
+        'log_confirmed': np.log1p(confirmed),
+        'log_deaths': np.log1p(deaths),
+        'population': COUNTRIES.resolve(pd.Series(cube.entities), warn=False).map(population).to_numpy(),
+        'deaths_per_100_cases': np.where(confirmed > 0, deaths / np.maximum(confirmed, 1) * 100, 0),
+        'recovered_per_100_cases': np.where(confirmed > 0, recovered / np.maximum(confirmed, 1) * 100, 0),
+        'peak_timing': (average.argmax(axis=0) - first) / duration,
+        'current_vs_peak': np.where(peak > 0, average[-1] / np.where(peak > 0, peak, 1), 0),
+        'growth_rate': np.nan_to_num(plane('growth_rate')[-1]),
+    }, index=pd.Index(cube.entities, name=cube.entity_name))
+    features['cases_per_100k'] = features['Confirmed'] / features['population'] * 1e5
+    features['deaths_per_100k'] = features['Deaths'] / features['population'] * 1e5
+    for column in ['cases_per_100k', 'deaths_per_100k']:
+        features[column] = features[column].fillna(features[column].median()).fillna(0)
+    return features.drop(index=[entity for entity in exclude if entity in features.index])
+
+
+def _model(n_clusters, n_entities, method):
+    if method == 'auto':
+        method = 'minibatch' if n_entities > MINIBATCH_THRESHOLD else 'kmeans'
+    if method == 'minibatch':
+        return MiniBatchKMeans(n_clusters=n_clusters, random_state=RANDOM_STATE, n_init=3)
+    return KMeans(n_clusters=n_clusters, random_state=RANDOM_STATE, n_init=10)
+
+
+def fit(features, n_clusters=4, method='auto'):
+    """Cluster the rows of ``features`` on the ``FEATURES`` columns.
+
+    ``method`` is 'kmeans', 'minibatch' or 'auto' (MiniBatchKMeans above
+    ``MINIBATCH_THRESHOLD`` rows). Returns ``features`` with a Cluster column.
+    """
+    scaled = StandardScaler().fit_transform(features[FEATURES])
+    model = _model(n_clusters, len(scaled), method).fit(scaled)
+    clustered = features.copy()
+    clustered['Cluster'] = model.labels_
+    return clustered
+
+
+def _score(args):
+    scaled, n_clusters, method = args
+    model = _model(n_clusters, len(scaled), method).fit(scaled)
+    sample = min(len(scaled), SILHOUETTE_SAMPLE)
+    silhouette = silhouette_score(scaled, model.labels_, sample_size=sample, random_state=RANDOM_STATE)
+    return n_clusters, model.inertia_, silhouette
+
+
+def sweep(features, ks=range(2, 11), method='auto'):
+    """Fit one model per number of clusters in ``ks`` and score it.
+
+    The fits run in the dashboards' worker pool (see ``render_service.run``).
+    Returns a frame with the inertia and silhouette score of every ``k``.
+    """
+    # Imported here: render_service loads the figure registry, which imports this module
+    import render_service
+
+    scaled = StandardScaler().fit_transform(features[FEATURES])
+    jobs = [(scaled, k, method) for k in ks if 1 < k < len(scaled)]
+    return pd.DataFrame(render_service.run(_score, jobs), columns=['k', 'inertia', 'silhouette'])
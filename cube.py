@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_cache import CACHE_DIR
+
+# Directory holding the memory-mapped cubes.
+# Can be overridden with the COVID_CUBE_DIR environment variable.
+CUBE_DIR = os.environ.get('COVID_CUBE_DIR', os.path.join(os.path.dirname(CACHE_DIR), 'cube'))
+
+
+class Cube:
+    """Dense date x entity x metric array with label lookup tables.
+
+    ``values[d, e, m]`` holds the sum of metric ``m`` for entity ``e`` on the
+    ``d``-th date; ``observed[d, e]`` tells whether the source had any row for
+    that pair. Dates are sorted, so per-entity and per-date queries are plain
+    array slices.
+    """
+
+    def __init__(self, values, observed, dates, entities, metrics, date_name='Date', entity_name='Entity'):
+        self.values = values
+        self.observed = observed
+        self.dates = pd.DatetimeIndex(dates)
+        self.entities = pd.Index(entities)
+        self.metrics = list(metrics)
+        self.date_name = date_name
+        self.entity_name = entity_name
+
+    @classmethod
+    def from_frame(cls, df, date_column, entity_column, metrics):
+        """Build a cube by summing ``metrics`` over every (date, entity) pair of ``df``."""
+        date_codes, dates = pd.factorize(df[date_column], sort=True)
+        entity_codes, entities = pd.factorize(df[entity_column].astype(str), sort=True)
+        n_dates, n_entities = len(dates), len(entities)
+        flat = date_codes * n_entities + entity_codes
+
+        values = np.empty((n_dates, n_entities, len(metrics)), dtype=np.float32)
+        for i, metric in enumerate(metrics):
+            weights = df[metric].to_numpy(dtype=np.float64, na_value=0)
+            values[:, :, i] = np.bincount(flat, weights=weights, minlength=n_dates * n_entities).reshape(n_dates, n_entities)
+        observed = (np.bincount(flat, minlength=n_dates * n_entities) > 0).reshape(n_dates, n_entities)
+        return cls(values, observed, dates, entities, metrics, date_column, entity_column)
+
+    def save(self, path):
+        """Write the cube to ``path`` (.npy) plus ``.observed.npy`` and ``.labels.json`` side files."""
+        stem = path[:-len('.npy')] if path.endswith('.npy') else path
+        os.makedirs(os.path.dirname(os.path.abspath(stem)), exist_ok=True)
+        np.save(f"{stem}.observed.npy", self.observed)
+        labels = {
+            'dates': [str(date.date()) for date in self.dates],
+            'entities': list(self.entities),
+            'metrics': self.metrics,
+            'date_name': self.date_name,
+            'entity_name': self.entity_name,
+        }
+        with open(f"{stem}.labels.json", 'w') as f:
+            json.dump(labels, f)
+
+        # The values file is written last and renamed into place, so its presence marks a complete cube
+        tmp_path = f"{stem}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, self.values)
+        os.replace(tmp_path, f"{stem}.npy")
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a cube written by ``save``; the arrays are memory-mapped read-only by default."""
+        stem = path[:-len('.npy')] if path.endswith('.npy') else path
+        mmap_mode = 'r' if mmap else None
+        values = np.load(f"{stem}.npy", mmap_mode=mmap_mode)
+        observed = np.load(f"{stem}.observed.npy", mmap_mode=mmap_mode)
+        with open(f"{stem}.labels.json") as f:
+            labels = json.load(f)
+        return cls(values, observed, pd.to_datetime(labels['dates']), labels['entities'], labels['metrics'],
+                   labels['date_name'], labels['entity_name'])
+
+    def metric_index(self, metric):
+        return self.metrics.index(metric)
+
+    def date_range(self, start=None, end=None):
+        """Return the slice of date positions between ``start`` and ``end`` (inclusive)."""
+        lo = 0 if start is None else self.dates.searchsorted(pd.Timestamp(start), side='left')
+        hi = len(self.dates) if end is None else self.dates.searchsorted(pd.Timestamp(end), side='right')
+        return slice(lo, hi)
+
+    def series(self, entity, metric):
+        """Return one entity's metric over all dates as a Series."""
+        values = self.values[:, self.entities.get_loc(entity), self.metric_index(metric)]
+        return pd.Series(np.asarray(values), index=self.dates, name=metric)
+
+    def top_entities(self, metric, n, reduce='max'):
+        """Return the ``n`` entities with the largest ``reduce`` of ``metric`` over time."""
+        plane = self.values[:, :, self.metric_index(metric)]
+        scores = getattr(np, reduce)(plane, axis=0)
+        order = np.argsort(-scores, kind='stable')[:n]
+        return self.entities[order]
+
+    def to_frame(self, entities=None, start=None, end=None):
+        """Return the observed cells as a long frame with date, entity and metric columns.
+
+        ``entities`` restricts the result to a subset of entities and
+        ``start`` / ``end`` to a date range.
+        """
+        dates = self.date_range(start, end)
+        if entities is None:
+            entity_pos = np.arange(len(self.entities))
+        else:
+            entity_pos = self.entities.get_indexer(list(entities))
+            entity_pos = entity_pos[entity_pos >= 0]
+
+        values = self.values[dates][:, entity_pos]
+        observed = self.observed[dates][:, entity_pos]
+        date_idx, entity_idx = np.nonzero(observed)
+        frame = pd.DataFrame({
+            self.date_name: self.dates[dates][date_idx],
+            self.entity_name: pd.Categorical.from_codes(entity_pos[entity_idx], categories=self.entities),
+        })
+        for i, metric in enumerate(self.metrics):
+            frame[metric] = values[date_idx, entity_idx, i]
+        return frame
+
+
+_cubes = {}
+# Reentrant: a cube's build may load the cube it is derived from
+_lock = threading.RLock()
+
+
+def load_or_build(name, version, build):
+    """Return the memory-mapped cube ``name`` for ``version``, building and saving it if needed.
+
+    ``build`` is called with no arguments and must return a ``Cube``. Cubes
+    written for older versions are removed.
+    """
+    with _lock:
+        if name in _cubes and _cubes[name][0] == version:
+            return _cubes[name][1]
+
+        path = os.path.join(CUBE_DIR, f"{name}.{version}.npy")
+        if not os.path.exists(path):
+            build().save(path)
+            for stale in os.listdir(CUBE_DIR):
+                if stale.startswith(f"{name}.") and not stale.startswith(f"{name}.{version}."):
+                    os.remove(os.path.join(CUBE_DIR, stale))
+        cube = Cube.load(path)
+        _cubes[name] = (version, cube)
+        return cube
@@ -0,0 +1,102 @@
+import glob
+import hashlib
+import os
+
+import pandas as pd
+
+# Directory holding the columnar copies of the CSV sources.
+# Can be overridden with the COVID_CACHE_DIR environment variable.
+CACHE_DIR = os.environ.get(
+    'COVID_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'parquet')
+)
+
+
+def _hash(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def source_signature(path):
+    """Return a short hash identifying the current contents of a source file.
+
+    The signature is built from the file's size and modification time, so it
+    changes whenever the CSV is replaced or edited.
+    """
+    stat = os.stat(path)
+    return _hash(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}")[:16]
+
+
+def _variant_key(clean, read_kwargs, version=''):
+    # Different cleaning functions / read options / cleaning versions for the
+    # same CSV must not share a cache entry
+    clean_name = f"{clean.__module__}.{clean.__qualname__}" if clean is not None else ''
+    return _hash(f"{clean_name}|{version}|{sorted(read_kwargs.items())!r}")[:8]
+
+
+def _cache_path(path, variant, signature):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    stem = ''.join(ch if ch.isalnum() or ch in '-_' else '_' for ch in stem)
+    return os.path.join(CACHE_DIR, f"{stem}.{variant}.{signature}.parquet")
+
+
+def read_csv_cached(path, clean=None, version='', **read_kwargs):
+    """Read a CSV file through the on-disk Parquet cache.
+
+    On the first call the CSV is parsed with ``pd.read_csv(path, **read_kwargs)``,
+    passed through ``clean`` (if given) and written to ``CACHE_DIR`` as Parquet.
+    Later calls load the Parquet copy directly as long as the source file's
+    size and modification time are unchanged. ``version`` identifies the data
+    the cleaning depends on (e.g. lookup tables); changing it invalidates the
+    cached copies.
+
+    If no Parquet engine is installed, or the frame cannot be stored, the
+    cleaned CSV is returned without caching.
+    """
+    variant = _variant_key(clean, read_kwargs, version)
+    signature = source_signature(path)
+    cache_file = _cache_path(path, variant, signature)
+
+    if os.path.exists(cache_file):
+        try:
+            return pd.read_parquet(cache_file)
+        except (ImportError, ValueError, OSError):
+            # Corrupt or unreadable cache entry, fall through and rebuild it
+            pass
+
+    df = pd.read_csv(path, **read_kwargs)
+    if clean is not None:
+        df = clean(df)
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_file)
+        os.replace(tmp_file, cache_file)
+    except (ImportError, ValueError, TypeError, NotImplementedError, OSError):
+        return df
+
+    # Remove cache entries written for older versions of the same source
+    for stale in glob.glob(_cache_path(path, variant, '*')):
+        if stale != cache_file:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return df
+
+
+def cached_parquet(path, clean=None, version='', **read_kwargs):
+    """Return the path of the up-to-date Parquet copy of a CSV, writing it first if needed.
+
+    Returns None if the copy cannot be stored (e.g. no Parquet engine).
+    """
+    cache_file = _cache_path(path, _variant_key(clean, read_kwargs, version), source_signature(path))
+    if not os.path.exists(cache_file):
+        read_csv_cached(path, clean=clean, version=version, **read_kwargs)
+    return cache_file if os.path.exists(cache_file) else None
+
+
+def clear_cache():
+    """Delete every Parquet file in the cache directory."""
+    for cache_file in glob.glob(os.path.join(CACHE_DIR, '*.parquet')):
+        os.remove(cache_file)
@@ -0,0 +1,229 @@
+import os
+import threading
+
+import pandas as pd
+
+import dimensions
+from data_cache import cached_parquet, read_csv_cached, source_signature
+from dimensions import COUNTRIES, STATES
+
+# Every caller shares one in-memory copy of each dataset and receives a
+# shallow view of it; Copy-on-Write makes writes to a view copy the touched
+# columns instead of modifying the shared frame. It is the default from pandas 3.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# Directory containing the raw CSV files.
+# Can be overridden with the COVID_DATA_DIR environment variable.
+DATA_DIR = os.environ.get('COVID_DATA_DIR', '/Users/ayyalashriyatha/Desktop')
+
+def normalize_state_names(states):
+    """Map every known spelling variant of a state name to its canonical form."""
+    return STATES.canonical(states)
+
+
+def _as_category(df, columns):
+    for column in columns:
+        df[column] = df[column].astype('category')
+    return df
+
+
+def _clean_global(df):
+    # Fill missing values in global data
+    df['Province/State'] = df['Province/State'].fillna('Unknown')
+
+    # Clean negative values; per-row counts fit comfortably in 32 bits
+    for column in ['Confirmed', 'Deaths', 'Recovered']:
+        df[column] = df[column].clip(lower=0).fillna(0).astype('int32')
+    df = _as_category(df, ['Province/State', 'Country/Region'])
+    df['country_id'] = COUNTRIES.resolve(df['Country/Region'])
+    return df
+
+
+def _clean_india(df):
+    df['Active_cases'] = df['Confirmed'] - (df['Cured'] + df['Deaths'])
+    df = _as_category(df, ['State/UnionTerritory'])
+    df['state_id'] = STATES.resolve(df['State/UnionTerritory'])
+    df['State/UnionTerritory'] = normalize_state_names(df['State/UnionTerritory'])
+    return _as_category(df, ['State/UnionTerritory'])
+
+
+def _clean_india_complete(df):
+    df = _as_category(df, ['Name of State / UT'])
+    df['state_id'] = STATES.resolve(df['Name of State / UT'])
+    df['Name of State / UT'] = normalize_state_names(df['Name of State / UT'])
+    df['Date'] = pd.to_datetime(df['Date'], format='%Y-%m-%d', errors='coerce')
+
+    # Convert Death column to numeric, handling non-numeric entries by setting them to 0
+    df['Death'] = pd.to_numeric(df['Death'], errors='coerce').fillna(0).astype('int32')
+    for column in ['Total Confirmed cases', 'Cured/Discharged/Migrated']:
+        df[column] = df[column].astype('int32')
+    return _as_category(df, ['Name of State / UT'])
+
+
+def _clean_india_vaccine(df):
+    df = _as_category(df, ['State'])
+    df['state_id'] = STATES.resolve(df['State'])
+    return df
+
+
+def _clean_confirmed_wide(df):
+    date_columns = df.columns.drop('state')
+    df[date_columns] = df[date_columns].astype('float32')
+    df = _as_category(df, ['state'])
+    state_id = STATES.resolve(df['state'])
+    df['state'] = normalize_state_names(df['state'])
+    df = _as_category(df, ['state'])
+    return pd.concat([df[['state']], state_id, df[date_columns]], axis=1)
+
+
+def _clean_testing(df):
+    df['year_week_date'] = pd.to_datetime(df['year_week'] + '-1', format='%G-W%V-%u')
+    df['new_cases'] = df['new_cases'].fillna(0).astype('int32')
+    df['tests_done'] = df['tests_done'].fillna(0).astype('int32')
+
+    # Calculate positivity rate safely and cap it at 100%
+    df['calculated_positivity_rate'] = (df['new_cases'] / df['tests_done']).replace([float('inf'), -float('inf')], 0) * 100
+    df['calculated_positivity_rate'] = df['calculated_positivity_rate'].fillna(0).clip(upper=100)
+    df = _as_category(df, ['country'])
+    df['country_id'] = COUNTRIES.resolve(df['country'])
+    return df
+
+
+def _clean_vaccination(df):
+    df = df.dropna(subset=['TOTAL_VACCINATIONS', 'PERSONS_VACCINATED_1PLUS_DOSE'])
+    df = df.drop_duplicates()
+    df['country_id'] = COUNTRIES.resolve(df['ISO3'])
+    return _as_category(df, ['WHO_REGION'])
+
+
+def _clean_world_timeseries(df):
+    df = _as_category(df, ['Country/Region'])
+    df['country_id'] = COUNTRIES.resolve(df['Country/Region'])
+    return df
+
+
+# name -> (file name in DATA_DIR, cleaning function, extra pd.read_csv arguments)
+# Only the columns the dashboards use are read. Count columns without gaps are
+# read straight into 32-bit integers; columns that may be empty are read as
+# floats and narrowed by the cleaning function once the gaps are filled.
+DATASETS = {
+    'global': ('covid_19_data.csv', _clean_global, {
+        'usecols': ['ObservationDate', 'Province/State', 'Country/Region', 'Confirmed', 'Deaths', 'Recovered'],
+        'parse_dates': ['ObservationDate'],
+        'date_format': '%m/%d/%Y',
+    }),
+    'india': ('covid_19_india.csv', _clean_india, {
+        'usecols': ['Date', 'State/UnionTerritory', 'Cured', 'Deaths', 'Confirmed'],
+        'dtype': {'Cured': 'int32', 'Deaths': 'int32', 'Confirmed': 'int32'},
+        'parse_dates': ['Date'],
+        'date_format': '%Y-%m-%d',
+    }),
+    'india_complete': ('complete.csv', _clean_india_complete, {
+        'usecols': ['Date', 'Name of State / UT', 'Latitude', 'Longitude', 'Total Confirmed cases',
+                    'Death', 'Cured/Discharged/Migrated', 'New cases'],
+        'dtype': {'Latitude': 'float32', 'Longitude': 'float32', 'New cases': 'int32'},
+    }),
+    'india_vaccine': ('covid_vaccine_statewise.csv', _clean_india_vaccine, {
+        'usecols': ['Updated On', 'State', 'Total Doses Administered', 'First Dose Administered',
+                    'Second Dose Administered', 'Male (Doses Administered)', 'Female (Doses Administered)',
+                    'Transgender (Doses Administered)', ' Covaxin (Doses Administered)',
+                    'CoviShield (Doses Administered)', 'Sputnik V (Doses Administered)',
+                    '18-44 Years (Doses Administered)', '45-60 Years (Doses Administered)',
+                    '60+ Years (Doses Administered)', 'Male(Individuals Vaccinated)',
+                    'Female(Individuals Vaccinated)', 'Total Individuals Vaccinated'],
+        'parse_dates': ['Updated On'],
+        'date_format': '%d/%m/%Y',
+    }),
+    'india_confirmed_wide': ('confirmed_cases_india.csv', _clean_confirmed_wide, {}),
+    'testing': ('data.csv', _clean_testing, {
+        'usecols': ['country', 'year_week', 'new_cases', 'tests_done'],
+        'encoding': 'utf-8-sig',
+    }),
+    'vaccination': ('vaccination-data.csv', _clean_vaccination, {
+        'usecols': ['COUNTRY', 'ISO3', 'WHO_REGION', 'DATE_UPDATED', 'TOTAL_VACCINATIONS',
+                    'PERSONS_VACCINATED_1PLUS_DOSE', 'TOTAL_VACCINATIONS_PER100',
+                    'PERSONS_VACCINATED_1PLUS_DOSE_PER100', 'PERSONS_LAST_DOSE', 'PERSONS_LAST_DOSE_PER100',
+                    'PERSONS_BOOSTER_ADD_DOSE', 'PERSONS_BOOSTER_ADD_DOSE_PER100'],
+        'parse_dates': ['DATE_UPDATED'],
+        'date_format': '%Y-%m-%d',
+    }),
+    'world_timeseries': ('time-series-19-covid-combined (1).csv', _clean_world_timeseries, {
+        'usecols': ['Date', 'Country/Region', 'Lat', 'Long', 'Confirmed', 'Recovered', 'Deaths'],
+        'dtype': {'Lat': 'float32', 'Long': 'float32', 'Confirmed': 'int32', 'Deaths': 'int32',
+                  'Recovered': 'float32'},
+        'parse_dates': ['Date'],
+        'date_format': '%Y-%m-%d',
+    }),
+}
+
+_store = {}
+_lock = threading.RLock()
+
+
+def shallow_view(obj):
+    """Return a copy-on-write view of a frame, series or tuple of them."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return obj.copy(deep=False)
+    if isinstance(obj, tuple):
+        return tuple(shallow_view(item) for item in obj)
+    return obj
+
+
+def dataset_path(name):
+    return os.path.join(DATA_DIR, DATASETS[name][0])
+
+
+def dataset_version(name):
+    """Return the version of dataset ``name``; it changes whenever its CSV or the dimension tables change."""
+    return f"{source_signature(dataset_path(name))}-{dimensions.VERSION}"
+
+
+def dataset_parquet(name):
+    """Return the path of the cleaned Parquet copy of dataset ``name``, or None if there is none."""
+    filename, clean, read_kwargs = DATASETS[name]
+    return cached_parquet(dataset_path(name), clean=clean, version=dimensions.VERSION, **read_kwargs)
+
+
+def get_dataset(name):
+    """Return a view of the cleaned dataset ``name`` (a key of ``DATASETS``).
+
+    The CSV is parsed at most once per version of the source file; every call
+    returns a shallow view of the same in-memory frame, so callers may add or
+    overwrite columns without affecting each other.
+    """
+    filename, clean, read_kwargs = DATASETS[name]
+    version = dataset_version(name)
+    with _lock:
+        if name not in _store or _store[name][0] != version:
+            _store[name] = (version, read_csv_cached(dataset_path(name), clean=clean, version=dimensions.VERSION, **read_kwargs))
+        return shallow_view(_store[name][1])
+
+
+def clear():
+    """Drop every dataset held in memory, e.g. after the source files were refreshed."""
+    with _lock:
+        _store.clear()
+
+
+def memory_usage(df):
+    """Return the deep memory footprint of a frame in bytes."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def memory_report(names=None):
+    """Compare each dataset's memory use under default ``pd.read_csv`` dtypes with the typed loader."""
+    rows = []
+    for name in names or DATASETS:
+        path = dataset_path(name)
+        if not os.path.exists(path):
+            continue
+        before = memory_usage(pd.read_csv(path))
+        after = memory_usage(get_dataset(name))
+        rows.append({'dataset': name, 'default_bytes': before, 'typed_bytes': after,
+                     'reduction_pct': round(100 * (1 - after / before), 1)})
+    return pd.DataFrame(rows).set_index('dataset')
+
+
+if __name__ == "__main__":
+    print(memory_report())
@@ -0,0 +1,218 @@
+import hashlib
+import threading
+import unicodedata
+import warnings
+
+import numpy as np
+import pandas as pd
+import pycountry
+
+# Id of a name that is in no dimension table
+UNKNOWN = -1
+
+# Indian states and union territories: id -> canonical name. Ids are fixed;
+# new members are appended. 98 and 99 are reporting units, not regions.
+STATE_MEMBERS = {
+    1: 'Andaman and Nicobar Islands', 2: 'Andhra Pradesh', 3: 'Arunachal Pradesh', 4: 'Assam',
+    5: 'Bihar', 6: 'Chandigarh', 7: 'Chhattisgarh', 8: 'Dadra and Nagar Haveli and Daman and Diu',
+    9: 'Delhi', 10: 'Goa', 11: 'Gujarat', 12: 'Haryana', 13: 'Himachal Pradesh',
+    14: 'Jammu and Kashmir', 15: 'Jharkhand', 16: 'Karnataka', 17: 'Kerala', 18: 'Ladakh',
+    19: 'Lakshadweep', 20: 'Madhya Pradesh', 21: 'Maharashtra', 22: 'Manipur', 23: 'Meghalaya',
+    24: 'Mizoram', 25: 'Nagaland', 26: 'Odisha', 27: 'Puducherry', 28: 'Punjab', 29: 'Rajasthan',
+    30: 'Sikkim', 31: 'Tamil Nadu', 32: 'Telangana', 33: 'Tripura', 34: 'Uttar Pradesh',
+    35: 'Uttarakhand', 36: 'West Bengal',
+    98: 'India',  # national totals in the vaccination file
+    99: 'Unassigned',
+}
+
+# Spelling variants of state / UT names in the source files and in the
+# state boundary GeoJSON -> canonical name. The two UTs merged in 2020 map
+# to the merged territory.
+STATE_ALIASES = {
+    'Maharashtra***': 'Maharashtra',
+    'Bihar****': 'Bihar',
+    'Madhya Pradesh***': 'Madhya Pradesh',
+    'Karanataka': 'Karnataka',
+    'Himanchal Pradesh': 'Himachal Pradesh',
+    'Telengana': 'Telangana',
+    'Telangana***': 'Telangana',
+    'Telengana***': 'Telangana',
+    'Union Territory of Ladakh': 'Ladakh',
+    'Union Territory of Jammu and Kashmir': 'Jammu and Kashmir',
+    'Union Territory of Chandigarh': 'Chandigarh',
+    'Dadra and Nagar Haveli': 'Dadra and Nagar Haveli and Daman and Diu',
+    'Dadar Nagar Haveli': 'Dadra and Nagar Haveli and Daman and Diu',
+    'Dadara & Nagar Havelli': 'Dadra and Nagar Haveli and Daman and Diu',
+    'Daman & Diu': 'Dadra and Nagar Haveli and Daman and Diu',
+    'Daman and Diu': 'Dadra and Nagar Haveli and Daman and Diu',
+    'Cases being reassigned to states': 'Unassigned',
+    'Andaman and Nicobar': 'Andaman and Nicobar Islands',
+    'Andaman & Nicobar Island': 'Andaman and Nicobar Islands',
+    'Arunanchal Pradesh': 'Arunachal Pradesh',
+    'Jammu & Kashmir': 'Jammu and Kashmir',
+    'NCT of Delhi': 'Delhi',
+    'Orissa': 'Odisha',
+    'Pondicherry': 'Puducherry',
+    'Uttaranchal': 'Uttarakhand',
+}
+
+# Reporting units without an ISO 3166-1 code: ISO3 -> (id, name). The codes
+# are from the range ISO reserves for user assignment (X..).
+EXTRA_COUNTRIES = {
+    'XKX': (900, 'Kosovo'),
+    'XDP': (901, 'Diamond Princess'),
+    'XMZ': (902, 'MS Zaandam'),
+    'XOT': (903, 'Others'),
+}
+
+# Country names in the source files that pycountry does not resolve (or
+# resolves wrongly) -> ISO3
+COUNTRY_ALIASES = {
+    'Bolivia (Plurinational State of)': 'BOL',
+    'Brunei': 'BRN',
+    'Burma': 'MMR',
+    'Cape Verde': 'CPV',
+    'China, Hong Kong SAR': 'HKG',
+    'China, Macao SAR': 'MAC',
+    'Congo (Brazzaville)': 'COG',
+    'Congo (Kinshasa)': 'COD',
+    'Republic of the Congo': 'COG',
+    'Democratic Republic of the Congo': 'COD',
+    "Cote d'Ivoire": 'CIV',
+    "C\ufffdte d'Ivoire": 'CIV',  # accents lost to a wrong encoding in vaccination-data.csv
+    'Ivory Coast': 'CIV',
+    'Curacao': 'CUW',
+    'Cura\ufffdao': 'CUW',
+    'Czech Republic': 'CZE',
+    'East Timor': 'TLS',
+    'Holy See': 'VAT',
+    'Vatican City': 'VAT',
+    'Hong Kong': 'HKG',
+    'Macau': 'MAC',
+    'Iran (Islamic Republic of)': 'IRN',
+    'Korea, South': 'KOR',
+    'South Korea': 'KOR',
+    'Republic of Korea': 'KOR',
+    'Kosovo': 'XKX',
+    'Kosovo (in accordance with UN Security Council resolution 1244 (1999))': 'XKX',
+    'Mainland China': 'CHN',
+    'Netherlands (Kingdom of the)': 'NLD',
+    'Republic of Ireland': 'IRL',
+    'Russia': 'RUS',
+    'Saint Helena': 'SHN',
+    'Taiwan*': 'TWN',
+    'Taiwan, China': 'TWN',
+    'The Bahamas': 'BHS',
+    'Bahamas, The': 'BHS',
+    'The Gambia': 'GMB',
+    'Gambia, The': 'GMB',
+    'Turkey': 'TUR',
+    'Turkiye': 'TUR',
+    'T\ufffdrkiye': 'TUR',
+    'UK': 'GBR',
+    'North Ireland': 'GBR',
+    'Venezuela (Bolivarian Republic of)': 'VEN',
+    'West Bank and Gaza': 'PSE',
+    'occupied Palestinian territory': 'PSE',
+    'occupied Palestinian territory, including east Jerusalem': 'PSE',
+    'Diamond Princess': 'XDP',
+    'MS Zaandam': 'XMZ',
+    'Others': 'XOT',
+}
+
+
+def _fold(name):
+    # Case, accents and whitespace do not distinguish two names
+    name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(name.split()).casefold()
+
+
+class Dimension:
+    """Canonical members with stable integer ids, plus a table of spelling variants.
+
+    ``members`` is a frame indexed by id with ``key`` (e.g. ISO3) and
+    ``name`` columns. Names are matched after folding case, accents and
+    whitespace; ``lookup`` is an optional fallback ``lookup(name)`` returning
+    a key or None for names not in the tables.
+    """
+
+    def __init__(self, kind, members, aliases, lookup=None):
+        self.kind = kind
+        self.members = members
+        self.lookup = lookup
+        self._by_key = pd.Series(members.index, index=members['key'])
+        self._by_name = {_fold(name): id_ for id_, name in members['name'].items()}
+        self._by_name.update({_fold(key): id_ for id_, key in members['key'].items()})
+        for alias, target in aliases.items():
+            self._by_name[_fold(alias)] = self._by_key.get(target, self._by_name.get(_fold(target), UNKNOWN))
+        self._lock = threading.Lock()
+
+    def _resolve_one(self, name):
+        folded = _fold(name)
+        with self._lock:
+            if folded not in self._by_name:
+                key = self.lookup(name) if self.lookup is not None else None
+                self._by_name[folded] = self._by_key.get(key, UNKNOWN) if key is not None else UNKNOWN
+            return self._by_name[folded]
+
+    def resolve(self, names, warn=True):
+        """Return the ids of ``names`` (a Series) as int16, ``UNKNOWN`` where a name matches no member.
+
+        Each distinct name is resolved once. Unmatched names are reported
+        with a warning rather than dropped silently.
+        """
+        if isinstance(names.dtype, pd.CategoricalDtype):
+            categories = names.cat.categories
+            # The last entry is the id of missing values (code -1)
+            table = np.array([self._resolve_one(name) for name in categories] + [UNKNOWN], dtype=np.int16)
+            ids = table[names.cat.codes.to_numpy()]
+        else:
+            unique = names.dropna().unique()
+            table = {name: self._resolve_one(name) for name in unique}
+            ids = names.map(table).fillna(UNKNOWN).to_numpy(dtype=np.int16)
+            categories = unique
+
+        if warn:
+            unknown = sorted(str(name) for name in categories if self._resolve_one(name) == UNKNOWN)
+            if unknown:
+                warnings.warn(f"no {self.kind} matches: {', '.join(unknown)}", stacklevel=2)
+        return pd.Series(ids, index=names.index, name=f"{self.kind}_id")
+
+    def canonical(self, names):
+        """Return the canonical name of every name in ``names``; unmatched names are kept as they are."""
+        ids = self.resolve(names, warn=False)
+        canonical = ids.map(self.members['name'])
+        return canonical.where(ids != UNKNOWN, names.astype(object))
+
+    def keys(self, ids):
+        """Return the key (e.g. ISO3) of every id in ``ids``; missing for ``UNKNOWN``."""
+        return pd.Series(ids).map(self.members['key']).to_numpy()
+
+    def names(self, ids):
+        return pd.Series(ids).map(self.members['name']).to_numpy()
+
+
+def _country_members():
+    rows = [(int(country.numeric), country.alpha_3, country.name) for country in pycountry.countries]
+    rows += [(id_, key, name) for key, (id_, name) in EXTRA_COUNTRIES.items()]
+    ids, keys, names = zip(*sorted(rows))
+    return pd.DataFrame({'key': keys, 'name': names}, index=pd.Index(ids, name='country_id'))
+
+
+def _lookup_country(name):
+    try:
+        return pycountry.countries.lookup(str(name).strip()).alpha_3
+    except LookupError:
+        return None
+
+
+COUNTRIES = Dimension('country', _country_members(), COUNTRY_ALIASES, lookup=_lookup_country)
+STATES = Dimension(
+    'state',
+    pd.DataFrame({'key': list(STATE_MEMBERS.values()), 'name': list(STATE_MEMBERS.values())},
+                 index=pd.Index(list(STATE_MEMBERS), name='state_id')),
+    STATE_ALIASES,
+)
+
+# Changes whenever a table changes; part of the cache key of the cleaned datasets
+VERSION = hashlib.sha1(repr((STATE_MEMBERS, STATE_ALIASES, EXTRA_COUNTRIES, COUNTRY_ALIASES)).encode('utf-8')).hexdigest()[:8]
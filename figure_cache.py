@@ -0,0 +1,118 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Upper bound on the total estimated size of the cached figures, in MB.
+# Can be overridden with the COVID_FIGURE_CACHE_MB environment variable.
+MAX_MB = float(os.environ.get('COVID_FIGURE_CACHE_MB', 256))
+
+# Bytes counted for every scalar or element of a list; numpy arrays count their nbytes
+_ITEM_BYTES = 8
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes if value.dtype != object else value.size * _ITEM_BYTES
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], (dict, list, tuple, np.ndarray)):
+            return sum(_nbytes(item) for item in value)
+        return len(value) * _ITEM_BYTES
+    return _ITEM_BYTES
+
+
+def _data_size(fig):
+    # Estimated from the stored properties of the traces, frames and layout:
+    # serialising the figure to measure it would add a second build to every miss
+    traces = list(fig.data) + [trace for frame in fig.frames for trace in frame.data]
+    return sum(_nbytes(obj._props or {}) for obj in traces + [fig.layout])
+
+
+class FigureCache:
+    """Least-recently-used cache of built Plotly figures.
+
+    Entries are keyed by view id, widget parameters and data version, and
+    evicted oldest first once their total size exceeds ``max_bytes``; a
+    figure larger than that is not cached at all. ``sizeof(value)`` gives
+    the size of an entry, by default an estimate from the figure's data
+    arrays (about half the length of its JSON).
+
+    The validated figure is kept rather than its JSON: rebuilding a figure
+    from JSON validates every frame again, which costs about as much as
+    building it. Cached figures are shared between sessions and must not be
+    modified.
+    """
+
+    def __init__(self, max_bytes=int(MAX_MB * 2 ** 20), sizeof=_data_size):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _key(view_id, version, params):
+        return view_id, str(version), repr(sorted(params.items()))
+
+    def get(self, view_id, version, **params):
+        """Return the cached figure for ``view_id``, ``version`` and ``params``, or None."""
+        key = self._key(view_id, version, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, view_id, version, fig, **params):
+        key = self._key(view_id, version, params)
+        nbytes = self.sizeof(fig)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.size -= self._entries.pop(key)[1]
+            self._entries[key] = (fig, nbytes)
+            self.size += nbytes
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.size -= evicted
+
+    def cached(self, view_id, version, build, **params):
+        """Return the figure for ``view_id``, ``version`` and ``params``, calling ``build()`` on a miss.
+
+        ``params`` are the widget values the figure depends on; ``version``
+        must change whenever its data does (e.g. ``registry.version`` of its
+        input). A figure being built is not locked, so two sessions missing
+        at once may both build it.
+        """
+        fig = self.get(view_id, version, **params)
+        if fig is None:
+            fig = build()
+            if fig is not None:
+                self.put(view_id, version, fig, **params)
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+# Shared by every session of the dashboards in this process
+cache = FigureCache()
+
+
+def cached(view_id, version, build, **params):
+    """Return the figure for ``view_id`` from the shared cache, building it with ``build()`` on a miss."""
+    return cache.cached(view_id, version, build, **params)
@@ -0,0 +1,732 @@
+import hashlib
+from functools import partial
+
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+import pandas as pd
+import plotly.express as px
+import seaborn as sns
+
+import artifacts
+import choropleth
+import figure_cache
+import rendering
+import topn
+from dimensions import COUNTRIES
+from frames import registry
+
+# view id -> (kind, input node names, builder). ``kind`` is 'plotly' or
+# 'matplotlib'; the builder is called with the registry values of its inputs.
+FIGURES = {}
+
+
+def figure(view_id, kind, inputs):
+    """Decorator registering a figure that only depends on registry nodes."""
+    def decorator(func):
+        FIGURES[view_id] = (kind, tuple(inputs), func)
+        return func
+    return decorator
+
+
+def version(view_id):
+    """Return the version of a figure; it changes whenever one of its inputs changes."""
+    _, inputs, _ = FIGURES[view_id]
+    parts = [view_id] + [registry.version(input_name) for input_name in inputs]
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def build(view_id):
+    _, inputs, builder = FIGURES[view_id]
+    return builder(*[registry.get(input_name) for input_name in inputs])
+
+
+def load(view_id, figure_version):
+    """Return figure ``view_id`` from the precomputed artifacts for ``figure_version``, or build it; nothing is cached."""
+    chart = artifacts.load_figure(view_id, figure_version)
+    if chart is None:
+        chart = build(view_id)
+    return chart
+
+
+def get(view_id):
+    """Return the figure ``view_id``, served from the precomputed artifacts when they are current.
+
+    Plotly figures come back as ``go.Figure`` and are kept in the figure
+    cache until their inputs change; matplotlib figures as PNG bytes when
+    precomputed, otherwise as a live ``Figure``.
+    """
+    kind = FIGURES[view_id][0]
+    figure_version = version(view_id)
+    if kind == 'plotly':
+        return figure_cache.cached(view_id, figure_version, partial(load, view_id, figure_version))
+    return load(view_id, figure_version)
+
+
+def show(view_id, **kwargs):
+    """Render figure ``view_id`` in the current Streamlit page.
+
+    Matplotlib figures are shown as PNG images from the image cache (see
+    ``rendering.render``), so each one is drawn once per input version.
+    """
+    import streamlit as st
+
+    if FIGURES[view_id][0] == 'matplotlib':
+        figure_version = version(view_id)
+        rendering.show(view_id, figure_version, partial(load, view_id, figure_version))
+    else:
+        st.plotly_chart(get(view_id), **kwargs)
+
+
+# Define plotting functions for professional look
+def plot_global_totals(global_totals_sum):
+    fig, ax = plt.subplots()
+    ax.bar(global_totals_sum.index, global_totals_sum.values, color=['blue', 'red', 'green'])
+    ax.set_title('Global COVID-19 Totals')
+    ax.set_xlabel('Metrics')
+    ax.set_ylabel('Count')
+    plt.xticks(rotation=45)
+    return fig
+
+def plot_top_countries_active_cases(global_totals):
+    top_countries = topn.top_n(global_totals, 'Active', 10)
+    fig, ax = plt.subplots()
+    ax.bar(top_countries['Country/Region'], top_countries['Active'], color='orange')
+    ax.set_title('Top 10 Countries by Active COVID-19 Cases')
+    plt.xticks(rotation=45)
+    return fig
+
+def plot_top_countries_mortality(global_totals):
+    global_totals['Mortality Rate'] = (global_totals['Deaths'] / global_totals['Confirmed']).replace([float('inf'), -float('inf')], 0) * 100
+    # Drop any rows where confirmed cases are 0 to avoid infinite mortality rates
+    top_countries_mortality = topn.top_n(global_totals[global_totals['Confirmed'] > 0], 'Mortality Rate', 10)
+    fig, ax = plt.subplots()
+    ax.bar(top_countries_mortality['Country/Region'], top_countries_mortality['Mortality Rate'], color='red')
+    ax.set_title('Top 10 Countries by Mortality Rate (%)')
+    ax.set_xlabel('Country')
+    ax.set_ylabel('Mortality Rate (%)')
+    plt.xticks(rotation=45)
+    return fig
+
+def plot_statewise_data(statewise_data):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.barh(statewise_data.index, statewise_data['Confirmed'], color='orange')
+    ax.set_xlabel('Confirmed Cases')
+    ax.set_title('State-wise Confirmed COVID-19 Cases in India')
+    ax.invert_yaxis()
+    return fig
+
+
+@figure('world/global_totals', 'matplotlib', inputs=['global_totals'])
+def global_totals_figure(totals):
+    global_totals_sum, _ = totals
+    return plot_global_totals(global_totals_sum)
+
+
+@figure('world/top_active', 'matplotlib', inputs=['global_totals'])
+def top_active_figure(totals):
+    _, global_totals = totals
+    return plot_top_countries_active_cases(global_totals)
+
+
+@figure('world/top_mortality', 'matplotlib', inputs=['global_totals'])
+def top_mortality_figure(totals):
+    _, global_totals = totals
+    return plot_top_countries_mortality(global_totals)
+
+
+@figure('world/cumulative_cases', 'matplotlib', inputs=['datewise_data'])
+def cumulative_cases_figure(datewise_data):
+    fig = plt.figure(figsize=(14, 8))
+    plt.plot(datewise_data['ObservationDate'], datewise_data['Confirmed'], label='Confirmed', color='blue')
+    plt.plot(datewise_data['ObservationDate'], datewise_data['Recovered'], label='Recovered', color='green')
+    plt.plot(datewise_data['ObservationDate'], datewise_data['Active'], label='Active', color='orange')
+    plt.plot(datewise_data['ObservationDate'], datewise_data['Deaths'], label='Deaths', color='red')
+
+    # Add labels and title
+    plt.xlabel('Date')
+    plt.ylabel('Cumulative Cases')
+    plt.title('Cumulative COVID-19 Cases Over Time')
+    plt.legend()
+    plt.grid()
+    return fig
+
+
+@figure('world/daily_cases', 'matplotlib', inputs=['datewise_data'])
+def daily_cases_figure(datewise_data):
+    fig = plt.figure(figsize=(14, 8))
+    plt.bar(datewise_data['ObservationDate'], datewise_data['daily_confirmed'], label='Daily New Cases', color='lightblue')
+    plt.bar(datewise_data['ObservationDate'], datewise_data['daily_recovered'], label='Daily Recoveries', color='lightgreen')
+    plt.bar(datewise_data['ObservationDate'], datewise_data['daily_deaths'], label='Daily Deaths', color='lightcoral')
+
+    # Plot the 7-day moving average on top of bars
+    plt.plot(datewise_data['ObservationDate'], datewise_data['7_day_avg_confirmed'], label='7-Day Avg New Cases', color='blue', linewidth=2)
+    plt.plot(datewise_data['ObservationDate'], datewise_data['7_day_avg_recovered'], label='7-Day Avg Recoveries', color='green', linewidth=2)
+    plt.plot(datewise_data['ObservationDate'], datewise_data['7_day_avg_deaths'], label='7-Day Avg Deaths', color='red', linewidth=2)
+
+    # Add labels and title
+    plt.xlabel('Date')
+    plt.ylabel('Daily Cases')
+    plt.title('Daily COVID-19 Cases with 7-Day Moving Average')
+    plt.legend()
+    plt.grid()
+    return fig
+
+
+@figure('world/weekly_tests_line', 'matplotlib', inputs=['aggregated_df'])
+def weekly_tests_line_figure(aggregated_df):
+    fig, ax1 = plt.subplots(figsize=(14, 8))
+    ax1.set_xlabel('Date', fontsize=14)
+    ax1.set_ylabel('Weekly Tests', color='blue', fontsize=14)
+    ax1.plot(aggregated_df['year_week_date'], aggregated_df['tests_done'], color='blue', label='Weekly Tests', linewidth=2)
+    ax1.tick_params(axis='y', labelcolor='blue')
+
+    # Configure grid lines for better readability
+    ax1.grid(visible=True, color='gray', linestyle='--', linewidth=0.5, alpha=0.5)
+
+    # Second y-axis for positivity rate
+    ax2 = ax1.twinx()
+    ax2.set_ylabel('Positivity Rate (%)', color='orange', fontsize=14)
+    ax2.plot(aggregated_df['year_week_date'], aggregated_df['rolling_positivity_rate'], color='orange', linestyle='-', marker='o', label='Positivity Rate (%)', linewidth=2)
+    ax2.tick_params(axis='y', labelcolor='orange')
+
+    # Set x-axis major locator and formatter for better date visibility
+    ax1.xaxis.set_major_locator(plt.MaxNLocator(nbins=10))  # Use 'nbins' instead of 'n'
+    plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')  # Rotate x-axis labels for better visibility
+
+    # Add legends
+    ax1.legend(loc='upper left')
+    ax2.legend(loc='upper right')
+
+    # Set title and layout
+    fig.suptitle('Weekly Tests and Positivity Rate Over Time', fontsize=16)
+    fig.tight_layout()
+    return fig
+
+
+@figure('world/weekly_tests_bar', 'matplotlib', inputs=['aggregated_df'])
+def weekly_tests_bar_figure(aggregated_df):
+    fig, ax1 = plt.subplots(figsize=(16, 8))  # Adjusted size
+
+    # Plot weekly tests on the first y-axis as a bar chart
+    ax1.set_xlabel('Date', fontsize=14)
+    ax1.set_ylabel('Weekly Tests', color='blue', fontsize=14)
+    ax1.bar(aggregated_df['year_week_date'], aggregated_df['tests_done'], color='darkblue', alpha=0.6, label='Weekly Tests')
+    ax1.tick_params(axis='y', labelcolor='blue')
+
+    # Configure x-axis date format
+    ax1.xaxis.set_major_locator(mdates.MonthLocator())
+    ax1.xaxis.set_major_formatter(mdates.DateFormatter('%b %Y'))
+    plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')  # Rotate x-axis labels for better visibility
+
+    # Second y-axis for positivity rate
+    ax2 = ax1.twinx()
+    ax2.set_ylabel('Positivity Rate (%)', color='red', fontsize=14)
+
+    # Plot the rolling positivity rate with a dashed line style
+    ax2.plot(aggregated_df['year_week_date'], aggregated_df['rolling_positivity_rate'], color='red', marker='o', linestyle='--', label='Positivity Rate (%)', linewidth=2)
+    ax2.tick_params(axis='y', labelcolor='red')
+
+    # Optionally, set limits for the y-axis to improve clarity
+    ax2.set_ylim(0, aggregated_df['rolling_positivity_rate'].max() + 5)  # Adjust the limits as needed
+
+    # Add legends and grid
+    ax1.legend(loc='upper left')
+    ax2.legend(loc='upper right')
+    ax1.grid(True)
+
+    # Title and layout
+    fig.suptitle('Weekly Tests and Positivity Rate Over Time', fontsize=16)
+    fig.tight_layout()
+    return fig
+
+
+def _with_iso_codes(frame):
+    # The cube's countries carry canonical names, which plotly's country-name
+    # table does not always know; the maps place them by ISO3 code instead
+    frame['iso_alpha'] = COUNTRIES.keys(COUNTRIES.resolve(frame['Country/Region'], warn=False))
+    return frame
+
+
+@figure('world/spread', 'plotly', inputs=['global_cube'])
+def spread_figure(global_cube):
+    df_grouped = _with_iso_codes(global_cube.to_frame())
+
+    # Create the animated scatter map
+    fig = px.scatter_geo(
+        df_grouped,
+        locations="iso_alpha",
+        locationmode="ISO-3",
+        color="Confirmed",
+        size="Confirmed",
+        hover_name="Country/Region",
+        animation_frame=df_grouped["ObservationDate"].dt.strftime('%Y-%m-%d'),
+        title="Spread of COVID-19 Over Time",
+        template="plotly_dark",
+        color_continuous_scale="Reds",
+    )
+
+    fig.update_layout(
+        geo=dict(showframe=False, showcoastlines=True, projection_type="natural earth"),
+    )
+    return fig
+
+
+@figure('world/confirmed_by_country', 'plotly', inputs=['global_cube'])
+def confirmed_by_country_figure(global_cube):
+    latest_data = _with_iso_codes(global_cube.to_frame(start=global_cube.dates[-1]))
+
+    return px.choropleth(
+        latest_data,
+        locations='iso_alpha',
+        locationmode='ISO-3',
+        color='Confirmed',
+        hover_name='Country/Region',
+        color_continuous_scale=px.colors.sequential.Plasma,
+        labels={'Confirmed': 'Confirmed Cases'},
+        title='COVID-19 Confirmed Cases by Country (Latest Data)'
+    )
+
+
+@figure('world/mortality_rates', 'plotly', inputs=['mortality_map_frames'])
+def mortality_rates_figure(mortality_map_frames):
+    return choropleth.build_figure(mortality_map_frames, 'COVID-19 Mortality Rates by Country',
+                                   px.colors.sequential.Reds, 'Mortality Rate (%)')
+
+
+@figure('world/recovery_rates', 'plotly', inputs=['recovery_map_frames'])
+def recovery_rates_figure(recovery_map_frames):
+    return choropleth.build_figure(recovery_map_frames, 'COVID-19 Recovery Rates by Country',
+                                   px.colors.sequential.Plasma, 'Recovery Rate (%)')
+
+
+@figure('world/vaccination_coverage', 'plotly', inputs=['vaccination'])
+def vaccination_coverage_figure(df3):
+    df3 = df3[df3['TOTAL_VACCINATIONS'].notnull()]  # Keep only rows with total vaccinations
+    df3 = df3[df3['COUNTRY'].notnull()]  # Ensure country names are present
+
+    # Optionally, convert 'WHO_REGION' to a categorical type for better visualization
+    df3['WHO_REGION'] = df3['WHO_REGION'].astype('category')
+
+    df3['PERCENT_VACCINATED_1PLUS_DOSE'] = (df3['PERSONS_VACCINATED_1PLUS_DOSE'] / df3['TOTAL_VACCINATIONS']) * 100
+
+    # Create a choropleth map
+    fig = px.choropleth(
+        df3,
+        locations='ISO3',  # Use ISO3 codes for location matching
+        color='PERCENT_VACCINATED_1PLUS_DOSE',  # Data to be represented
+        hover_name='COUNTRY',  # Hover data
+        color_continuous_scale=px.colors.sequential.Plasma,  # Color scale
+        labels={'PERCENT_VACCINATED_1PLUS_DOSE': 'Percentage Vaccinated (1+ Dose)'},
+        title='Choropleth Map of Percentage Vaccinated with at Least One Dose by Country'
+    )
+    fig.update_geos(showcoastlines=True, coastlinecolor="Black", showland=True, landcolor="LightGreen")
+    return fig
+
+
+@figure('world/top_vaccinations', 'matplotlib', inputs=['vaccination'])
+def top_vaccinations_figure(df3):
+    df3 = df3[df3['TOTAL_VACCINATIONS'].notna()]  # Filter out rows with NaN values in 'TOTAL_VACCINATIONS'
+    # Top 20 countries by total vaccinations
+    top_vaccinated_countries = topn.top_n(df3, 'TOTAL_VACCINATIONS', 20)
+
+    fig = plt.figure(figsize=(14, 8))
+    sns.barplot(x='TOTAL_VACCINATIONS', y='COUNTRY', data=top_vaccinated_countries, hue="TOTAL_VACCINATIONS")
+    plt.title('Total Vaccinations Administered by Country (Top 20)', fontsize=18)
+    plt.xlabel('Total Vaccinations', fontsize=14)
+    plt.ylabel('Country', fontsize=14)
+    plt.grid(axis='x', linestyle='--', alpha=0.7)
+    return fig
+
+
+@figure('world/top_vaccination_rates', 'matplotlib', inputs=['vaccination'])
+def top_vaccination_rates_figure(df3):
+    top_vaccination_rate_countries = topn.top_n(df3, 'TOTAL_VACCINATIONS_PER100', 20)
+
+    fig = plt.figure(figsize=(14, 8))
+    sns.barplot(x='TOTAL_VACCINATIONS_PER100', y='COUNTRY', data=top_vaccination_rate_countries, hue="TOTAL_VACCINATIONS_PER100")
+    plt.title('Total Vaccinations per 100 People by Country (Top 20)', fontsize=18)
+    plt.xlabel('Total Vaccinations per 100 People', fontsize=14)
+    plt.ylabel('Country', fontsize=14)
+    plt.grid(axis='x', linestyle='--', alpha=0.7)
+    return fig
+
+
+@figure('world/who_region_vaccinations', 'matplotlib', inputs=['vaccination'])
+def who_region_vaccinations_figure(df3):
+    region_vaccinations = df3.groupby('WHO_REGION', observed=True)['TOTAL_VACCINATIONS'].sum().reset_index()
+    fig = plt.figure(figsize=(10, 6))
+    sns.barplot(x='TOTAL_VACCINATIONS', y='WHO_REGION', data=region_vaccinations, hue='TOTAL_VACCINATIONS')
+    plt.title('Total Vaccinations by WHO Region', fontsize=18)
+    plt.xlabel('Total Vaccinations', fontsize=14)
+    plt.ylabel('WHO Region', fontsize=14)
+    plt.grid(axis='x', linestyle='--', alpha=0.7)
+    return fig
+
+
+@figure('world/vaccination_stages', 'matplotlib', inputs=['vaccination'])
+def vaccination_stages_figure(df3):
+    top_countries = topn.top_n(df3, 'TOTAL_VACCINATIONS', 10)
+    # Select necessary columns for stacked bar chart
+    df_stacked = top_countries[['COUNTRY', 'PERSONS_VACCINATED_1PLUS_DOSE', 'PERSONS_LAST_DOSE', 'PERSONS_BOOSTER_ADD_DOSE']]
+    df_stacked.set_index('COUNTRY').plot(kind='bar', stacked=True, figsize=(14, 7), color=['skyblue', 'orange', 'green'])
+
+    # Customize chart
+    plt.title('Vaccination Stages by Top 10 Countries')
+    plt.xlabel('Country')
+    plt.ylabel('Number of Vaccinations')
+    plt.legend(title='Vaccination Type', labels=['1+ Dose', 'Last Dose', 'Booster Dose'])
+    plt.xticks(rotation=45)
+
+    return plt.gcf()
+
+
+@figure('world/cumulative_vaccinations', 'matplotlib', inputs=['vaccination'])
+def cumulative_vaccinations_figure(df3):
+    if 'DATE_UPDATED' in df3.columns:
+        df3['DATE_UPDATED'] = pd.to_datetime(df3['DATE_UPDATED'], errors='coerce')
+        df3.set_index('DATE_UPDATED', inplace=True)
+
+    fig = plt.figure(figsize=(14, 8))
+    cumulative_vaccinations = df3['TOTAL_VACCINATIONS'].resample('ME').sum().cumsum()
+    sns.lineplot(x=cumulative_vaccinations.index, y=cumulative_vaccinations, color='blue')
+    plt.title('Cumulative Vaccinations Over Time', fontsize=18)
+    plt.xlabel('Date', fontsize=14)
+    plt.ylabel('Cumulative Total Vaccinations', fontsize=14)
+    plt.xticks(rotation=45)
+    plt.grid()
+    return fig
+
+
+@figure('world/top_boosters', 'matplotlib', inputs=['vaccination'])
+def top_boosters_figure(df3):
+    top_booster_countries = topn.top_n(df3, 'PERSONS_BOOSTER_ADD_DOSE', 20)
+    fig = plt.figure(figsize=(14, 8))
+    sns.barplot(x='PERSONS_BOOSTER_ADD_DOSE', y='COUNTRY', data=top_booster_countries, hue="PERSONS_BOOSTER_ADD_DOSE")
+    plt.title('Booster Doses Administered by Country (Top 20)', fontsize=18)
+    plt.xlabel('Number of Booster Doses Administered', fontsize=14)
+    plt.ylabel('Country', fontsize=14)
+    plt.grid(axis='x', linestyle='--', alpha=0.7)
+    return fig
+
+
+@figure('india/statewise', 'matplotlib', inputs=['statewise_data'])
+def statewise_figure(statewise_data):
+    return plot_statewise_data(statewise_data)
+
+
+@figure('india/top_active', 'matplotlib', inputs=['top10ActiveCases'])
+def india_top_active_figure(top10ActiveCases):
+    fig = plt.figure(figsize=(16,10))
+    plt.title("Top 10 States with Most Active Cases in India", fontsize=22, fontweight='bold')
+
+    # Assign `x` to `hue` and set `legend=False`
+    ax = sns.barplot(
+        data=top10ActiveCases.iloc[:10],
+        y='Active_cases',
+        x='State/UnionTerritory',
+        hue='State/UnionTerritory',    # Assign `x` to `hue`
+        palette='viridis',
+        linewidth=2,
+        edgecolor='black',
+        dodge=False                     # To keep bars in single row
+    )
+
+    # Add data labels above bars
+    for p in ax.patches:
+        ax.annotate(format(p.get_height(), ','),
+                    (p.get_x() + p.get_width() / 2., p.get_height()),
+                    ha='center',
+                    va='center',
+                    xytext=(0, 10),
+                    textcoords='offset points',
+                    fontsize=12,
+                    fontweight='bold',
+                    color='black')
+
+    # Customize x and y labels
+    plt.xlabel("States", fontsize=14, fontweight='bold')
+    plt.ylabel("Total Active Cases", fontsize=14, fontweight='bold')
+
+    # Rotate x-axis labels for better readability
+    plt.xticks(rotation=45, ha='right', fontsize=12)
+    plt.yticks(fontsize=12)
+
+    # Add grid
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    return fig
+
+
+@figure('india/most_vaccinated', 'matplotlib', inputs=['max_vacc'])
+def most_vaccinated_figure(max_vacc):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    plt.title("Top 10 Vaccinated States in India", fontsize=20, fontweight='bold')
+
+    # Create a bar plot with hue set to 'State/Union Territory'
+    palette = sns.color_palette("Blues", len(max_vacc.iloc[:10]))
+
+    sns.barplot(
+        data=max_vacc.iloc[:10],
+        y='Total',
+        x=max_vacc.index[:10],
+        hue=max_vacc.index[:10],  # Set the hue to the x variable
+        linewidth=2,
+        edgecolor='black',
+        palette=palette,
+        legend=False  # Disable the legend since hue is used for the same variable
+    )
+
+    # Change color of the bar with the maximum value
+    for p in ax.patches:
+        if p.get_height() == max_vacc['Total'].max():
+            p.set_color('#FF6347')  # Highlight color for maximum value
+
+    # Add data labels on top of the bars
+    for p in ax.patches:
+        ax.annotate(
+            f'{int(p.get_height())}',  # Get the height of the bar for labeling
+            (p.get_x() + p.get_width() / 2., p.get_height()),  # Positioning the label
+            ha='center', va='bottom', fontsize=12, fontweight='bold'
+        )
+
+    # Set x and y labels
+    ax.set_xlabel("States", fontsize=14)
+    ax.set_ylabel("Total Vaccinations", fontsize=14)
+
+    # Rotate x-axis labels for better readability
+    plt.xticks(rotation=45, ha='right')
+
+    # Add gridlines with lighter style
+    ax.yaxis.grid(True, linestyle='--', alpha=0.5)
+    plt.tight_layout()
+    return fig
+
+
+@figure('india/least_vaccinated', 'matplotlib', inputs=['min_vacc'])
+def least_vaccinated_figure(min_vacc):
+    # Create the figure
+    fig, ax = plt.subplots(figsize=(12, 5))
+    plt.title("Least 5 Vaccinated States in India", fontsize=20, fontweight='bold')
+
+    # Create a bar plot for the least vaccinated states
+    sns.barplot(
+        data=min_vacc.iloc[:10],  # Only take the least 5
+        y='Total',
+        x=min_vacc.index[:10],
+        hue=min_vacc.index[:10],  # Set the hue to the x variable
+        linewidth=2,
+        edgecolor='black',
+        palette='pastel',  # Using a pastel color palette for softer colors
+        legend=False  # Disable the legend since hue is used for the same variable
+    )
+
+    # Add data labels on top of the bars
+    for p in ax.patches:
+        ax.annotate(
+            f'{int(p.get_height())}',  # Get the height of the bar for labeling
+            (p.get_x() + p.get_width() / 2., p.get_height()),  # Positioning the label
+            ha='center', va='bottom', fontsize=12, fontweight='bold'
+        )
+
+    # Set x and y labels
+    ax.set_xlabel("States", fontsize=14)
+    ax.set_ylabel("Total Vaccinations", fontsize=14)
+    # Rotate x-axis labels for better readability
+    plt.xticks(rotation=30, ha='right')
+
+    # Add gridlines to the y-axis for better visibility
+    ax.yaxis.grid(True, linestyle='--', alpha=0.7)
+
+    # Adjust layout for better spacing
+    plt.tight_layout()
+    return fig
+
+
+@figure('india/vaccination_by_state', 'plotly', inputs=['state_vaccine'])
+def vaccination_by_state_figure(vaccine):
+    # Summing vaccination doses for each state across all age groups
+    vaccine['Total Doses Administered'] = (vaccine['18-44 Years (Doses Administered)'] +
+                                    vaccine['45-60 Years (Doses Administered)'] +
+                                    vaccine['60+ Years (Doses Administered)'])
+
+    # Aggregating by state
+    df_state_vaccination = vaccine.groupby('State', observed=True)['Total Doses Administered'].sum().reset_index()
+
+    # Create the bar plot using Plotly Express
+    fig = px.bar(df_state_vaccination,
+                x='State',
+                y='Total Doses Administered',
+                title='Total Vaccination Doses Administered by State',
+                labels={'State': 'State', 'Total Doses Administered': 'Total Doses Administered'},
+                template='plotly_dark')
+
+    # Customize layout for a cleaner look
+    fig.update_layout(
+        xaxis_tickangle=-45,
+        xaxis_title='State',
+        yaxis_title='Total Doses Administered',
+        showlegend=False
+    )
+    return fig
+
+
+@figure('india/age_doses', 'matplotlib', inputs=['india_vaccine'])
+def age_doses_figure(covid_vaccine):
+    age_groups = ['18-44 Years (Doses Administered)', '45-60 Years (Doses Administered)', '60+ Years (Doses Administered)']
+    age_distribution = covid_vaccine[age_groups].sum()
+
+    # Bar Chart for Age-wise Distribution of Vaccination
+    fig = plt.figure(figsize=(10, 6))
+    plt.bar(age_distribution.index, age_distribution.values, color='lightblue')
+    plt.title('Age-wise Distribution of Vaccination Doses Administered')
+    plt.xlabel('Age Group')
+    plt.ylabel('Number of Doses Administered')
+    plt.xticks(rotation=45)
+    plt.grid(axis='y')
+    return fig
+
+
+@figure('india/gender_doses', 'matplotlib', inputs=['india_vaccine'])
+def gender_doses_figure(covid_vaccine):
+    gender_groups = ['Male (Doses Administered)', 'Female (Doses Administered)', 'Transgender (Doses Administered)']
+    gender_distribution = covid_vaccine[gender_groups].sum()
+
+    # Bar Chart for Gender-wise Distribution of Vaccination
+    fig = plt.figure(figsize=(10, 6))
+    plt.bar(gender_distribution.index, gender_distribution.values, color='lightgreen')
+    plt.title('Gender-wise Distribution of Vaccination Doses Administered')
+    plt.xlabel('Gender')
+    plt.ylabel('Number of Doses Administered')
+    plt.xticks(rotation=45)
+    plt.grid(axis='y')
+    return fig
+
+
+@figure('india/vaccination_rate', 'matplotlib', inputs=['india_vaccine'])
+def vaccination_rate_figure(covid_vaccine):
+    covid_vaccine = covid_vaccine[covid_vaccine['State'] != 'India']
+    covid_vaccine['Updated On'] = pd.to_datetime(covid_vaccine['Updated On'], errors='coerce', dayfirst=True)
+
+    # Group by 'Updated On' for cumulative vaccination rate over time
+    df_time = covid_vaccine.groupby('Updated On').sum(numeric_only=True)
+    df_time['Cumulative First Dose'] = df_time['First Dose Administered'].cumsum()
+    df_time['Cumulative Second Dose'] = df_time['Second Dose Administered'].cumsum()
+
+    # Plot line chart for vaccination rate over time
+    fig = plt.figure(figsize=(10, 6))
+    plt.plot(df_time.index, df_time['Cumulative First Dose'], label="First Dose")
+    plt.plot(df_time.index, df_time['Cumulative Second Dose'], label="Second Dose")
+    plt.xlabel("Date")
+    plt.ylabel("Cumulative Doses Administered")
+    plt.title("Vaccination Rate Over Time")
+    plt.legend()
+    return fig
+
+
+@figure('india/top_deaths', 'matplotlib', inputs=['india'])
+def top_deaths_figure(covid_df):
+    top10Deaths = (
+        topn.max_rows(covid_df, 'State/UnionTerritory', 'Deaths', n=10)  # Row with max deaths of the top 10 states
+        [['State/UnionTerritory', 'Deaths', 'Date']]
+        .reset_index(drop=True)
+    )
+
+    # Optional: Rename columns if desired
+    top10Deaths.columns = ['State/UnionTerritory', 'Deaths', 'Date']
+    fig = plt.figure(figsize=(14, 8))
+    plt.title("Top 10 States with Most COVID-19 Deaths in India", fontsize=20, fontweight='bold')
+
+    sns.barplot(
+        data=top10Deaths,
+        y="State/UnionTerritory",
+        x="Deaths",
+        hue='State/UnionTerritory',   
+        palette='Reds_r', 
+        edgecolor='black',                
+    )
+
+    # Add data labels for each bar
+    for index, value in enumerate(top10Deaths['Deaths']):
+        plt.text(value, index, f"{value:,}", va="center", ha="left", fontweight='bold')
+
+    plt.xlabel("Number of Deaths", fontsize=14)
+    plt.ylabel("State/Union Territory", fontsize=14)
+    plt.grid(axis='x', linestyle="--", alpha=0.7)
+
+    return fig
+
+
+@figure('india/top_death_trends', 'matplotlib', inputs=['india', 'top10ActiveCases'])
+def top_death_trends_figure(covid_df, top10ActiveCases):
+    # Filter the top 10 states
+    top_states = top10ActiveCases['State/UnionTerritory'].values
+
+    # Convert 'Date' column to datetime format if it's not already
+    covid_df['Date'] = pd.to_datetime(covid_df['Date'])
+
+    # Extract Month and Year from 'Date' and create a new column for Month-Year
+    covid_df['Month_Year'] = covid_df['Date'].dt.to_period('M')
+
+    # Prepare data for plotting: Group by Month-Year and State
+    death_trends = covid_df[covid_df['State/UnionTerritory'].isin(top_states)] \
+                    .groupby(['Month_Year', 'State/UnionTerritory'], observed=True)['Deaths'] \
+                    .sum().unstack()
+
+    # Create a new figure and axis
+    fig, ax = plt.subplots(figsize=(16, 8))
+
+    # Plotting the trends
+    sns.lineplot(data=death_trends.T, ax=ax)  # Use the transposed data
+    ax.set_title('COVID-19 Death Trends for Top 10 States (Month-Year)', fontsize=20)
+    ax.set_xlabel('Month-Year', fontsize=15)
+    ax.set_ylabel('Total Deaths', fontsize=15)
+    ax.legend(title='States', bbox_to_anchor=(1.05, 1), loc='upper left')
+
+    # Rotate x-tick labels and adjust spacing to avoid overlap
+    plt.xticks(rotation=45, ha='right', fontsize=12)
+    plt.tight_layout()  # Adjust layout to prevent clipping of labels
+
+    return fig
+
+
+@figure('india/confirmed_over_time', 'matplotlib', inputs=['india_complete'])
+def confirmed_over_time_figure(df11):
+    daily_cases = df11.groupby('Date')['Total Confirmed cases'].sum()
+    # Create the plot
+    fig = plt.figure(figsize=(12, 6))
+    plt.plot(daily_cases, label='Total Confirmed Cases')
+    plt.xlabel('Date')
+    plt.ylabel('Confirmed Cases')
+    plt.title('Total Confirmed COVID-19 Cases Over Time')
+    plt.legend()
+    return fig
+
+
+@figure('india/confirmed_cases_map', 'matplotlib', inputs=['india', 'india_state_geometry'])
+def confirmed_cases_map_figure(df, india_geo):
+    cases_by_state = df.groupby('state_id').agg({
+        'Confirmed': 'sum',
+        'Cured': 'sum',
+        'Deaths': 'sum'
+    })
+
+    # Merge the geographical data with the cases data on the state id
+    merged = india_geo.join(
+        cases_by_state,
+        how='left'  # Ensure all geographic data shows, even with missing cases data
+    )
+
+    # Fill NaN values with 0 for better visualization
+    merged = merged.fillna(0)
+
+    # Create the plot
+    fig, ax = plt.subplots(1, 1, figsize=(15, 10))
+    merged.plot(
+        column='Confirmed',
+        ax=ax,
+        legend=True,
+        legend_kwds={'label': "Number of Confirmed Cases", 'orientation': "horizontal"},
+        cmap='OrRd'  # Colormap for heat intensity
+    )
+    ax.set_title('Geographical Heat Map of COVID-19 Confirmed Cases in India')
+    ax.set_axis_off()
+    return fig
@@ -0,0 +1,275 @@
+from functools import partial
+
+import pandas as pd
+
+import artifacts
+import choropleth
+import clustering
+import cube
+import geometry
+import heatmap
+import metrics
+import sql_engine
+import streaming
+import timeindex
+import topn
+from data_loader import DATASETS, dataset_version, get_dataset
+from dimensions import COUNTRIES, STATES, UNKNOWN
+from pipeline import Pipeline
+
+# Derived frames used by the dashboards. Each node is built by the first view
+# that asks for it and cached until one of its inputs changes. Outputs written
+# by precompute.py for the current input versions are loaded instead.
+registry = Pipeline(store=artifacts.load_aggregate)
+
+for _name in DATASETS:
+    registry.source(_name, partial(get_dataset, _name), partial(dataset_version, _name))
+    # Same dataset as a DuckDB view; the loader only returns the view name
+    registry.source(f"sql:{_name}", partial(sql_engine.table, _name), partial(dataset_version, _name))
+
+
+def _build_global_cube():
+    # One entity per country id, labelled with its canonical name, so every spelling
+    # of a country adds up; names that match no country keep an entity of their own
+    df = get_dataset('global')
+    df = df.assign(**{'Country/Region': COUNTRIES.canonical(df['Country/Region'])})
+    return cube.Cube.from_frame(df, 'ObservationDate', 'Country/Region', ['Confirmed', 'Deaths', 'Recovered'])
+
+
+def _load_global_cube():
+    return cube.load_or_build('global', dataset_version('global'), _build_global_cube)
+
+
+def _build_india_cube():
+    return cube.Cube.from_frame(get_dataset('india'), 'Date', 'State/UnionTerritory', ['Confirmed', 'Cured', 'Deaths'])
+
+
+def _load_metrics_cube(name, load_base, total):
+    version = f"{dataset_version(name)}-w{metrics.WINDOW}"
+    return cube.load_or_build(f"{name}_metrics", version, lambda: metrics.derive(load_base(), total=total))
+
+
+# Date x country x metric sums of the global dataset, memory-mapped from CUBE_DIR
+registry.source('global_cube', _load_global_cube, partial(dataset_version, 'global'))
+
+# Daily, rolling-mean and growth metrics of every country (plus 'World') and
+# every Indian state (plus 'India'), memory-mapped from CUBE_DIR
+registry.source('global_metrics', partial(_load_metrics_cube, 'global', _load_global_cube, 'World'),
+                partial(dataset_version, 'global'))
+registry.source('india_metrics', partial(_load_metrics_cube, 'india', _build_india_cube, 'India'),
+                partial(dataset_version, 'india'))
+
+# Prefix sums of the daily counts of the metrics cubes, for date-range queries
+registry.source('global_index',
+                lambda: timeindex.load('global', dataset_version('global'), partial(registry.get, 'global_metrics'),
+                                       ['Confirmed', 'Deaths', 'Recovered']),
+                partial(dataset_version, 'global'))
+registry.source('india_index',
+                lambda: timeindex.load('india', dataset_version('india'), partial(registry.get, 'india_metrics'),
+                                       ['Confirmed', 'Cured', 'Deaths']),
+                partial(dataset_version, 'india'))
+
+
+# India state boundaries as a GeoDataFrame for the static maps, indexed by state id
+registry.source('india_state_geometry', partial(geometry.state_frame, 'static'), lambda: geometry.india_states.version)
+
+
+# Confirmed cases per date and location of the heatmap sources, read in chunks
+registry.source('heatmap_points', streaming.heatmap_points, streaming.heatmap_version)
+
+
+@registry.node('heatmap_frames', inputs=['heatmap_points'], params={'heatmap_freq': None, 'heatmap_grid': None})
+def build_heatmap_frames(points, heatmap_freq, heatmap_grid):
+    return heatmap.prepare(points, freq=heatmap_freq, grid=heatmap_grid)
+
+
+@registry.node('datewise_data', inputs=['global'])
+def build_datewise_data(df):
+    return datewise_metrics(df.groupby('ObservationDate')[['Confirmed', 'Deaths', 'Recovered']].sum())
+
+
+def datewise_metrics(totals):
+    """Add the active cases and the daily and 7-day average metrics (see ``metrics.derive_series``) to daily world totals."""
+    totals['Active'] = totals['Confirmed'] - (totals['Recovered'] + totals['Deaths'])
+    return metrics.derive_series(totals).reset_index()
+
+
+@registry.node('aggregated_df', inputs=['testing'])
+def build_weekly_testing(df1):
+    aggregated_df = df1.groupby('year_week_date').agg(
+        tests_done=('tests_done', 'sum'),  # Sum of tests done for the week
+        calculated_positivity_rate=('calculated_positivity_rate', 'mean')  # Mean of positivity rate
+    ).reset_index()
+
+    # Calculate a rolling average for the positivity rate (e.g., 3-week rolling average)
+    aggregated_df['rolling_positivity_rate'] = aggregated_df['calculated_positivity_rate'].rolling(window=3).mean()
+    return aggregated_df
+
+
+@registry.node('df_map', inputs=['global_cube'])
+def build_country_map_frame(global_cube):
+    df_map = global_cube.to_frame()
+    df_map = df_map.rename(columns={'ObservationDate': 'Date', 'Country/Region': 'Country_Region', 'Confirmed': 'ConfirmedCases', 'Deaths': 'TotalDeaths', 'Recovered': 'TotalRecovered'})
+    df_map['country_id'] = COUNTRIES.resolve(df_map['Country_Region'])
+    df_map['iso_alpha'] = COUNTRIES.keys(df_map['country_id'])
+    df_map['Date'] = pd.to_datetime(df_map['Date'])
+
+    df_map['Recovery_Rate'] = (df_map['TotalRecovered'] / df_map['ConfirmedCases']) * 100
+    df_map['Mortality_Rate'] = (df_map['TotalDeaths'] / df_map['ConfirmedCases']) * 100
+    return df_map
+
+
+
+# Mortality and recovery rates per frame date (rows) and country (columns) of the animated maps
+@registry.node('mortality_map_frames', inputs=['df_map'], params={'map_freq': 'W'})
+def build_mortality_map_frames(df_map, map_freq):
+    return choropleth.prepare(df_map, 'Mortality_Rate', freq=map_freq)
+
+
+@registry.node('recovery_map_frames', inputs=['df_map'], params={'map_freq': 'W'})
+def build_recovery_map_frames(df_map, map_freq):
+    return choropleth.prepare(df_map, 'Recovery_Rate', freq=map_freq)
+
+@registry.node('global_totals', inputs=['global'])
+def build_global_totals(global_data):
+    # Rows are grouped on the country id, so every spelling of a country adds up; names come from the dimension
+    global_totals = global_data.groupby('country_id')[['Confirmed', 'Deaths', 'Recovered']].sum().reset_index()
+    global_totals.insert(0, 'Country/Region', _dimension_names(COUNTRIES, global_totals['country_id']))
+    return add_country_totals(global_totals)
+
+
+def _dimension_names(dimension, ids):
+    # Canonical names of the ids; rows that matched no member were reported when the data was loaded
+    return pd.Series(dimension.names(ids), index=ids.index).fillna('Unknown')
+
+
+def add_country_totals(global_totals):
+    global_totals_sum = global_totals[['Confirmed', 'Deaths', 'Recovered']].sum()
+    global_totals['Active'] = global_totals['Confirmed'] - (global_totals['Deaths'] + global_totals['Recovered'])
+    # Calculate Mortality Rate
+    global_totals['Mortality Rate'] = (global_totals['Deaths'] / global_totals['Confirmed']) * 100
+    return global_totals_sum, global_totals
+
+
+@registry.node('statewise_data', inputs=['india'])
+def build_statewise_data(india_data):
+    statewise_data = india_data.groupby('state_id')[['Confirmed', 'Cured', 'Deaths']].max()
+    statewise_data.index = pd.Index(_dimension_names(STATES, statewise_data.index.to_series()), name="State/UnionTerritory")
+    return add_state_rates(statewise_data)
+
+
+def add_state_rates(statewise_data):
+    statewise_data['Recovery Rate'] = (statewise_data['Cured'] * 100) / statewise_data['Confirmed']
+    statewise_data['Mortality Rate'] = (statewise_data['Deaths'] * 100) / statewise_data['Confirmed']
+    return statewise_data.sort_values(by="Confirmed", ascending=False)
+
+
+@registry.node('india_confirmed_long', inputs=['india_confirmed_wide'])
+def build_confirmed_long(df):
+    # One row per state and date; each date label is parsed once, not once per row
+    df_long = pd.melt(df, id_vars=['state', 'state_id'], var_name='date', value_name='cases')
+    date_columns = df.columns.drop(['state', 'state_id'])
+    dates = pd.Series(pd.to_datetime(date_columns), index=date_columns)
+    df_long['date'] = df_long['date'].map(dates)
+
+    # Spelling variants of a state (e.g. "Telengana***") are rows of their own in
+    # the file; add them up under the canonical state, dropping rows of no state
+    df_long = df_long[df_long['state_id'] != UNKNOWN]
+    df_long = df_long.groupby(['state_id', 'date'], as_index=False)['cases'].sum(min_count=1)
+    df_long.insert(0, 'state', pd.Categorical(STATES.names(df_long['state_id'])))
+    return df_long
+
+
+@registry.node('top10ActiveCases', inputs=['india'])
+def build_top_active_cases(covid_df):
+    # Row of peak active cases per state, so Date is the date of that peak
+    top = topn.max_rows(covid_df, 'State/UnionTerritory', 'Active_cases')
+    return top[['State/UnionTerritory', 'Active_cases', 'Date']].reset_index(drop=True)
+
+
+@registry.node('state_vaccine', inputs=['india_vaccine'])
+def build_state_vaccine(covid_vaccine):
+    vaccine = covid_vaccine[covid_vaccine.State != 'India']
+    vaccine['State'] = vaccine['State'].cat.remove_unused_categories()
+    return vaccine.rename(columns={'Total Individuals Vaccinated': "Total"})
+
+
+@registry.node('max_vacc', inputs=['state_vaccine'], params={'top_n': 10})
+def build_most_vaccinated(vaccine, top_n):
+    max_vacc = vaccine.groupby('State', observed=True)['Total'].sum().to_frame('Total')
+    return topn.top_n(max_vacc, 'Total', top_n)
+
+
+@registry.node('min_vacc', inputs=['state_vaccine'], params={'top_n': 10})
+def build_least_vaccinated(vaccine, top_n):
+    min_vacc = vaccine.groupby('State', observed=True)['Total'].sum().to_frame('Total')
+    return topn.top_n(min_vacc, 'Total', top_n, ascending=True)
+
+
+@registry.node('vaccination_bubbles', inputs=['vaccination'])
+def build_vaccination_bubbles(df3):
+    df3 = df3.dropna(subset=['TOTAL_VACCINATIONS', 'TOTAL_VACCINATIONS_PER100'])
+
+    # Add a 'Population' column (assumed from 'Total Vaccinations' and 'Vaccinations per 100 people')
+    df3['POPULATION'] = (df3['TOTAL_VACCINATIONS'] / df3['TOTAL_VACCINATIONS_PER100']) * 100
+    return df3
+
+
+@registry.node('country_features', inputs=['global_metrics', 'vaccination'])
+def build_country_features(global_metrics, vaccination):
+    return clustering.country_features(global_metrics, clustering.population(vaccination), exclude=['World'])
+
+
+# Clusters and the k sweep are cached under the data version and their
+# parameters, so they are only refitted when the data or the parameters change
+@registry.node('country_clusters', inputs=['country_features'], params={'n_clusters': 4, 'cluster_method': 'auto'})
+def build_country_clusters(features, n_clusters, cluster_method):
+    return clustering.fit(features, n_clusters, cluster_method)
+
+
+@registry.node('cluster_sweep', inputs=['country_features'],
+               params={'cluster_ks': tuple(range(2, 11)), 'cluster_method': 'auto'})
+def build_cluster_sweep(features, cluster_ks, cluster_method):
+    return clustering.sweep(features, cluster_ks, cluster_method)
+
+
+# With COVID_ENGINE=duckdb the per-date, per-country, per-state and top-N
+# aggregates above are replaced by SQL over the cached Parquet files; the
+# results are the same frames as the pandas versions, dtypes included.
+if sql_engine.enabled():
+
+    @registry.node('datewise_data', inputs=['sql:global'])
+    def build_datewise_data_sql(table):
+        datewise_data = sql_engine.aggregate(table, 'ObservationDate', ['Confirmed', 'Deaths', 'Recovered'])
+        return datewise_metrics(datewise_data.sort_values('ObservationDate').set_index('ObservationDate'))
+
+    @registry.node('global_totals', inputs=['sql:global'])
+    def build_global_totals_sql(table):
+        global_totals = sql_engine.aggregate(table, 'country_id', ['Confirmed', 'Deaths', 'Recovered'])
+        global_totals = global_totals.sort_values('country_id', ignore_index=True)
+        global_totals.insert(0, 'Country/Region', _dimension_names(COUNTRIES, global_totals['country_id']))
+        return add_country_totals(global_totals)
+
+    @registry.node('statewise_data', inputs=['sql:india'])
+    def build_statewise_data_sql(table):
+        statewise_data = sql_engine.aggregate(table, 'state_id', ['Confirmed', 'Cured', 'Deaths'], agg='max')
+        statewise_data = statewise_data.set_index('state_id').sort_index()
+        statewise_data.index = pd.Index(_dimension_names(STATES, statewise_data.index.to_series()), name="State/UnionTerritory")
+        return add_state_rates(statewise_data)
+
+    @registry.node('top10ActiveCases', inputs=['sql:india'])
+    def build_top_active_cases_sql(table):
+        return sql_engine.top_k_per_group(table, 'State/UnionTerritory', 'Active_cases', 1,
+                                          columns=['State/UnionTerritory', 'Active_cases', 'Date'])
+
+    @registry.node('max_vacc', inputs=['sql:india_vaccine'], params={'top_n': 10})
+    def build_most_vaccinated_sql(table, top_n):
+        max_vacc = sql_engine.top_n(table, 'State', 'Total Individuals Vaccinated', top_n, agg='sum',
+                                    where="State <> 'India'")
+        return max_vacc.rename(columns={'Total Individuals Vaccinated': 'Total'}).set_index('State')
+
+    @registry.node('min_vacc', inputs=['sql:india_vaccine'], params={'top_n': 10})
+    def build_least_vaccinated_sql(table, top_n):
+        min_vacc = sql_engine.top_n(table, 'State', 'Total Individuals Vaccinated', top_n, agg='sum',
+                                    ascending=True, where="State <> 'India'")
+        return min_vacc.rename(columns={'Total Individuals Vaccinated': 'Total'}).set_index('State')
@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.geometry import mapping, shape
+
+from data_cache import source_signature
+from data_loader import DATA_DIR
+from dimensions import STATES
+
+# State boundaries of India (GADM level 1, names in NAME_1).
+# Can be overridden with the COVID_STATE_GEOJSON environment variable.
+STATE_GEOJSON = os.environ.get('COVID_STATE_GEOJSON', os.path.join(DATA_DIR, 'Indian_States.geojson'))
+
+# Simplification levels: name -> tolerance in degrees (0 keeps the source geometry)
+TOLERANCES = {'full': 0.0, 'medium': 0.005, 'low': 0.02}
+
+# Level served to each kind of map. Browser choropleths are drawn a few
+# hundred pixels wide, so 0.02 degrees (about 2 km) is below a pixel; static
+# maps are rendered at up to 3000 pixels and get the finer level.
+MAP_LEVELS = {'choropleth': 'low', 'static': 'medium'}
+
+# Decimals kept in the coordinates of simplified levels (about 10 m)
+COORD_DECIMALS = 4
+
+
+def _simplify(geometries, tolerance):
+    if tolerance == 0:
+        return geometries
+    if hasattr(shapely, 'coverage_simplify'):
+        # Simplifies the shared borders once, so neighbouring states keep meeting without gaps
+        simplified = shapely.coverage_simplify(geometries, tolerance)
+    else:
+        simplified = shapely.simplify(geometries, tolerance, preserve_topology=True)
+    return shapely.transform(simplified, lambda coords: np.round(coords, COORD_DECIMALS))
+
+
+class GeometryStore:
+    """State boundaries parsed once and kept at several levels of detail.
+
+    Features are merged per canonical state id (see ``dimensions.STATES``),
+    so variant names and territories drawn as several features map onto one
+    id. All levels in ``TOLERANCES`` are computed when the file is first
+    read and again only when it changes.
+    """
+
+    def __init__(self, path, name_property='NAME_1'):
+        self.path = path
+        self.name_property = name_property
+        self._version = None
+        self._levels = {}
+        self._geojson = {}
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        version = self.version
+        if self._version == version:
+            return
+        with open(self.path, 'r') as f:
+            features = json.load(f)['features']
+        names = pd.Series([feature['properties'][self.name_property] for feature in features])
+        ids = STATES.resolve(names).to_numpy()
+        geometries = np.array([shape(feature['geometry']) for feature in features], dtype=object)
+
+        state_ids = np.unique(ids[ids != -1])
+        merged = np.array([shapely.union_all(geometries[ids == state_id]) for state_id in state_ids], dtype=object)
+        merged = shapely.make_valid(merged)
+        self._levels = {level: _simplify(merged, tolerance) for level, tolerance in TOLERANCES.items()}
+        self._ids = state_ids
+        self._geojson.clear()
+        self._frames.clear()
+        self._version = version
+
+    @property
+    def version(self):
+        """Version of the boundary file; changes whenever the file does."""
+        return source_signature(self.path)
+
+    def geojson(self, level='low'):
+        """Return the boundaries at ``level`` as a GeoJSON dict whose features carry ``state_id`` and ``name``.
+
+        The dict is shared between callers and must not be modified.
+        """
+        with self._lock:
+            self._load()
+            if level not in self._geojson:
+                names = STATES.names(self._ids)
+                self._geojson[level] = {'type': 'FeatureCollection', 'features': [
+                    {'type': 'Feature', 'id': int(state_id),
+                     'properties': {'state_id': int(state_id), 'name': name},
+                     'geometry': mapping(geometry)}
+                    for state_id, name, geometry in zip(self._ids, names, self._levels[level])
+                ]}
+            return self._geojson[level]
+
+    def frame(self, level='medium'):
+        """Return the boundaries at ``level`` as a GeoDataFrame indexed by ``state_id``."""
+        import geopandas as gpd
+
+        with self._lock:
+            self._load()
+            if level not in self._frames:
+                self._frames[level] = gpd.GeoDataFrame(
+                    {'name': STATES.names(self._ids)},
+                    geometry=list(self._levels[level]),
+                    index=pd.Index(self._ids, name='state_id'),
+                    crs='EPSG:4326',
+                )
+            return self._frames[level].copy()
+
+
+india_states = GeometryStore(STATE_GEOJSON)
+
+
+def state_geojson(map_type='choropleth'):
+    """Return the India state boundaries at the level served to ``map_type`` maps (see ``MAP_LEVELS``)."""
+    return india_states.geojson(MAP_LEVELS[map_type])
+
+
+def state_frame(map_type='static'):
+    """Return the India state boundaries as a GeoDataFrame at the level served to ``map_type`` maps."""
+    return india_states.frame(MAP_LEVELS[map_type])
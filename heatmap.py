@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from bar_race import frame_dates
+
+# Decimals kept for coordinates and weights in the generated page; two
+# decimals of a degree is about a kilometre, far below what the map can show
+COORD_DECIMALS = 2
+WEIGHT_DECIMALS = 3
+
+# Temporal steps offered by the dashboard: label -> resampling frequency (None keeps every day)
+STEPS = {'Daily': None, 'Weekly': 'W'}
+
+
+def prepare(points, value='Total Confirmed cases', freq=None, grid=None):
+    """Reduce the heatmap points to what the animated map shows.
+
+    ``points`` has one row per Date, Latitude and Longitude. Only the last
+    reporting day of each ``freq`` period is kept (all days if None), since
+    the values are cumulative. With ``grid`` (in degrees), locations are
+    snapped to a grid of that size and the points falling in one cell are
+    merged. Weights are ``log1p`` of the summed value, scaled to [0, 1], so
+    a few very large counts do not wash out the rest of the map.
+
+    Returns a frame with Date, Latitude, Longitude and weight, sorted by Date.
+    """
+    dates = frame_dates(np.unique(points['Date'].to_numpy()), freq=freq)
+    points = points[points['Date'].isin(dates)]
+
+    latitude = points['Latitude'].to_numpy(dtype='float64')
+    longitude = points['Longitude'].to_numpy(dtype='float64')
+    if grid:
+        latitude = np.round(latitude / grid) * grid
+        longitude = np.round(longitude / grid) * grid
+    prepared = pd.DataFrame({
+        'Date': points['Date'].to_numpy(),
+        'Latitude': latitude.round(COORD_DECIMALS),
+        'Longitude': longitude.round(COORD_DECIMALS),
+        'weight': points[value].to_numpy(dtype='float64'),
+    })
+    prepared = prepared.groupby(['Date', 'Latitude', 'Longitude'], as_index=False)['weight'].sum()
+
+    weights = np.log1p(prepared['weight'].to_numpy())
+    top = weights.max() if len(weights) else 0
+    prepared['weight'] = (weights / top if top > 0 else weights).round(WEIGHT_DECIMALS)
+    return prepared
+
+
+def layers(prepared):
+    """Return the per-day point lists and date labels HeatMapWithTime expects.
+
+    All points are converted to Python lists in one pass; each day's list is
+    a slice of it between consecutive date boundaries. No points give no days.
+    """
+    if prepared.empty:
+        return [], []
+    dates = prepared['Date'].to_numpy()
+    rows = prepared[['Latitude', 'Longitude', 'weight']].to_numpy().tolist()
+    starts = np.concatenate(([0], np.flatnonzero(dates[1:] != dates[:-1]) + 1))
+    ends = np.append(starts[1:], len(dates))
+    data = [rows[start:end] for start, end in zip(starts, ends)]
+    index = pd.DatetimeIndex(dates[starts]).strftime('%Y-%m-%d').tolist()
+    return data, index
@@ -0,0 +1,163 @@
+"""Append a new reporting day to a dataset without recomputing its aggregates from scratch.
+
+Usage::
+
+    python incremental.py global new_rows.csv [--output DIR]
+    python incremental.py india new_rows.csv
+
+``new_rows.csv`` holds the rows of the new date(s) in the source file's
+format, header included. The aggregates of the latest precompute build are
+extended with those rows only, the rows are appended to the source CSV and a
+new build is published with the updated aggregates. If publishing fails the
+source CSV is restored.
+"""
+import argparse
+import os
+import shutil
+
+import pandas as pd
+
+import artifacts
+import precompute
+from data_loader import DATASETS, dataset_path
+from frames import add_state_rates, datewise_metrics, registry
+
+# Length of the rolling windows in datewise_data; the last ROLLING_WINDOW rows
+# are the state needed to extend the daily and averaged columns
+ROLLING_WINDOW = 7
+
+# daily column -> cumulative column it is the difference of
+DAILY_COLUMNS = {
+    'daily_confirmed': 'Confirmed',
+    'daily_recovered': 'Recovered',
+    'daily_deaths': 'Deaths',
+    'daily_active': 'Active',
+}
+# moving average column -> daily column it averages
+AVERAGE_COLUMNS = {
+    '7_day_avg_confirmed': 'daily_confirmed',
+    '7_day_avg_recovered': 'daily_recovered',
+    '7_day_avg_deaths': 'daily_deaths',
+    '7_day_avg_active': 'daily_active',
+}
+
+
+def _continue_fill(history, values):
+    # Same masking as the full computation: negative values are replaced by the
+    # previous valid one, which for the first new row is the last stored value
+    filled = pd.concat([history, values.mask(values < 0)]).ffill().fillna(0)
+    return filled.iloc[len(history):]
+
+
+def append_datewise(datewise_data, rows):
+    """Extend ``datewise_data`` with the global rows of dates after its last one.
+
+    Only the last ``ROLLING_WINDOW`` rows of the existing frame are read, so
+    the cost grows with the number of new rows, not with the history.
+    """
+    tail = datewise_data.tail(ROLLING_WINDOW).set_index('ObservationDate')
+    new = rows.groupby('ObservationDate')[['Confirmed', 'Deaths', 'Recovered']].sum()
+    if len(tail) < ROLLING_WINDOW:
+        return datewise_metrics(pd.concat([datewise_data.set_index('ObservationDate')[new.columns], new]))
+    if new.index.min() <= tail.index.max():
+        raise ValueError(f"rows for {new.index.min().date()} are not after the last date "
+                         f"{tail.index.max().date()}; run a full precompute instead")
+
+    new['Active'] = new['Confirmed'] - (new['Recovered'] + new['Deaths'])
+    for daily, cumulative in DAILY_COLUMNS.items():
+        values = pd.concat([tail[cumulative], new[cumulative]]).diff().iloc[len(tail):]
+        new[daily] = _continue_fill(tail[daily], values)
+    for average, daily in AVERAGE_COLUMNS.items():
+        values = pd.concat([tail[daily], new[daily]]).rolling(window=ROLLING_WINDOW).mean().iloc[len(tail):]
+        new[average] = _continue_fill(tail[average], values)
+    return pd.concat([datewise_data, new.reset_index()], ignore_index=True)
+
+
+def append_statewise(statewise_data, rows):
+    """Fold the per-state maxima of ``rows`` into ``statewise_data``."""
+    columns = ['Confirmed', 'Cured', 'Deaths']
+    maxima = rows.groupby('State/UnionTerritory', observed=True)[columns].max()
+    current = statewise_data[columns]
+    current.index = current.index.astype(str)
+    maxima.index = maxima.index.astype(str)
+    statewise_data = pd.concat([current, maxima]).groupby(level=0).max()
+    statewise_data.index = pd.CategoricalIndex(statewise_data.index, name='State/UnionTerritory')
+    return add_state_rates(statewise_data)
+
+
+# dataset -> {node: function extending the node's output with new rows}
+APPENDERS = {
+    'global': {'datewise_data': append_datewise},
+    'india': {'statewise_data': append_statewise},
+}
+
+
+def read_rows(name, path):
+    """Read new rows of dataset ``name`` with the same columns, types and cleaning as the full file."""
+    _, clean, read_kwargs = DATASETS[name]
+    rows = pd.read_csv(path, **read_kwargs)
+    return clean(rows) if clean is not None else rows
+
+
+def _append_to_source(name, path):
+    source = dataset_path(name)
+    with open(source, 'rb') as f:
+        header = f.readline()
+        f.seek(-1, os.SEEK_END)
+        needs_newline = f.read(1) != b'\n'
+    with open(path, 'rb') as f:
+        new_header = f.readline()
+        body = f.read()
+    if new_header.strip() != header.strip():
+        raise ValueError(f"{path} does not have the same columns as {source}")
+    with open(source, 'ab') as f:
+        if needs_newline:
+            f.write(b'\n')
+        f.write(body if body.endswith(b'\n') else body + b'\n')
+
+
+def append(name, path, output=None, keep=3):
+    """Append the rows in ``path`` to dataset ``name`` and publish the updated aggregates."""
+    if name not in APPENDERS:
+        raise ValueError(f"no incremental update for {name!r}; choose from {', '.join(APPENDERS)}")
+    if output:
+        artifacts.ARTIFACT_DIR = output
+    rows = read_rows(name, path)
+
+    updated = {}
+    for node, appender in APPENDERS[name].items():
+        # The latest build is only a valid starting point if it was made from the current source file
+        if artifacts.entry_version('aggregates', node) == registry.version(node):
+            previous = artifacts.load_aggregate(node)
+        else:
+            previous = registry.get(node)
+        updated[node] = appender(previous, rows)
+
+    # The new build is versioned on the updated source file, so the rows are
+    # appended first; if publishing fails the original file is put back (same
+    # bytes and modification time), so a retry does not append them twice
+    source = dataset_path(name)
+    backup = f"{source}.orig"
+    shutil.copy2(source, backup)
+    try:
+        _append_to_source(name, path)
+        build_dir = precompute.publish(updated, output=output, keep=keep)
+    except BaseException:
+        os.replace(backup, source)
+        raise
+    os.remove(backup)
+    return build_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Append new reporting days to a COVID-19 dataset.")
+    parser.add_argument('dataset', choices=sorted(APPENDERS))
+    parser.add_argument('rows', help="CSV file with the new rows, in the source file's format")
+    parser.add_argument('--output', default=None, help="artifact directory (default: ARTIFACT_DIR)")
+    parser.add_argument('--keep', type=int, default=3, help="number of builds to keep (default: %(default)s)")
+    args = parser.parse_args(argv)
+    append(args.dataset, args.rows, output=args.output, keep=args.keep)
+
+
+if __name__ == "__main__":
+    main()
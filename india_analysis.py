@@ -1,14 +1,19 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import plotly.express as px
-import pycountry
-import seaborn as sns
-import folium
-import geopandas as gpd
 import streamlit as st
 import plotly.graph_objects as go
-from PIL import Image
-import json
+from functools import partial
+from data_loader import get_dataset
+import figure_cache
+import figures
+import geometry
+import render_service
+import rendering
+from frames import registry
+import timeseries
+import topn
+import bar_race
 
 # Set page configuration
 st.set_page_config(
@@ -214,69 +219,286 @@ st.markdown("""
 
 
 
-def plot_statewise_data(statewise_data):
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.barh(statewise_data.index, statewise_data['Confirmed'], color='orange')
-    ax.set_xlabel('Confirmed Cases')
-    ax.set_title('State-wise Confirmed COVID-19 Cases in India')
-    ax.invert_yaxis()
+def vaccination_map_figure(vaccine):
+    """Build the choropleth of the vaccination coverage of every state."""
+    vaccine.columns = vaccine.columns.str.strip()
+
+    # Indian state boundaries keyed by state id, simplified for a browser map
+    india_states_geojson = geometry.state_geojson('choropleth')
+
+    # Create choropleth map for Indian states using GeoJSON
+    fig = px.choropleth(vaccine, 
+                        locations="state_id", 
+                        geojson=india_states_geojson,
+                        color="Total Doses Administered", 
+                        hover_name="State", 
+                        hover_data=["Covaxin (Doses Administered)", 
+                                    "CoviShield (Doses Administered)", 
+                                    "Sputnik V (Doses Administered)"],
+                        color_continuous_scale="Viridis", 
+                        title="COVID-19 Vaccination Coverage Across India by State",
+                        locationmode="geojson-id",  # Use 'geojson-id' instead of 'geojson'
+                        featureidkey="properties.state_id")  # Match rows and shapes on the state id
+
+    # Update geojson layout for India
+    fig.update_geos(fitbounds="locations")
+    return fig
+
+
+def gender_vaccination_figure(vaccination):
+    """Build the donut chart of the individuals vaccinated by gender."""
+    data = {
+        'Gender': ['Male', 'Female'],
+        'Vaccinations': [vaccination['Male(Individuals Vaccinated)'].sum(), vaccination['Female(Individuals Vaccinated)'].sum()]
+    }
+    vaccination_df = pd.DataFrame(data)
+
+    # Create the pie chart
+    fig = px.pie(
+        vaccination_df,
+        names='Gender',
+        values='Vaccinations',
+        title="Male vs Female Vaccination",
+        color=['#1f77b4', '#ff7f0e'],  # Custom colors for male and female
+        hole=0.3  # Makes it a donut chart
+    )
+
+    # Update the traces to show percentages
+    fig.update_traces(textinfo='label+percent', pull=[0.1, 0])  # Pull out the male section slightly
+
+    # Update the layout for better appearance
+    fig.update_layout(
+        title_font=dict(size=20, color='black', family="Arial"),
+        legend=dict(title="Gender"),
+        margin=dict(t=50, b=0, l=0, r=0)  # Adjust margins for better spacing
+    )
+    return fig
+
+
+def confirmed_map_over_time_figure(complete):
+    """Build the animated map of the confirmed cases of every state, one frame per date."""
+    fig = px.scatter_geo(
+        complete,
+        lat='Latitude',
+        lon='Longitude',
+        hover_name='Name of State / UT',
+        size='Total Confirmed cases',
+        color='Total Confirmed cases',
+        color_continuous_scale='Reds',
+        title='Total Confirmed COVID-19 Cases by State in India Over Time',
+        projection='natural earth',
+        animation_frame='Date',  # Directly use 'Date' column for animation
+        size_max=100  # Adjust bubble size for better visibility
+    )
+
+    # Set map scope to Asia and restrict to India's latitude and longitude range
+    fig.update_geos(
+        scope='asia',
+        lataxis_range=[5, 37],   # Approximate latitude range for India
+        lonaxis_range=[67, 97],  # Approximate longitude range for India
+        showcountries=True,      # Show country borders
+        countrycolor="Black"     # Country border color
+    )
+
+    # Customize animation settings for smoother transitions
+    fig.update_layout(
+        updatemenus=[{
+            'buttons': [
+                {
+                    'args': [None, {'frame': {'duration': 1000, 'redraw': True}, 'fromcurrent': True}],
+                    'label': 'Play',
+                    'method': 'animate'
+                },
+                {
+                    'args': [[None], {'frame': {'duration': 0, 'redraw': True}, 'mode': 'immediate', 'transition': {'duration': 0}}],
+                    'label': 'Pause',
+                    'method': 'animate'
+                }
+            ],
+            'direction': 'left',
+            'pad': {'r': 10, 't': 87},
+            'showactive': False,
+            'type': 'buttons',
+            'x': 0.1,
+            'xanchor': 'right',
+            'y': 0,
+            'yanchor': 'top'
+        }]
+    )
     return fig
-def compare_daily_cases_with_slider(state1, state2, data):
+
+
+def latest_confirmed_map_figure(complete):
+    """Build the map of the latest confirmed cases of every state."""
+    latest_data = topn.latest_rows(complete, 'Name of State / UT').reset_index(drop=True)
+
+    # Ensure the hover data includes state names explicitly
+    fig = px.scatter_geo(
+        latest_data,
+        lat='Latitude',
+        lon='Longitude',
+        size='Total Confirmed cases',
+        color='Total Confirmed cases',
+        color_continuous_scale='Viridis',
+        title='Total Confirmed COVID-19 Cases by State in India (Latest Data)',
+        projection='natural earth',
+        size_max=100,
+        template='plotly_dark',
+        hover_data={
+            'Name of State / UT': True,  # Ensures state name is shown
+            'Total Confirmed cases': True,  # Explicitly include Total Confirmed Cases in hover
+            'Latitude': False,  # Optionally exclude Latitude from hover
+            'Longitude': False  # Optionally exclude Longitude from hover
+        }
+    )
+
+    # Update hover template for additional customization
+    fig.update_traces(
+        hovertemplate="<b>%{customdata[0]}</b><br>Total Confirmed Cases: %{marker.size}<extra></extra>"
+    )
+
+    # Set map scope and restrict to India's region
+    fig.update_geos(
+        scope='asia',
+        lataxis_range=[5, 37],
+        lonaxis_range=[67, 97],
+        showcountries=True,
+        countrycolor="Black",
+        showland=True,
+        landcolor="rgb(250, 250, 250)"
+    )
+
+    # Layout adjustments
+    fig.update_layout(
+        geo=dict(showcoastlines=True, coastlinecolor="Black"),
+        title_font=dict(size=20, color='white', family='Arial'),
+        margin={"r":0, "t":40, "l":0, "b":0}
+    )
+    return fig
+
+
+def vaccination_trend_figure(vaccine, selected_vaccine, vaccine_options, x_range=None, width=timeseries.PIXEL_WIDTH):
+    """Build the line chart of the doses of ``selected_vaccine`` (a key of ``vaccine_options``) per state over time.
+
+    One line per state and vaccine, downsampled to ``width`` pixels (see ``timeseries.line_traces``).
     """
-    Function to compare daily new COVID-19 cases between two states with a live timeline graph and slider.
+    vaccine['State'] = vaccine['State'].str.strip()  # Clean any extra spaces or characters
+    vaccine['Date'] = pd.to_datetime(vaccine['Updated On'])
+
+    # Filter data based on selected vaccine
+    if selected_vaccine != 'All Vaccines':
+        columns = {selected_vaccine: vaccine_options[selected_vaccine]}
+    else:
+        # Every vaccine of a state shares the state's colour and legend entry
+        columns = {name: column for name, column in vaccine_options.items() if column != 'all'}
+
+    colors = px.colors.qualitative.Plotly
+    series = []
+    for i, (state, state_df) in enumerate(vaccine.sort_values('Date').groupby('State', sort=False)):
+        for j, (name, column) in enumerate(columns.items()):
+            series.append(dict(x=state_df['Date'], y=state_df[column], name=state, legendgroup=state,
+                               showlegend=j == 0, line=dict(color=colors[i % len(colors)]),
+                               hovertemplate=f"{state}<br>{name}: %{{y}}<extra></extra>"))
+
+    fig = go.Figure(timeseries.line_traces(series, width, x_range))
+
+    # Customize layout for better visuals
+    fig.update_layout(
+        title='Vaccination Coverage Over Time',
+        xaxis_title='Date',
+        yaxis_title='Doses Administered',
+        hovermode='closest',
+        template='plotly_dark',  # Change chart template for visual appeal
+        showlegend=True
+    )
+    return fig
+
+
+def daily_cases_deaths_figure(india_metrics, region):
+    """Plot the daily cases and deaths of ``region`` (a state or India)."""
+    daily_df = india_metrics.to_frame(entities=[region])
+
+    # Plot Daily Cases and Deaths
+    fig1, ax1 = plt.subplots(figsize=(12, 6))
+    ax1.plot(daily_df['Date'], daily_df['daily_confirmed'], label='Daily Cases', color='blue')
+    ax1.plot(daily_df['Date'], daily_df['daily_deaths'], label='Daily Deaths', color='red')
+    ax1.set_title(f'Daily COVID-19 Cases and Deaths in {region}')
+    return fig1
+
+
+def compare_daily_cases_with_slider(states, data, x_range=None, width=timeseries.PIXEL_WIDTH):
+    """
+    Function to compare daily new COVID-19 cases between states with a timeline graph and slider.
 
     Parameters:
-    - state1: Name of the first state
-    - state2: Name of the second state
+    - states: Names of the states to compare
     - data: DataFrame containing COVID-19 data with columns: 'Date', 'Name of State / UT', 'New cases'
-    
+    - x_range: Optional (start, end) dates to draw; the whole series by default
+    - width: Pixel width the lines are downsampled to (see ``timeseries.line_traces``)
+
     Returns:
-    - An interactive plot comparing daily new cases for the two states with a slider.
+    - An interactive plot comparing daily new cases for the states with a slider, or None if
+      none of the states are in the dataset. States without data are left out; the caller
+      reports them, since the plot is cached.
+
+    The full daily series of every state is drawn once; each animation frame only moves
+    a marker per state and the date cursor, so every frame has the same size.
     """
-    
-    # Filter data for the two states
-    state1_data = data[data['Name of State / UT'] == state1]
-    state2_data = data[data['Name of State / UT'] == state2]
-    
-    # Check if both states are in the dataset
-    if state1_data.empty or state2_data.empty:
-        print(f"Error: One or both states ({state1}, {state2}) not found in the dataset.")
-        return
-    
-    # Create traces for both states
-    trace1 = go.Scatter(x=state1_data['Date'], 
-                        y=state1_data['New cases'], 
-                        mode='lines', 
-                        name=state1, 
-                        line=dict(color='blue'))
-    
-    trace2 = go.Scatter(x=state2_data['Date'], 
-                        y=state2_data['New cases'], 
-                        mode='lines', 
-                        name=state2, 
-                        line=dict(color='red'))
-
-    # Create frames for the animation
-    frames = [go.Frame(
-        data=[go.Scatter(x=state1_data['Date'][:k], y=state1_data['New cases'][:k], mode='lines', name=state1),
-              go.Scatter(x=state2_data['Date'][:k], y=state2_data['New cases'][:k], mode='lines', name=state2)],
-        name=str(i)
-    ) for i, k in enumerate(range(1, len(state1_data)+1))]
-    
+
+    # One row per date, one column per state
+    selected = data[data['Name of State / UT'].isin(states)]
+    wide = selected.pivot_table(index='Date', columns='Name of State / UT', values='New cases',
+                                aggfunc='sum', observed=True)
+    wide.columns = wide.columns.astype(str)
+    wide = wide[[state for state in states if state in wide.columns]]
+    if x_range is not None:
+        wide = wide.loc[pd.Timestamp(x_range[0]):pd.Timestamp(x_range[1])]
+    if wide.empty:
+        return None
+
+    dates = wide.index
+    labels = dates.strftime('%Y-%m-%d')
+    colors = px.colors.qualitative.Plotly
+    state_colors = [colors[i % len(colors)] for i in range(len(wide.columns))]
+
+    # Create one trace per state, plus the marker trace the frames move along the lines
+    traces = timeseries.line_traces([dict(x=dates, y=wide[state], name=state, line=dict(color=color))
+                                     for state, color in zip(wide.columns, state_colors)], width)
+    traces.append(go.Scatter(x=[dates[0]] * len(wide.columns),
+                             y=wide.iloc[0],
+                             mode='markers',
+                             marker=dict(color=state_colors, size=10),
+                             hoverinfo='skip',
+                             showlegend=False))
+
+    def cursor(date):
+        return [dict(type='line', xref='x', yref='paper', x0=date, x1=date, y0=0, y1=1,
+                     line=dict(color='gray', dash='dot'))]
+
+    # Frames are plain dicts holding only the marker positions and the cursor
+    values = wide.to_numpy()
+    frames = [{
+        'name': label,
+        'data': [{'x': [date] * len(wide.columns), 'y': row}],
+        'traces': [len(wide.columns)],
+        'layout': {'shapes': cursor(date)},
+    } for date, label, row in zip(dates, labels, values)]
+
     # Create layout with a slider
     layout = go.Layout(
-        title=f"Comparison of Daily New COVID-19 Cases: {state1} vs {state2}",
+        title=f"Comparison of Daily New COVID-19 Cases: {' vs '.join(wide.columns)}",
         xaxis=dict(title="Date"),
         yaxis=dict(title="Daily New Cases"),
+        shapes=cursor(dates[0]),
         updatemenus=[{
             'buttons': [
                 {
-                    'args': [None, {'frame': {'duration': 500, 'redraw': True}, 'fromcurrent': True}],
+                    'args': [None, {'frame': {'duration': 500, 'redraw': False}, 'fromcurrent': True}],
                     'label': 'Play',
                     'method': 'animate'
                 },
                 {
-                    'args': [[None], {'frame': {'duration': 0, 'redraw': True}, 'mode': 'immediate', 'transition': {'duration': 0}}],
+                    'args': [[None], {'frame': {'duration': 0, 'redraw': False}, 'mode': 'immediate', 'transition': {'duration': 0}}],
                     'label': 'Pause',
                     'method': 'animate'
                 }
@@ -297,8 +519,7 @@ def compare_daily_cases_with_slider(state1, state2, data):
                 'font': {'size': 20},
                 'visible': True,
                 'xanchor': 'right',
-                'prefix': 'Date: ',
-                'visible': True
+                'prefix': 'Date: '
             },
             'transition': {'duration': 300, 'easing': 'cubic-in-out'},
             'pad': {'b': 10},
@@ -307,65 +528,93 @@ def compare_daily_cases_with_slider(state1, state2, data):
             'y': 0.0,
             'steps': [{
                 'args': [
-                    [f'{state1_data["Date"].iloc[i]}'],
-                    {'frame': {'duration': 500, 'redraw': True}, 'mode': 'immediate'}
+                    [label],
+                    {'frame': {'duration': 500, 'redraw': False}, 'mode': 'immediate'}
                 ],
-                'label': f'{state1_data["Date"].iloc[i]}',
+                'label': label,
                 'method': 'animate'
-            } for i in range(len(state1_data))]
+            } for label in labels]
         }]
     )
-    
+
     # Create the figure with data and frames
-    fig = go.Figure(data=[trace1, trace2], layout=layout, frames=frames)
+    return go.Figure(data=traces, layout=layout, frames=frames)
+@st.fragment
+def vaccination_trend_view():
+    """Doses of one vaccine per state over time; the vaccine picker only reruns this view."""
+    vaccine = registry.get('state_vaccine')
+
+    # Create a dropdown to select the vaccine
+    vaccine_options = {
+        'Covaxin': ' Covaxin (Doses Administered)',
+        'CoviShield': 'CoviShield (Doses Administered)',
+        'Sputnik V': 'Sputnik V (Doses Administered)',
+        'All Vaccines': 'all'
+    }
+
+    selected_vaccine = st.selectbox(
+        'Select Vaccine to Display:',
+        options=list(vaccine_options.keys()),
+        index=3  # Default to 'All Vaccines'
+    )
+
+    # Cached per vaccine and zoomed range until the vaccination data changes
+    timeseries.show('india/vaccination_trend', registry.version('state_vaccine'),
+                    partial(vaccination_trend_figure, vaccine, selected_vaccine, vaccine_options),
+                    key='vaccination_trend', vaccine=selected_vaccine)
+
+
+@st.fragment
+def daily_cases_view():
+    """Daily cases and deaths of one region; the region picker only reruns this view."""
+    # Daily values of every state and of India as a whole are precomputed in the metrics panel
+    india_metrics = registry.get('india_metrics')
+    region = st.selectbox("Select Region:", options=['India'] + [state for state in india_metrics.entities if state != 'India'])
+    rendering.show('india/daily_cases_deaths', registry.version('india_metrics'),
+                   lambda: daily_cases_deaths_figure(india_metrics, region), region=region)
+
+
+@st.fragment
+def state_comparison_view():
+    """Daily new cases of the chosen states side by side; the state picker only reruns this view."""
+    # Dropdowns for state selection with Indian states
+    state_options = [
+        "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar", "Chhattisgarh", "Goa", 
+        "Gujarat", "Haryana", "Himachal Pradesh", "Jharkhand", "Karnataka", "Kerala", 
+        "Madhya Pradesh", "Maharashtra", "Manipur", "Meghalaya", "Mizoram", "Nagaland", 
+        "Odisha", "Punjab", "Rajasthan", "Sikkim", "Tamil Nadu", "Telangana", "Tripura", 
+        "Uttar Pradesh", "Uttarakhand", "West Bengal", "Andaman and Nicobar Islands", 
+        "Chandigarh", "Dadra and Nagar Haveli and Daman and Diu", "Lakshadweep", "Delhi", 
+        "Puducherry"
+    ]
     
-    # Show the figure
-    fig.show()
-@st.cache_data
-def load_and_prepare_data():
-    # Load global COVID-19 data
-    global_data = pd.read_csv('/Users/ayyalashriyatha/Desktop/covid_19_data.csv')
-    global_data['ObservationDate'] = pd.to_datetime(global_data['ObservationDate'])
-
-    # Fill missing values in global data
-    if 'Province/State' in global_data:
-        global_data['Province/State'] = global_data['Province/State'].fillna('Unknown')
-
-    # Clean negative values
-    for column in ['Confirmed', 'Deaths', 'Recovered']:
-        global_data[column] = global_data[column].clip(lower=0).fillna(0)
-
-    # Aggregate global data
-    global_totals = global_data.groupby('Country/Region').sum(numeric_only=True).reset_index()
-    global_totals_sum = global_totals[['Confirmed', 'Deaths', 'Recovered']].sum()
-    global_totals['Active'] = global_totals['Confirmed'] - (global_totals['Deaths'] + global_totals['Recovered'])
-    # Calculate Mortality Rate
-    global_totals['Mortality Rate'] = (global_totals['Deaths'] / global_totals['Confirmed']) * 100
-
-    # Prepare datewise data
-    datewise_data = global_data.groupby('ObservationDate').sum(numeric_only=True).reset_index()
-    datewise_data['Daily Confirmed'] = datewise_data['Confirmed'].diff().fillna(0)
-    datewise_data['Growth Rate'] = datewise_data['Daily Confirmed'].pct_change().fillna(0) * 100
-
-    # Load India-specific COVID-19 data
-    india_data = pd.read_csv('/Users/ayyalashriyatha/Desktop/covid_19_india.csv')
-    india_data = india_data.drop(columns=["Sno", "Time", "ConfirmedIndianNational", "ConfirmedForeignNational"])
-    india_data['Active_cases'] = india_data['Confirmed'] - (india_data['Cured'] + india_data['Deaths'])
-    india_data['State/UnionTerritory'] = india_data['State/UnionTerritory'].replace({
-        'Maharashtra***': "Maharashtra",
-        'Bihar****': "Bihar",
-        'Madhya Pradesh***': "Madhya Pradesh",
-        'Karanataka': "Karnataka"
-    })
-
-    # State-wise summary data
-    statewise_data = pd.pivot_table(india_data, values=['Confirmed', 'Deaths', 'Cured'], 
-                                    index="State/UnionTerritory", aggfunc='max')
-    statewise_data['Recovery Rate'] = (statewise_data['Cured'] * 100) / statewise_data['Confirmed']
-    statewise_data['Mortality Rate'] = (statewise_data['Deaths'] * 100) / statewise_data['Confirmed']
-    statewise_data = statewise_data.sort_values(by="Confirmed", ascending=False)
-
-    return global_totals_sum, global_totals, statewise_data, datewise_data
+    states = st.multiselect(
+        "Select States to Compare:",
+        options=state_options,  # List of actual Indian states
+        default=state_options[:2]
+    )
+
+    # Display user selections
+    st.markdown(f"""
+    <div class="description" style="margin-top: 20px;">
+        <strong>Selected States:</strong> 
+        {' vs. '.join(f'<span style="color: #bb86fc;">{state}</span>' for state in states)}
+    </div>
+    """, unsafe_allow_html=True)
+
+    df11 = get_dataset('india_complete')
+    # Checked on every run: the figure below comes from the cache after the first one
+    reported = set(df11['Name of State / UT'].astype(str).unique())
+    missing = [state for state in states if state not in reported]
+    if missing:
+        st.warning(f"No data found for: {', '.join(missing)}")
+
+    if states:
+        # Cached per set of states and zoomed range until the data changes
+        timeseries.show('india/state_comparison', registry.version('india_complete'),
+                        partial(compare_daily_cases_with_slider, states, df11),
+                        key='state_comparison', states=tuple(states))
+
 
 def main():
     
@@ -401,46 +650,7 @@ def main():
         st.subheader("Welcome to the COVID-19 Analysis Dashboard")
         st.write("Choose an analysis option to explore further.")
 
-    global_totals_sum, global_totals, statewise_data, datewise_data = load_and_prepare_data()
-    covid_19 = pd.read_csv('/Users/ayyalashriyatha/Desktop/covid_19_india.csv')
-    covid_vaccine = pd.read_csv('/Users/ayyalashriyatha/Desktop/covid_vaccine_statewise.csv')
-    df = pd.read_csv('/Users/ayyalashriyatha/Desktop/covid_19_india.csv')
-    covid_df = covid_19.drop(["Sno","Time","ConfirmedIndianNational","ConfirmedForeignNational"],axis=1)
-    covid_df['Active_cases']=covid_df['Confirmed']-(covid_df['Cured']+covid_df['Deaths'])
-    covid_df['State/UnionTerritory']=covid_df['State/UnionTerritory'].replace('Maharashtra***',"Maharashtra")
-    covid_df['State/UnionTerritory']=covid_df['State/UnionTerritory'].replace('Bihar****',"Bihar")
-    covid_df['State/UnionTerritory']=covid_df['State/UnionTerritory'].replace('Madhya Pradesh***',"Madhya Pradesh")
-    covid_df['State/UnionTerritory']=covid_df['State/UnionTerritory'].replace('Karanataka',"Karnataka")
-    top10ActiveCases=covid_df.groupby(by='State/UnionTerritory').max()[['Active_cases','Date']].sort_values(by=['Active_cases'],ascending=False).reset_index()
-
-    df11 = pd.read_csv('/Users/ayyalashriyatha/Desktop/complete.csv')
-    df11['Name of State / UT'] = df11['Name of State / UT'].replace({
-        'Telengana': 'Telangana',
-        'Telangana***': 'Telangana',
-        'Union Territory of Ladakh': 'Ladakh',
-        'Union Territory of Jammu and Kashmir': 'Jammu and Kashmir',
-        'Union Territory of Chandigarh': 'Chandigarh'
-    })
-
-    # Convert Date column to datetime
-    df11['Date'] = pd.to_datetime(df11['Date'], errors='coerce')
-
-    # Convert Death column to numeric, handling non-numeric entries by setting them to NaN
-    df11['Death'] = pd.to_numeric(df11['Death'], errors='coerce')
-    df11['Death']=df11['Death'].fillna(0)
-
-    vaccination=covid_vaccine.drop(columns=['Sputnik V (Doses Administered)','AEFI','18-44 Years (Doses Administered)','45-60 Years (Doses Administered)','60+ Years (Doses Administered)'],axis=1)
-    vaccine=covid_vaccine[covid_vaccine.State!='India']
-    vaccine = vaccine.rename(columns={'Total Individuals Vaccinated':"Total"})
-
-        #Most vaccinated State
-    max_vacc=vaccine.groupby('State')['Total'].sum().to_frame('Total')
-    max_vacc=max_vacc.sort_values(by='Total',ascending=False)[:10]
-
-        #Least vaccinated State
-    min_vacc=vaccine.groupby('State')['Total'].sum().to_frame('Total')
-    min_vacc=min_vacc.sort_values(by='Total',ascending=True)[:10]
-
+    # Each view loads the frames it reads, so the page only pays for the selected view
     if option == "Vaccination Analysis":
         st.markdown("""
         <div class="section">
@@ -493,31 +703,8 @@ def main():
                     males and females in different regions. This data helps understand gender parity in vaccination drives.
                 </div>
                 """, unsafe_allow_html=True)
-                data = {
-                    'Gender': ['Male', 'Female'],
-                    'Vaccinations': [vaccination['Male(Individuals Vaccinated)'].sum(), vaccination['Female(Individuals Vaccinated)'].sum()]
-                }
-                vaccination_df = pd.DataFrame(data)
-
-                # Create the pie chart
-                fig = px.pie(
-                    vaccination_df,
-                    names='Gender',
-                    values='Vaccinations',
-                    title="Male vs Female Vaccination",
-                    color=['#1f77b4', '#ff7f0e'],  # Custom colors for male and female
-                    hole=0.3  # Makes it a donut chart
-                )
-
-                # Update the traces to show percentages
-                fig.update_traces(textinfo='label+percent', pull=[0.1, 0])  # Pull out the male section slightly
-
-                # Update the layout for better appearance
-                fig.update_layout(
-                    title_font=dict(size=20, color='black', family="Arial"),
-                    legend=dict(title="Gender"),
-                    margin=dict(t=50, b=0, l=0, r=0)  # Adjust margins for better spacing
-                )
+                fig = figure_cache.cached('india/gender_vaccination', registry.version('india_vaccine'),
+                                          lambda: gender_vaccination_figure(get_dataset('india_vaccine')))
 
                 # Show the figure
                 st.plotly_chart(fig)
@@ -528,18 +715,7 @@ def main():
                     across gender categories. Gain insights into equitable dose distribution among genders.
                 </div>
                 """, unsafe_allow_html=True)
-                age_groups = ['18-44 Years (Doses Administered)', '45-60 Years (Doses Administered)', '60+ Years (Doses Administered)']
-                age_distribution = covid_vaccine[age_groups].sum()
-
-                # Bar Chart for Age-wise Distribution of Vaccination
-                fig = plt.figure(figsize=(10, 6))
-                plt.bar(age_distribution.index, age_distribution.values, color='lightblue')
-                plt.title('Age-wise Distribution of Vaccination Doses Administered')
-                plt.xlabel('Age Group')
-                plt.ylabel('Number of Doses Administered')
-                plt.xticks(rotation=45)
-                plt.grid(axis='y')
-                st.pyplot(fig)
+                figures.show('india/age_doses')
             elif demo_option == "Age-wise Distribution of Doses":
                 st.markdown("""
                 <div class="description">
@@ -547,18 +723,7 @@ def main():
                     to understand the outreach to vulnerable populations.
                 </div>
                 """, unsafe_allow_html=True)
-                gender_groups = ['Male (Doses Administered)', 'Female (Doses Administered)', 'Transgender (Doses Administered)']
-                gender_distribution = covid_vaccine[gender_groups].sum()
-
-                # Bar Chart for Gender-wise Distribution of Vaccination
-                fig = plt.figure(figsize=(10, 6))
-                plt.bar(gender_distribution.index, gender_distribution.values, color='lightgreen')
-                plt.title('Gender-wise Distribution of Vaccination Doses Administered')
-                plt.xlabel('Gender')
-                plt.ylabel('Number of Doses Administered')
-                plt.xticks(rotation=45)
-                plt.grid(axis='y')
-                st.pyplot(fig)
+                figures.show('india/gender_doses')
 
         elif visualization_option == "State Coverage":
             st.markdown("""
@@ -599,49 +764,7 @@ def main():
                 """, unsafe_allow_html=True)
                 # Placeholder for actual visualization (e.g., bar chart)
                 st.write("📊 [Bar Chart Placeholder: Top 10 Vaccinated States]")
-                fig, ax = plt.subplots(figsize=(12, 6))
-                plt.title("Top 10 Vaccinated States in India", fontsize=20, fontweight='bold')
-
-                # Create a bar plot with hue set to 'State/Union Territory'
-                palette = sns.color_palette("Blues", len(max_vacc.iloc[:10]))
-                max_value_index = max_vacc['Total'].idxmax()  # Get the index of the maximum value
-
-                sns.barplot(
-                    data=max_vacc.iloc[:10],
-                    y='Total',
-                    x=max_vacc.index[:10],
-                    hue=max_vacc.index[:10],  # Set the hue to the x variable
-                    linewidth=2,
-                    edgecolor='black',
-                    palette=palette,
-                    legend=False  # Disable the legend since hue is used for the same variable
-                )
-
-                # Change color of the bar with the maximum value
-                for p in ax.patches:
-                    if p.get_height() == max_vacc['Total'].max():
-                        p.set_color('#FF6347')  # Highlight color for maximum value
-
-                # Add data labels on top of the bars
-                for p in ax.patches:
-                    ax.annotate(
-                        f'{int(p.get_height())}',  # Get the height of the bar for labeling
-                        (p.get_x() + p.get_width() / 2., p.get_height()),  # Positioning the label
-                        ha='center', va='bottom', fontsize=12, fontweight='bold'
-                    )
-
-                # Set x and y labels
-                ax.set_xlabel("States", fontsize=14)
-                ax.set_ylabel("Total Vaccinations", fontsize=14)
-
-                # Rotate x-axis labels for better readability
-                plt.xticks(rotation=45, ha='right')
-
-                # Add gridlines with lighter style
-                ax.yaxis.grid(True, linestyle='--', alpha=0.5)
-                plt.tight_layout()
-
-                st.pyplot(fig)
+                render_service.show('india/most_vaccinated')
             
             elif state_option == "Least 10 Vaccinated States":
                 st.markdown("""
@@ -652,44 +775,7 @@ def main():
                 """, unsafe_allow_html=True)
                 # Placeholder for visualization
                 st.write("📉 [Bar Chart Placeholder: Least 10 Vaccinated States]")
-                # Create the figure
-                fig, ax = plt.subplots(figsize=(12, 5))
-                plt.title("Least 5 Vaccinated States in India", fontsize=20, fontweight='bold')
-
-                # Create a bar plot for the least vaccinated states
-                # Assuming `min_vacc` contains the states with the least vaccinations
-                sns.barplot(
-                    data=min_vacc.iloc[:10],  # Only take the least 5
-                    y='Total',
-                    x=min_vacc.index[:10],
-                    hue=min_vacc.index[:10],  # Set the hue to the x variable
-                    linewidth=2,
-                    edgecolor='black',
-                    palette='pastel',  # Using a pastel color palette for softer colors
-                    legend=False  # Disable the legend since hue is used for the same variable
-                )
-
-                # Add data labels on top of the bars
-                for p in ax.patches:
-                    ax.annotate(
-                        f'{int(p.get_height())}',  # Get the height of the bar for labeling
-                        (p.get_x() + p.get_width() / 2., p.get_height()),  # Positioning the label
-                        ha='center', va='bottom', fontsize=12, fontweight='bold'
-                    )
-
-                # Set x and y labels
-                ax.set_xlabel("States", fontsize=14)
-                ax.set_ylabel("Total Vaccinations", fontsize=14)
-                # Rotate x-axis labels for better readability
-                plt.xticks(rotation=30, ha='right')
-
-                # Add gridlines to the y-axis for better visibility
-                ax.yaxis.grid(True, linestyle='--', alpha=0.7)
-
-                # Adjust layout for better spacing
-                plt.tight_layout()
-
-                st.pyplot(fig)
+                render_service.show('india/least_vaccinated')
             elif state_option == "Vaccination by State":
                 st.markdown("""
                 <div class="description">
@@ -699,36 +785,12 @@ def main():
                 """, unsafe_allow_html=True)
                 # Placeholder for visualization
                 st.write("📊 [Comprehensive State Data Visualization Placeholder]")
-                                # Summing vaccination doses for each state across all age groups
-                vaccine['Total Doses Administered'] = (vaccine['18-44 Years (Doses Administered)'] + 
-                                                vaccine['45-60 Years (Doses Administered)'] + 
-                                                vaccine['60+ Years (Doses Administered)'])
-
-                # Aggregating by state
-                df_state_vaccination = vaccine.groupby('State')['Total Doses Administered'].sum().reset_index()
-
-                # Create the bar plot using Plotly Express
-                fig = px.bar(df_state_vaccination, 
-                            x='State', 
-                            y='Total Doses Administered',
-                            title='Total Vaccination Doses Administered by State',
-                            labels={'State': 'State', 'Total Doses Administered': 'Total Doses Administered'},
-                            template='plotly_dark')
-
-                # Customize layout for a cleaner look
-                fig.update_layout(
-                    xaxis_tickangle=-45,
-                    xaxis_title='State',
-                    yaxis_title='Total Doses Administered',
-                    showlegend=False
-                )
-
                 # Streamlit interface
                 st.title("Vaccination Data Visualization")
                 st.write("This chart shows the total vaccination doses administered by state.")
 
                 # Display the plotly figure inside Streamlit
-                st.plotly_chart(fig)
+                figures.show('india/vaccination_by_state')
 
             elif state_option == "Geographical Heat Map of Vaccination Coverage":
                 st.markdown("""
@@ -739,31 +801,10 @@ def main():
                 """, unsafe_allow_html=True)
                 # Placeholder for geographical heat map
                 st.write("🗺️ [Heat Map Placeholder: Vaccination Coverage]")
-                vaccine.columns = vaccine.columns.str.strip()
-
-                # Ensure 'State' names in your DataFrame match the GeoJSON state names
-                vaccine['State'] = vaccine['State'].str.strip()  # Remove extra spaces from state names in DataFrame
-
-                # Load Indian states GeoJSON file
-                with open('/Users/ayyalashriyatha/Desktop/Indian_states.geojson', 'r') as f:
-                    india_states_geojson = json.load(f)
-
-                # Create choropleth map for Indian states using GeoJSON
-                fig = px.choropleth(vaccine, 
-                                    locations="State", 
-                                    geojson=india_states_geojson,
-                                    color="Total Doses Administered", 
-                                    hover_name="State", 
-                                    hover_data=["Covaxin (Doses Administered)", 
-                                                "CoviShield (Doses Administered)", 
-                                                "Sputnik V (Doses Administered)"],
-                                    color_continuous_scale="Viridis", 
-                                    title="COVID-19 Vaccination Coverage Across India by State",
-                                    locationmode="geojson-id",  # Use 'geojson-id' instead of 'geojson'
-                                    featureidkey="properties.NAME_1")  # Match state names with 'NAME_1'
-
-                # Update geojson layout for India
-                fig.update_geos(fitbounds="locations")
+                # Cached until the vaccination data or the state boundaries change
+                fig = figure_cache.cached('india/vaccination_map',
+                                          f"{registry.version('state_vaccine')}-{geometry.india_states.version}",
+                                          lambda: vaccination_map_figure(registry.get('state_vaccine')))
 
                 # Streamlit Layout
                 st.title("Interactive Vaccination Coverage Map for India")
@@ -806,24 +847,7 @@ def main():
                 """, unsafe_allow_html=True)
                 # Placeholder for visualization
                 st.write("📈 [Line Chart Placeholder: Vaccination Rate Over Time]")
-                covid_vaccine = covid_vaccine[covid_vaccine['State'] != 'India']
-                covid_vaccine['Updated On'] = pd.to_datetime(covid_vaccine['Updated On'], errors='coerce', dayfirst=True)
-
-
-                # Group by 'Updated On' for cumulative vaccination rate over time
-                df_time = covid_vaccine.groupby('Updated On').sum()
-                df_time['Cumulative First Dose'] = df_time['First Dose Administered'].cumsum()
-                df_time['Cumulative Second Dose'] = df_time['Second Dose Administered'].cumsum()
-
-                # Plot line chart for vaccination rate over time
-                fig = plt.figure(figsize=(10, 6))
-                plt.plot(df_time.index, df_time['Cumulative First Dose'], label="First Dose")
-                plt.plot(df_time.index, df_time['Cumulative Second Dose'], label="Second Dose")
-                plt.xlabel("Date")
-                plt.ylabel("Cumulative Doses Administered")
-                plt.title("Vaccination Rate Over Time")
-                plt.legend()
-                st.pyplot(fig)
+                figures.show('india/vaccination_rate')
             elif trends_option == "Interactive Animated Line Chart for Vaccination Coverage":
                 st.markdown("""
                 <div class="description">
@@ -833,59 +857,11 @@ def main():
                 """, unsafe_allow_html=True)
                 # Placeholder for animated visualization
                 st.write("📊 [Animated Line Chart Placeholder: Vaccination Coverage]")
-                vaccine['State'] = vaccine['State'].str.strip()  # Clean any extra spaces or characters
-                vaccine['Date'] = pd.to_datetime(vaccine['Updated On'])
-
                 # Streamlit Layout
                 st.title("Interactive Animated Line Chart for Vaccination Coverage")
 
-                # Create a dropdown to select the vaccine
-                vaccine_options = {
-                    'Covaxin': ' Covaxin (Doses Administered)',
-                    'CoviShield': 'CoviShield (Doses Administered)',
-                    'Sputnik V': 'Sputnik V (Doses Administered)',
-                    'All Vaccines': 'all'
-                }
-
-                selected_vaccine = st.selectbox(
-                    'Select Vaccine to Display:',
-                    options=list(vaccine_options.keys()),
-                    index=3  # Default to 'All Vaccines'
-                )
-
-                # Filter data based on selected vaccine
-                if selected_vaccine != 'All Vaccines':
-                    selected_vaccine_column = vaccine_options[selected_vaccine]
-                    filtered_df = vaccine[['State', 'Date', selected_vaccine_column]]
-                    fig = px.line(filtered_df, x='Date', y=selected_vaccine_column, color='State', 
-                                title=f"{selected_vaccine} Vaccination Coverage Over Time", 
-                                labels={selected_vaccine_column: "Doses Administered"})
-                else:
-                    # Reshape the data to long format for all vaccines
-                    long_df = vaccine.melt(id_vars=['State', 'Date'], 
-                                        value_vars=[' Covaxin (Doses Administered)', 
-                                                    'CoviShield (Doses Administered)', 
-                                                    'Sputnik V (Doses Administered)'],
-                                        var_name='Vaccine', 
-                                        value_name='Doses Administered')
-                    
-                    # Plot all vaccine data in long format
-                    fig = px.line(long_df, x='Date', y='Doses Administered', color='State', 
-                                line_group='Vaccine', title="All Vaccines Vaccination Coverage Over Time", 
-                                labels={"Doses Administered": "Doses Administered", "Vaccine": "Vaccine Type"})
-
-                # Customize layout for better visuals
-                fig.update_layout(
-                    title='Vaccination Coverage Over Time',
-                    xaxis_title='Date',
-                    yaxis_title='Doses Administered',
-                    hovermode='closest',
-                    template='plotly_dark',  # Change chart template for visual appeal
-                    showlegend=True
-                )
-
-                # Display the plot
-                st.plotly_chart(fig)
+                # Reruns on its own when the vaccine changes
+                vaccination_trend_view()
 
         
         
@@ -944,8 +920,9 @@ def main():
                 # Placeholder for state-wise data visualization
                 st.write("📊 [Bar Chart Placeholder: State-wise COVID-19 Data]")
                 st.header("State-wise COVID-19 Data in India")
+                statewise_data = registry.get('statewise_data')
                 st.write(statewise_data.style.background_gradient(cmap="CMRmap"))
-                st.pyplot(plot_statewise_data(statewise_data))
+                figures.show('india/statewise')
             elif india_option == "COVID-19 Cases and Deaths in India":
                 st.markdown("""
                 <div class="description">
@@ -955,28 +932,8 @@ def main():
                 """, unsafe_allow_html=True)
                 # Placeholder for cases and deaths visualization
                 st.write("📈 [Line Chart Placeholder: Cases and Deaths in India]")
-                df['Date'] = pd.to_datetime(df['Date'], dayfirst=False)
-                df = df.sort_values(by='Date')
-                daily_df = df.groupby('Date').agg({
-                    'Confirmed': 'sum',
-                    'Deaths': 'sum'
-                }).reset_index()
-
-                # Calculate daily cases and deaths
-                daily_df['daily_cases'] = daily_df['Confirmed'].diff().fillna(daily_df['Confirmed'])
-                daily_df['daily_deaths'] = daily_df['Deaths'].diff().fillna(daily_df['Deaths'])
-
-                # Calculate cumulative cases and deaths
-                daily_df['cumulative_cases'] = daily_df['Confirmed'].cumsum()
-                daily_df['cumulative_deaths'] = daily_df['Deaths'].cumsum()
-
-                # Plot Daily Cases and Deaths
-                fig1, ax1 = plt.subplots(figsize=(12, 6))
-                ax1.plot(daily_df['Date'], daily_df['daily_cases'], label='Daily Cases', color='blue')
-                ax1.plot(daily_df['Date'], daily_df['daily_deaths'], label='Daily Deaths', color='red')
-                ax1.set_title('Daily COVID-19 Cases and Deaths in India')
-
-                st.pyplot(fig1)
+                # Reruns on its own when the region changes
+                daily_cases_view()
         elif category == "Top States":
             st.markdown("""
             <div class="section">
@@ -1017,45 +974,7 @@ def main():
                 # Placeholder for top active cases visualization
                 st.write("📊 [Bar Chart Placeholder: Top States by Active Cases]")
                 st.header("Top States by Active COVID-19 Cases")
-                fig = plt.figure(figsize=(16,10))
-                plt.title("Top 10 States with Most Active Cases in India", fontsize=22, fontweight='bold')
-
-                # Assign `x` to `hue` and set `legend=False`
-                ax = sns.barplot(
-                    data=top10ActiveCases.iloc[:10], 
-                    y='Active_cases', 
-                    x='State/UnionTerritory', 
-                    hue='State/UnionTerritory',    # Assign `x` to `hue`
-                    palette='viridis', 
-                    linewidth=2, 
-                    edgecolor='black',
-                    dodge=False                     # To keep bars in single row
-                )
-
-                # Add data labels above bars
-                for p in ax.patches:
-                    ax.annotate(format(p.get_height(), ','),
-                                (p.get_x() + p.get_width() / 2., p.get_height()),
-                                ha='center', 
-                                va='center', 
-                                xytext=(0, 10), 
-                                textcoords='offset points',
-                                fontsize=12,
-                                fontweight='bold',
-                                color='black')
-
-                # Customize x and y labels
-                plt.xlabel("States", fontsize=14, fontweight='bold')
-                plt.ylabel("Total Active Cases", fontsize=14, fontweight='bold')
-
-                # Rotate x-axis labels for better readability
-                plt.xticks(rotation=45, ha='right', fontsize=12)
-                plt.yticks(fontsize=12)
-
-                # Add grid
-                plt.grid(axis='y', linestyle='--', alpha=0.7)
-
-                st.pyplot(fig)
+                render_service.show('india/top_active')
             
 
             elif india_option == "Top States by Deaths":
@@ -1068,38 +987,7 @@ def main():
                 # Placeholder for top deaths visualization
                 st.write("📊 [Bar Chart Placeholder: Top States by Deaths]")
                 st.header("Top States by Deaths")
-                top10Deaths = (
-                    covid_df.groupby('State/UnionTerritory')
-                    .apply(lambda x: x.loc[x['Deaths'].idxmax()])  # Select row with max deaths per state
-                    [['State/UnionTerritory', 'Deaths', 'Date']]
-                    .sort_values(by='Deaths', ascending=False)
-                    .reset_index(drop=True)
-                    .head(10)  # Select only top 10 states
-                )
-
-                # Optional: Rename columns if desired
-                top10Deaths.columns = ['State/UnionTerritory', 'Deaths', 'Date']
-                fig = plt.figure(figsize=(14, 8))
-                plt.title("Top 10 States with Most COVID-19 Deaths in India", fontsize=20, fontweight='bold')
-
-                sns.barplot(
-                    data=top10Deaths,
-                    y="State/UnionTerritory",
-                    x="Deaths",
-                    hue='State/UnionTerritory',   
-                    palette='Reds_r', 
-                    edgecolor='black',                
-                )
-
-                # Add data labels for each bar
-                for index, value in enumerate(top10Deaths['Deaths']):
-                    plt.text(value, index, f"{value:,}", va="center", ha="left", fontweight='bold')
-
-                plt.xlabel("Number of Deaths", fontsize=14)
-                plt.ylabel("State/Union Territory", fontsize=14)
-                plt.grid(axis='x', linestyle="--", alpha=0.7)
-
-                st.pyplot(fig)
+                render_service.show('india/top_deaths')
             elif india_option == "COVID-19 Trends for Top 10 States":
                 st.markdown("""
                 <div class="description">
@@ -1110,36 +998,7 @@ def main():
                 # Placeholder for trends visualization
                 st.write("📈 [Line Chart Placeholder: COVID-19 Trends for Top 10 States]")
                 st.header("COVID-19 Trends for Top 10 States")
-                # Filter the top 10 states
-                top_states = top10ActiveCases['State/UnionTerritory'].values
-                
-                # Convert 'Date' column to datetime format if it's not already
-                covid_df['Date'] = pd.to_datetime(covid_df['Date'])
-                
-                # Extract Month and Year from 'Date' and create a new column for Month-Year
-                covid_df['Month_Year'] = covid_df['Date'].dt.to_period('M')
-                
-                # Prepare data for plotting: Group by Month-Year and State
-                death_trends = covid_df[covid_df['State/UnionTerritory'].isin(top_states)] \
-                                .groupby(['Month_Year', 'State/UnionTerritory'])['Deaths'] \
-                                .sum().unstack()
-                
-                # Create a new figure and axis
-                fig, ax = plt.subplots(figsize=(16, 8))
-                
-                # Plotting the trends
-                sns.lineplot(data=death_trends.T, ax=ax)  # Use the transposed data
-                ax.set_title('COVID-19 Death Trends for Top 10 States (Month-Year)', fontsize=20)
-                ax.set_xlabel('Month-Year', fontsize=15)
-                ax.set_ylabel('Total Deaths', fontsize=15)
-                ax.legend(title='States', bbox_to_anchor=(1.05, 1), loc='upper left')
-                
-                # Rotate x-tick labels and adjust spacing to avoid overlap
-                plt.xticks(rotation=45, ha='right', fontsize=12)
-                plt.tight_layout()  # Adjust layout to prevent clipping of labels
-                
-                # Pass the figure to Streamlit
-                st.pyplot(fig)
+                render_service.show('india/top_death_trends')
         elif category == "Trends":
             st.markdown("""
             <div class="section">
@@ -1179,17 +1038,7 @@ def main():
                 """, unsafe_allow_html=True)
                 # Placeholder for line chart visualization
                 st.write("📈 [Line Chart Placeholder: Confirmed Cases Over Time]")
-                daily_cases = df11.groupby('Date')['Total Confirmed cases'].sum()
-                # Create the plot
-                plt.figure(figsize=(12, 6))
-                plt.plot(daily_cases, label='Total Confirmed Cases')
-                plt.xlabel('Date')
-                plt.ylabel('Confirmed Cases')
-                plt.title('Total Confirmed COVID-19 Cases Over Time')
-                plt.legend()
-
-                # Display the plot in Streamlit
-                st.pyplot(plt)
+                figures.show('india/confirmed_over_time')
             elif india_option == "Total Covid19 Confirmed Cases HEATMAP Over Time":
                 st.markdown("""
                 <div class="description">
@@ -1199,54 +1048,9 @@ def main():
                 """, unsafe_allow_html=True)
                 # Placeholder for heatmap visualization
                 st.write("🌍 [Heatmap Placeholder: Confirmed Cases Over Time]")
-                fig = px.scatter_geo(
-                    df11,
-                    lat='Latitude',
-                    lon='Longitude',
-                    hover_name='Name of State / UT',
-                    size='Total Confirmed cases',
-                    color='Total Confirmed cases',
-                    color_continuous_scale='Reds',
-                    title='Total Confirmed COVID-19 Cases by State in India Over Time',
-                    projection='natural earth',
-                    animation_frame='Date',  # Directly use 'Date' column for animation
-                    size_max=100  # Adjust bubble size for better visibility
-                )
-
-                # Set map scope to Asia and restrict to India's latitude and longitude range
-                fig.update_geos(
-                    scope='asia',
-                    lataxis_range=[5, 37],   # Approximate latitude range for India
-                    lonaxis_range=[67, 97],  # Approximate longitude range for India
-                    showcountries=True,      # Show country borders
-                    countrycolor="Black"     # Country border color
-                )
-
-                # Customize animation settings for smoother transitions
-                fig.update_layout(
-                    updatemenus=[{
-                        'buttons': [
-                            {
-                                'args': [None, {'frame': {'duration': 1000, 'redraw': True}, 'fromcurrent': True}],
-                                'label': 'Play',
-                                'method': 'animate'
-                            },
-                            {
-                                'args': [[None], {'frame': {'duration': 0, 'redraw': True}, 'mode': 'immediate', 'transition': {'duration': 0}}],
-                                'label': 'Pause',
-                                'method': 'animate'
-                            }
-                        ],
-                        'direction': 'left',
-                        'pad': {'r': 10, 't': 87},
-                        'showactive': False,
-                        'type': 'buttons',
-                        'x': 0.1,
-                        'xanchor': 'right',
-                        'y': 0,
-                        'yanchor': 'top'
-                    }]
-                )
+                # One frame per date; built once per version of the data
+                fig = figure_cache.cached('india/confirmed_map_over_time', registry.version('india_complete'),
+                                          lambda: confirmed_map_over_time_figure(get_dataset('india_complete')))
 
                 # Display the plot in Streamlit
                 st.plotly_chart(fig)
@@ -1259,163 +1063,20 @@ def main():
                 """, unsafe_allow_html=True)
                 # Placeholder for bar race visualization
                 st.write("📊 [Bar Race Placeholder: Confirmed Cases Over Time]")
-                df = pd.read_csv("/Users/ayyalashriyatha/Desktop/confirmed_cases_india.csv")
-
-                selected_states = ['Kerala', 'Maharashtra', 'Karnataka', 'Tamil Nadu', 'Uttar Pradesh', 
-                   'West Bengal', 'Delhi', 'Andhra Pradesh', 'Rajasthan', 'Bihar']
-
-                # Assuming df is already loaded with the necessary data
-                df_filtered = df[df['state'].isin(selected_states)]
-
-                # Reshape the data from wide format to long format
-                df_long = pd.melt(df_filtered, id_vars=['state'], var_name='date', value_name='cases')
-
-                # Convert 'date' to datetime format
-                df_long['date'] = pd.to_datetime(df_long['date'])
-
-                # Sort dates to ensure chronological order
-                dates = sorted(df_long['date'].unique())
-
-                # Create frames for animation
-                frames = []
-                for date in dates:
-                    df_date = df_long[df_long['date'] == date]
-                    df_date = df_date.sort_values(by='cases', ascending=False)  # Sort by cases
-                    max_cases = df_date['cases'].max()  # Maximum cases for dynamic scaling
-
-                    # Highlight the top state dynamically
-                    top_state = df_date.iloc[0]['state']
-                    top_cases = df_date.iloc[0]['cases']
-
-                    frames.append(go.Frame(
-                        data=[go.Bar(
-                            x=df_date['cases'],
-                            y=df_date['state'],
-                            orientation='h',
-                            text=df_date['cases'],
-                            hoverinfo='x+y+text',
-                            marker=dict(color=df_date['cases'], colorscale='Cividis')  # Uniform color scale
-                        )],
-                        name=str(date.date()),  # Frame name for slider
-                        layout=go.Layout(
-                            xaxis=dict(range=[0, max_cases * 1.1]),  # Dynamically set x-axis range
-                            annotations=[
-                                dict(
-                                    x=0.5, y=1.05, xref="paper", yref="paper",  # Place annotation within the paper coordinate system
-                                    text=f"Leading State: {top_state} ({top_cases} cases)",
-                                    showarrow=False,
-                                    font=dict(size=16, color='darkblue'),
-                                    align="center",
-                                    bgcolor="white",  # Add a background to avoid overlap
-                                    bordercolor="black",
-                                    borderwidth=1,
-                                ),
-                                dict(
-                                    x=0.5, y=-0.1, xref="paper", yref="paper",
-                                    text=f"Date: {date.strftime('%Y-%m-%d')}",  # Dynamically update the date
-                                    showarrow=False,
-                                    font=dict(size=16, color='black'),
-                                    align="center",
-                                    bgcolor="white",  # Add a background to avoid overlap
-                                    bordercolor="black",
-                                    borderwidth=1,
-                                )
-                            ]
-                        )
-                    ))
-
-                # Create the initial figure for the first frame
-                initial_df = df_long[df_long['date'] == dates[0]].sort_values(by='cases', ascending=False)
-                initial_max_cases = initial_df['cases'].max()  # Max cases for the first frame
-
-                fig = go.Figure(
-                    data=[go.Bar(
-                        x=initial_df['cases'],
-                        y=initial_df['state'],
-                        orientation='h',
-                        text=initial_df['cases'],
-                        hoverinfo='x+y+text',
-                        marker=dict(color=initial_df['cases'], colorscale='Cividis')
-                    )],
-                    layout=go.Layout(
-                        title="COVID-19 Confirmed Cases by State",
-                        xaxis=dict(title="Confirmed Cases", range=[0, initial_max_cases * 1.1]),
-                        yaxis=dict(title="State", autorange='reversed'),  # Reversed to have the highest on top
-                        showlegend=False,
-                        height=600,
-                        plot_bgcolor='lightgray',
-                        margin=dict(t=50, b=80, l=50, r=50),
-                        annotations=[
-                            dict(
-                                x=0.5, y=1.05, xref="paper", yref="paper",
-                                text=f"Leading State: {initial_df.iloc[0]['state']} ({initial_df.iloc[0]['cases']} cases)",
-                                showarrow=False,
-                                font=dict(size=16, color='darkblue'),
-                                align="center",
-                                bgcolor="white",
-                                bordercolor="black",
-                                borderwidth=1,
-                            ),
-                            dict(
-                                x=0.5, y=-0.1, xref="paper", yref="paper",
-                                text=f"Date: {dates[0].strftime('%Y-%m-%d')}",  # Initially display the first date
-                                showarrow=False,
-                                font=dict(size=16, color='black'),
-                                align="center",
-                                bgcolor="white",  # Add a background to avoid overlap
-                                bordercolor="black",
-                                borderwidth=1,
-                            )
-                        ],
-                        sliders=[{
-                            'steps': [
-                                {
-                                    'args': [
-                                        [str(date.date())],  # Select the frame corresponding to the date
-                                        {
-                                            'frame': {'duration': 1000, 'redraw': True},  # Slow frame duration (1000 ms)
-                                            'mode': 'immediate'
-                                        }
-                                    ],
-                                    'label': date.strftime('%Y-%m-%d'),
-                                    'method': 'animate'
-                                } for date in dates
-                            ],
-                            'transition': {'duration': 500},  # Smooth transition duration (500ms)
-                            'x': 0.1,
-                            'len': 0.9,
-                            'currentvalue': {
-                                'font': {'size': 16},
-                                'prefix': 'Date: ',
-                                'visible': True,
-                                'xanchor': 'center'
-                            },
-                            'pad': {'b': 10, 't': 50}
-                        }],
-                        updatemenus=[{
-                            'buttons': [
-                                {
-                                    'args': [None, {'frame': {'duration': 1000, 'redraw': True}, 'fromcurrent': True}],  # Slower playback
-                                    'label': 'Play',
-                                    'method': 'animate'
-                                },
-                                {
-                                    'args': [[None], {'frame': {'duration': 0, 'redraw': True}, 'mode': 'immediate'}],
-                                    'label': 'Pause',
-                                    'method': 'animate'
-                                }
-                            ],
-                            'direction': 'left',
-                            'pad': {'r': 10, 't': 70},
-                            'showactive': False,
-                            'type': 'buttons',
-                            'x': 0.1,
-                            'xanchor': 'right',
-                            'y': 0,
-                            'yanchor': 'top',
-                        }]
+                df_long = registry.get('india_confirmed_long')
+
+                # Race between the states with the most cases; daily frames or one per week
+                top_k = st.slider("Number of states", min_value=5, max_value=20, value=10)
+                cadence = st.radio("Frame interval", options=("Daily", "Every 3 days", "Weekly"), index=0, horizontal=True)
+                fig = figure_cache.cached(
+                    'india/bar_race', registry.version('india_confirmed_long'),
+                    lambda: bar_race.build_figure(
+                        df_long,
+                        top_k=top_k,
+                        step=3 if cadence == "Every 3 days" else 1,
+                        freq='W' if cadence == "Weekly" else None,
                     ),
-                    frames=frames
+                    top_k=top_k, cadence=cadence,
                 )
 
                 # Display the plot using Streamlit
@@ -1457,43 +1118,8 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
 
-                # Dropdowns for state selection with Indian states
-                state_options = [
-                    "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar", "Chhattisgarh", "Goa", 
-                    "Gujarat", "Haryana", "Himachal Pradesh", "Jharkhand", "Karnataka", "Kerala", 
-                    "Madhya Pradesh", "Maharashtra", "Manipur", "Meghalaya", "Mizoram", "Nagaland", 
-                    "Odisha", "Punjab", "Rajasthan", "Sikkim", "Tamil Nadu", "Telangana", "Tripura", 
-                    "Uttar Pradesh", "Uttarakhand", "West Bengal", "Andaman and Nicobar Islands", 
-                    "Chandigarh", "Dadra and Nagar Haveli and Daman and Diu", "Lakshadweep", "Delhi", 
-                    "Puducherry"
-                ]
-                
-                state1 = st.selectbox(
-                    "Select First State:",
-                    options=state_options,  # List of actual Indian states
-                    index=0
-                )
-                
-                state2 = st.selectbox(
-                    "Select Second State:",
-                    options=state_options,  # List of actual Indian states
-                    index=1
-                )
-
-                # Display user selections
-                st.markdown(f"""
-                <div class="description" style="margin-top: 20px;">
-                    <strong>Selected States:</strong> 
-                    <span style="color: #bb86fc;">{state1}</span> vs. <span style="color: #bb86fc;">{state2}</span>
-                </div>
-                """, unsafe_allow_html=True)
-
-                # Placeholder for comparison line chart
-                st.write("📊 [Line Chart Placeholder: Daily Cases Comparison]")
-                
-                # Call to function that compares the daily cases (Replace with your actual function)
-                if state1 and state2:
-                    compare_daily_cases_with_slider(state1, state2, df11)
+                # Reruns on its own when the states change
+                state_comparison_view()
 
         elif category == "Heat Maps":
             st.markdown("""
@@ -1541,36 +1167,8 @@ def main():
                     detailed regional insights.
                 </p>
                 """, unsafe_allow_html=True)
-                cases_by_state = df.groupby('State/UnionTerritory').agg({
-                    'Confirmed': 'sum',
-                    'Cured': 'sum',
-                    'Deaths': 'sum'
-                }).reset_index()
-                india_geo = gpd.read_file('/Users/ayyalashriyatha/Desktop/Indian_States.geojson')
-                
-                # Merge the geographical data with the cases data
-                merged = india_geo.set_index('NAME_1').join(
-                    cases_by_state.set_index('State/UnionTerritory'),
-                    how='left'  # Ensure all geographic data shows, even with missing cases data
-                )
-
-                # Fill NaN values with 0 for better visualization
-                merged = merged.fillna(0)
-
-                # Create the plot
-                fig, ax = plt.subplots(1, 1, figsize=(15, 10))
-                merged.plot(
-                    column='Confirmed',
-                    ax=ax,
-                    legend=True,
-                    legend_kwds={'label': "Number of Confirmed Cases", 'orientation': "horizontal"},
-                    cmap='OrRd'  # Colormap for heat intensity
-                )
-                ax.set_title('Geographical Heat Map of COVID-19 Confirmed Cases in India')
-                ax.set_axis_off()
-
-                # Show the figure in Streamlit
-                st.pyplot(fig)
+                # Drawn in a worker process; the page keeps a placeholder until the map is ready
+                render_service.show('india/confirmed_cases_map')
             elif india_option == "Total Covid19 Confirmed Cases HEATMAP":
                 st.markdown("""
                 <div class="description">
@@ -1586,53 +1184,15 @@ def main():
                     Note: The temporal heat map uses a color gradient to represent case density, with darker colors indicating higher counts.
                 </p>
                 """, unsafe_allow_html=True)
-                latest_data = df11.sort_values('Date').groupby('Name of State / UT').last().reset_index()
-
-                # Ensure the hover data includes state names explicitly
-                fig = px.scatter_geo(
-                    latest_data,
-                    lat='Latitude',
-                    lon='Longitude',
-                    size='Total Confirmed cases',
-                    color='Total Confirmed cases',
-                    color_continuous_scale='Viridis',
-                    title='Total Confirmed COVID-19 Cases by State in India (Latest Data)',
-                    projection='natural earth',
-                    size_max=100,
-                    template='plotly_dark',
-                    hover_data={
-                        'Name of State / UT': True,  # Ensures state name is shown
-                        'Total Confirmed cases': True,  # Explicitly include Total Confirmed Cases in hover
-                        'Latitude': False,  # Optionally exclude Latitude from hover
-                        'Longitude': False  # Optionally exclude Longitude from hover
-                    }
-                )
+                fig = figure_cache.cached('india/latest_confirmed_map', registry.version('india_complete'),
+                                          lambda: latest_confirmed_map_figure(get_dataset('india_complete')))
 
-                # Update hover template for additional customization
-                fig.update_traces(
-                    hovertemplate="<b>%{customdata[0]}</b><br>Total Confirmed Cases: %{marker.size}<extra></extra>"
-                )
+                # Display the plot in Streamlit
+                st.plotly_chart(fig)
 
-                # Set map scope and restrict to India's region
-                fig.update_geos(
-                    scope='asia',
-                    lataxis_range=[5, 37],
-                    lonaxis_range=[67, 97],
-                    showcountries=True,
-                    countrycolor="Black",
-                    showland=True,
-                    landcolor="rgb(250, 250, 250)"
-                )
+    # Live figure count and cache statistics, to spot leaks under load
+    rendering.show_diagnostics()
 
-                # Layout adjustments
-                fig.update_layout(
-                    geo=dict(showcoastlines=True, coastlinecolor="Black"),
-                    title_font=dict(size=20, color='white', family='Arial'),
-                    margin={"r":0, "t":40, "l":0, "b":0}
-                )
 
-                # Display the plot in Streamlit
-                st.plotly_chart(fig)
-    
 if __name__ == "__main__":
     main()
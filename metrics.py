@@ -0,0 +1,106 @@
+import numpy as np
+
+from cube import Cube
+
+# Length of the rolling mean, in days
+WINDOW = 7
+
+
+def _ffill(values):
+    """Forward-fill NaNs along the first (date) axis of a 2-D array."""
+    positions = np.where(np.isnan(values), 0, np.arange(len(values))[:, None])
+    np.maximum.accumulate(positions, axis=0, out=positions)
+    return values[positions, np.arange(values.shape[1])]
+
+
+def _fix(values):
+    # Negative values (corrections to the cumulative counts) and NaNs are
+    # replaced by the previous valid value, or 0 before the first one
+    fixed = _ffill(np.where(values < 0, np.nan, values))
+    return np.nan_to_num(fixed, nan=0.0)
+
+
+def _rolling_mean(values, window):
+    means = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        means[window - 1:] = np.lib.stride_tricks.sliding_window_view(values, window, axis=0).mean(axis=-1)
+    return means
+
+
+def _daily_and_average(cumulative, window):
+    # Day-to-day differences and their rolling mean along the date axis, both fixed with _fix
+    daily = np.full(cumulative.shape, np.nan)
+    daily[1:] = cumulative[1:] - cumulative[:-1]
+    daily = _fix(daily)
+    return daily, _fix(_rolling_mean(daily, window))
+
+
+def derive_series(frame, window=WINDOW):
+    """Return ``frame`` (one row per date, one column per cumulative count) with its daily metrics added.
+
+    For every column ``m`` the result gains ``daily_<m>`` and
+    ``<window>_day_avg_<m>``, computed as in ``derive``; the counts are kept
+    as they are, in float64.
+    """
+    daily, average = _daily_and_average(frame.to_numpy(dtype=np.float64), window)
+    result = frame.copy()
+    for i, metric in enumerate(frame.columns):
+        result[f"daily_{metric.lower()}"] = daily[:, i]
+    for i, metric in enumerate(frame.columns):
+        result[f"{window}_day_avg_{metric.lower()}"] = average[:, i]
+    return result
+
+
+def derive(cube, window=WINDOW, growth_metric='Confirmed', total=None):
+    """Return a cube of daily, rolling and growth metrics for every entity of ``cube``.
+
+    ``cube`` holds cumulative counts. Gaps in an entity's reporting are
+    filled with its last reported value. For each metric ``m`` of ``cube``
+    the result has
+
+    - ``m``: the gap-filled cumulative count,
+    - ``daily_<m>``: its day-to-day difference,
+    - ``<window>_day_avg_<m>``: the rolling mean of the daily values,
+
+    where negative daily values and averages are replaced by the previous
+    valid one. ``growth_rate`` is the rolling mean of
+    daily ``growth_metric`` over the previous day's cumulative count, and
+    ``doubling_time`` the days it takes to double at that rate (NaN when not
+    growing). With ``total``, an extra entity of that name holds the sum over
+    all entities.
+
+    Every metric is computed for all entities at once along the date axis.
+    """
+    n_dates, n_entities, n_metrics = cube.values.shape
+    observed = np.asarray(cube.observed)
+    values = np.where(observed[:, :, None], cube.values, np.nan).astype(np.float64)
+    cumulative = _ffill(values.reshape(n_dates, -1)).reshape(n_dates, n_entities, n_metrics)
+    # An entity is part of the panel from its first report onwards
+    observed = np.maximum.accumulate(observed, axis=0)
+    entities = list(cube.entities)
+
+    if total is not None:
+        cumulative = np.concatenate([cumulative, np.nansum(cumulative, axis=1, keepdims=True)], axis=1)
+        observed = np.concatenate([observed, observed.any(axis=1, keepdims=True)], axis=1)
+        entities.append(total)
+        n_entities += 1
+
+    flat = cumulative.reshape(n_dates, -1)
+    daily, average = _daily_and_average(flat, window)
+
+    planes, names = [], []
+    for i, metric in enumerate(cube.metrics):
+        planes += [flat[:, i::n_metrics], daily[:, i::n_metrics], average[:, i::n_metrics]]
+        names += [metric, f"daily_{metric.lower()}", f"{window}_day_avg_{metric.lower()}"]
+
+    growth = cube.metrics.index(growth_metric)
+    previous = np.full((n_dates, n_entities), np.nan)
+    previous[1:] = flat[:-1, growth::n_metrics]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth_rate = np.where(previous > 0, average[:, growth::n_metrics] / previous, np.nan)
+        doubling_time = np.where(growth_rate > 0, np.log(2) / np.log1p(growth_rate), np.nan)
+    planes += [growth_rate, doubling_time]
+    names += ['growth_rate', 'doubling_time']
+
+    return Cube(np.stack(planes, axis=2).astype(np.float32), observed, cube.dates, entities, names,
+                cube.date_name, cube.entity_name)
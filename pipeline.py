@@ -0,0 +1,105 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from data_loader import shallow_view
+
+
+class Pipeline:
+    """Declarative graph of derived frames with node-level caching.
+
+    Sources are registered with a loader and a function returning their
+    current version (e.g. the signature of the CSV they come from). Nodes are
+    registered with the names of their inputs (sources or other nodes) and the
+    parameters they accept, with defaults.
+
+    The version of a node is a hash of its name, its parameter values and the
+    versions of its inputs. A node's output is cached under that version, so
+    ``get`` only recomputes the nodes downstream of a changed source or
+    parameter. Nothing is computed until a view asks for it.
+
+    ``store`` is an optional ``store(name, version)`` callable returning a
+    precomputed output for that version of a node, or None; it is consulted
+    before a node is computed.
+    """
+
+    def __init__(self, max_variants=8, store=None):
+        self.max_variants = max_variants
+        self.store = store
+        self._sources = {}
+        self._nodes = {}
+        self._cache = {}
+        self._lock = threading.RLock()
+
+    def source(self, name, load, version):
+        self._sources[name] = (load, version)
+
+    def node(self, name, inputs=(), params=None):
+        """Decorator registering a node computed by ``func(*inputs, **params)``."""
+        def decorator(func):
+            with self._lock:
+                self._nodes[name] = (func, tuple(inputs), dict(params or {}))
+                self._cache.pop(name, None)
+            return func
+        return decorator
+
+    @property
+    def nodes(self):
+        return list(self._nodes)
+
+    def _own_params(self, name, params):
+        declared = self._nodes[name][2]
+        return {param: params.get(param, default) for param, default in declared.items()}
+
+    def _version(self, name, params, versions):
+        if name not in versions:
+            if name in self._sources:
+                versions[name] = str(self._sources[name][1]())
+            else:
+                inputs = self._nodes[name][1]
+                parts = [name, repr(sorted(self._own_params(name, params).items()))]
+                parts += [self._version(input_name, params, versions) for input_name in inputs]
+                versions[name] = hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:16]
+        return versions[name]
+
+    def _compute(self, name, params, versions):
+        if name in self._sources:
+            return self._sources[name][0]()
+
+        func, inputs, _ = self._nodes[name]
+        key = self._version(name, params, versions)
+        cache = self._cache.setdefault(name, OrderedDict())
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        result = self.store(name, key) if self.store is not None else None
+        if result is None:
+            # Inputs are passed as views so a node cannot modify its parents' cached output
+            values = [shallow_view(self._compute(input_name, params, versions)) for input_name in inputs]
+            result = func(*values, **self._own_params(name, params))
+        cache[key] = result
+        while len(cache) > self.max_variants:
+            cache.popitem(last=False)
+        return result
+
+    def get(self, name, **params):
+        """Return a view of node ``name``, computing it and any stale inputs first.
+
+        ``params`` override parameter defaults for every node in the graph
+        that declares them.
+        """
+        with self._lock:
+            return shallow_view(self._compute(name, params, {}))
+
+    def version(self, name, **params):
+        with self._lock:
+            return self._version(name, params, {})
+
+    def is_built(self, name, **params):
+        with self._lock:
+            return self._version(name, params, {}) in self._cache.get(name, {})
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
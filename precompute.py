@@ -0,0 +1,183 @@
+"""Materialise every derived frame and static figure of both dashboards.
+
+Usage::
+
+    python precompute.py [--output DIR] [--keep N] [--force]
+
+Each run writes a build directory under ``ARTIFACT_DIR`` containing
+
+- ``aggregates/``: the output of every registry node as Parquet,
+- ``figures/``: every registered figure as Plotly JSON or matplotlib PNG,
+- ``manifest.json``: the input version each file was built from,
+
+and then points ``LATEST`` at it. The dashboards serve any aggregate or
+figure whose recorded version matches the current source files, and fall
+back to computing it live otherwise. Meant to be run after the nightly data
+refresh.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import matplotlib
+
+matplotlib.use('Agg')
+
+import artifacts
+import figures
+import rendering
+from frames import registry
+
+
+def _build_id(aggregate_versions, figure_versions):
+    parts = [f"{name}={version}" for name, version in sorted(aggregate_versions.items())]
+    parts += [f"{name}={version}" for name, version in sorted(figure_versions.items())]
+    digest = hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:12]
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{digest}", digest
+
+
+def _versions(names, version):
+    # An optional input file that is missing (e.g. the state boundaries) only
+    # leaves out the aggregates and figures that read it; they are computed live
+    versions = {}
+    for name in names:
+        try:
+            versions[name] = version(name)
+        except FileNotFoundError as error:
+            print(f"skipped   {name:<28} {error.filename} not found")
+    return versions
+
+
+def _prune(output, keep):
+    builds = sorted(entry for entry in os.listdir(output)
+                    if os.path.isdir(os.path.join(output, entry)) and not entry.startswith('.'))
+    for stale in builds[:-keep] if keep > 0 else []:
+        shutil.rmtree(os.path.join(output, stale), ignore_errors=True)
+
+
+def build(output=None, keep=3, force=False):
+    """Write a new build to ``output`` and make it the latest; return its directory."""
+    output = output or artifacts.ARTIFACT_DIR
+    artifacts.ARTIFACT_DIR = output
+
+    aggregate_versions = _versions(registry.nodes, registry.version)
+    figure_versions = _versions(figures.FIGURES, figures.version)
+    build_id, digest = _build_id(aggregate_versions, figure_versions)
+
+    latest = artifacts.latest_build()
+    if not force and latest is not None and latest.endswith(f"-{digest}"):
+        print(f"{os.path.basename(latest)} is up to date")
+        return latest
+
+    tmp_dir = os.path.join(output, f".{build_id}.tmp")
+    os.makedirs(os.path.join(tmp_dir, 'aggregates'), exist_ok=True)
+    os.makedirs(os.path.join(tmp_dir, 'figures'), exist_ok=True)
+    manifest = {'build': build_id, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'aggregates': {}, 'figures': {}}
+
+    for name, version in aggregate_versions.items():
+        started = time.perf_counter()
+        entry = artifacts.write_aggregate(os.path.join(tmp_dir, 'aggregates'), name, registry.get(name))
+        manifest['aggregates'][name] = dict(entry, version=version)
+        print(f"aggregate {name:<28} {time.perf_counter() - started:6.2f}s")
+
+    for view_id, version in figure_versions.items():
+        started = time.perf_counter()
+        kind = figures.FIGURES[view_id][0]
+        filename = view_id.replace('/', '__')
+        try:
+            if kind == 'plotly':
+                filename += '.json'
+                figures.build(view_id).write_json(os.path.join(tmp_dir, 'figures', filename))
+            else:
+                # Same settings the dashboards render with, so the PNG looks like the live chart
+                filename += '.png'
+                with rendering.figure_context():
+                    image = rendering.to_bytes(figures.build(view_id))
+                with open(os.path.join(tmp_dir, 'figures', filename), 'wb') as f:
+                    f.write(image)
+        except ImportError as error:
+            # A figure drawn with an optional library (e.g. geopandas) is left to the dashboards
+            print(f"skipped   {view_id:<28} {error.name} is not installed")
+            continue
+        manifest['figures'][view_id] = {'file': filename, 'kind': kind, 'version': version}
+        print(f"figure    {view_id:<28} {time.perf_counter() - started:6.2f}s")
+
+    return _finish(output, tmp_dir, build_id, manifest, keep)
+
+
+def publish(aggregates, output=None, keep=3):
+    """Write a build holding ``aggregates`` (node name -> output) and make it the latest.
+
+    The outputs are recorded under the nodes' current versions. Every other
+    aggregate and figure of the previous build whose inputs are unchanged is
+    carried over; the rest are left to be computed live.
+    """
+    output = output or artifacts.ARTIFACT_DIR
+    artifacts.ARTIFACT_DIR = output
+    previous_dir, previous = artifacts.load_manifest()
+    previous = previous or {'aggregates': {}, 'figures': {}}
+
+    current = {
+        'aggregates': _versions(registry.nodes, registry.version),
+        'figures': _versions(figures.FIGURES, figures.version),
+    }
+    build_id, _ = _build_id(current['aggregates'], current['figures'])
+    tmp_dir = os.path.join(output, f".{build_id}.tmp")
+    os.makedirs(os.path.join(tmp_dir, 'aggregates'), exist_ok=True)
+    os.makedirs(os.path.join(tmp_dir, 'figures'), exist_ok=True)
+    manifest = {'build': build_id, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'aggregates': {}, 'figures': {}}
+
+    for section, versions in current.items():
+        for name, entry in previous[section].items():
+            if name in aggregates or versions.get(name) != entry['version']:
+                continue
+            files = [part['file'] for part in entry['parts']] if section == 'aggregates' else [entry['file']]
+            for filename in files:
+                shutil.copy2(os.path.join(previous_dir, section, filename), os.path.join(tmp_dir, section, filename))
+            manifest[section][name] = entry
+
+    for name, value in aggregates.items():
+        entry = artifacts.write_aggregate(os.path.join(tmp_dir, 'aggregates'), name, value)
+        manifest['aggregates'][name] = dict(entry, version=current['aggregates'][name])
+        print(f"aggregate {name:<28} updated")
+
+    return _finish(output, tmp_dir, build_id, manifest, keep)
+
+
+def _finish(output, tmp_dir, build_id, manifest, keep):
+    with open(os.path.join(tmp_dir, artifacts.MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    # The build directory and the LATEST pointer are both renamed into place,
+    # so a dashboard never sees a half-written build
+    build_dir = os.path.join(output, build_id)
+    os.replace(tmp_dir, build_dir)
+    pointer = os.path.join(output, f".{artifacts.LATEST}.{os.getpid()}.tmp")
+    with open(pointer, 'w') as f:
+        f.write(build_id)
+    os.replace(pointer, os.path.join(output, artifacts.LATEST))
+
+    _prune(output, keep)
+    print(f"wrote {build_dir}")
+    return build_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the COVID-19 dashboard aggregates and figures.")
+    parser.add_argument('--output', default=artifacts.ARTIFACT_DIR,
+                        help="artifact directory (default: %(default)s)")
+    parser.add_argument('--keep', type=int, default=3,
+                        help="number of builds to keep, including the new one (default: %(default)s)")
+    parser.add_argument('--force', action='store_true',
+                        help="rebuild even if the latest build matches the current sources")
+    args = parser.parse_args(argv)
+    build(args.output, keep=args.keep, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
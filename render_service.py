@@ -0,0 +1,140 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+import figures
+import rendering
+
+# Worker processes drawing the heavy static charts; 0 draws them on the
+# script thread instead. Can be overridden with the COVID_RENDER_WORKERS
+# environment variable.
+WORKERS = int(os.environ.get('COVID_RENDER_WORKERS', min(os.cpu_count() or 1, 4)))
+
+# Charts queued or being drawn at once, over all sessions; further requests
+# wait for a free slot rather than piling up in the pool
+MAX_PENDING = 4 * max(WORKERS, 1)
+
+_pool = None
+_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(MAX_PENDING)
+
+
+def _init_worker():
+    import matplotlib
+
+    matplotlib.use('Agg')
+
+
+def _render(view_id, figure_version):
+    # Runs in a worker process, which loads and keeps its own copy of the inputs
+    return rendering.draw_image(partial(figures.load, view_id, figure_version))
+
+
+def _get_pool():
+    global _pool
+    with _lock:
+        if _pool is None and WORKERS > 0:
+            # Workers are spawned rather than forked: the Streamlit server runs many threads
+            _pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_init_worker)
+        return _pool
+
+
+def _reset_pool(pool):
+    global _pool
+    with _lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _done(pool, view_id, figure_version, future):
+    _slots.release()
+    if future.cancelled():
+        return
+    if future.exception() is None:
+        rendering.images.put(view_id, figure_version, future.result(), fmt='png')
+    elif isinstance(future.exception(), BrokenProcessPool):
+        # A worker died; the next request starts a new pool
+        _reset_pool(pool)
+
+
+def submit(view_id):
+    """Start drawing registered matplotlib figure ``view_id``; return a future of its PNG bytes.
+
+    Images already in the image cache are returned at once. Otherwise the
+    figure is drawn in a worker process (on this thread with no workers)
+    and its image added to the cache when done. Blocks while
+    ``MAX_PENDING`` charts are queued.
+    """
+    figure_version = figures.version(view_id)
+    image = rendering.images.get(view_id, figure_version, fmt='png')
+    pool = _get_pool() if image is None else None
+    if pool is None:
+        future = Future()
+        future.set_result(image if image is not None else _render(view_id, figure_version))
+        return future
+
+    _slots.acquire()
+    try:
+        future = pool.submit(_render, view_id, figure_version)
+    except BrokenProcessPool:
+        _slots.release()
+        _reset_pool(pool)
+        return submit(view_id)
+    future.add_done_callback(partial(_done, pool, view_id, figure_version))
+    return future
+
+
+def run(fn, jobs):
+    """Call ``fn(job)`` for every job in the worker pool; return the results in order.
+
+    The jobs share the pool and its ``MAX_PENDING`` slots with the charts.
+    They run on this thread when there are no workers, or again here if a
+    worker dies. ``fn`` must be a module-level function.
+    """
+    pool = _get_pool()
+    if pool is None:
+        return [fn(job) for job in jobs]
+    futures = []
+    try:
+        for job in jobs:
+            _slots.acquire()
+            try:
+                future = pool.submit(fn, job)
+            except BaseException:
+                _slots.release()
+                raise
+            future.add_done_callback(lambda _: _slots.release())
+            futures.append(future)
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        return [fn(job) for job in jobs]
+
+
+def show(*view_ids):
+    """Render registered matplotlib figures in the current Streamlit page, drawing them in parallel.
+
+    Each chart first gets a placeholder, in page order, which is replaced
+    by its image as soon as that chart is ready. A chart whose worker died
+    is drawn again on this thread.
+    """
+    import streamlit as st
+
+    placeholders = {}
+    for view_id in view_ids:
+        placeholders[view_id] = st.empty()
+        placeholders[view_id].info("Rendering chart...")
+    futures = {submit(view_id): view_id for view_id in view_ids}
+    for future in as_completed(futures):
+        view_id = futures[future]
+        try:
+            image = future.result()
+        except BrokenProcessPool:
+            figure_version = figures.version(view_id)
+            image = rendering.render(view_id, figure_version, partial(figures.load, view_id, figure_version))
+        placeholders[view_id].image(image, use_container_width=True)
@@ -0,0 +1,89 @@
+import io
+import os
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+import figure_cache
+from figure_cache import FigureCache
+
+# Upper bound on the total size of the cached images, in MB.
+# Can be overridden with the COVID_IMAGE_CACHE_MB environment variable.
+MAX_MB = float(os.environ.get('COVID_IMAGE_CACHE_MB', 128))
+
+# Same settings st.pyplot and precompute.py use, so cached images look like the live charts
+DPI = 200
+
+# pyplot keeps one global list of figures and a "current" figure, so charts
+# drawn by two sessions at once must not interleave
+_pyplot_lock = threading.RLock()
+
+# Rendered images, shared by every session of the dashboards in this process
+images = FigureCache(int(MAX_MB * 2 ** 20), sizeof=len)
+
+
+@contextmanager
+def figure_context():
+    """Hold the pyplot lock and close every figure opened inside the block, even if drawing fails."""
+    with _pyplot_lock:
+        before = set(plt.get_fignums())
+        try:
+            yield
+        finally:
+            for number in set(plt.get_fignums()) - before:
+                plt.close(number)
+
+
+def live_figures():
+    """Return the number of figures pyplot holds open; it should stay at 0 between reruns."""
+    return len(plt.get_fignums())
+
+
+def to_bytes(fig, fmt='png'):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, dpi=DPI, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def draw_image(draw, fmt='png'):
+    """Return the chart drawn by ``draw()`` as ``fmt`` bytes, closing every figure it opens; nothing is cached."""
+    with figure_context():
+        chart = draw()
+        return chart if isinstance(chart, bytes) else to_bytes(chart, fmt)
+
+
+def render(view_id, version, draw, fmt='png', **params):
+    """Return the chart drawn by ``draw()`` as ``fmt`` ('png' or 'svg') bytes.
+
+    ``draw`` returns a matplotlib figure (or image bytes already in
+    ``fmt``); every figure it opens is closed once the image is saved. The
+    image is cached under ``view_id``, ``version`` and the widget values in
+    ``params``, so ``draw`` only runs when one of them changes.
+    """
+    return images.cached(view_id, version, partial(draw_image, draw, fmt), fmt=fmt, **params)
+
+
+def show(view_id, version, draw, fmt='png', **params):
+    """Render the chart drawn by ``draw()`` in the current Streamlit page (see ``render``)."""
+    import streamlit as st
+
+    image = render(view_id, version, draw, fmt, **params)
+    st.image(image.decode('utf-8') if fmt == 'svg' else image, use_container_width=True)
+
+
+def show_diagnostics():
+    """Show the live figure count and the image and figure cache statistics in the sidebar."""
+    import streamlit as st
+
+    with st.sidebar.expander("Rendering diagnostics"):
+        # Should read 0: every chart closes its figures once the image is saved
+        st.metric("Live matplotlib figures", live_figures())
+        st.dataframe(pd.DataFrame({
+            'Entries': [len(images), len(figure_cache.cache)],
+            'Size (MB)': [round(images.size / 2 ** 20, 1), round(figure_cache.cache.size / 2 ** 20, 1)],
+            'Hits': [images.hits, figure_cache.cache.hits],
+            'Misses': [images.misses, figure_cache.cache.misses],
+        }, index=['Chart images', 'Plotly figures']))
@@ -0,0 +1,152 @@
+import os
+import threading
+
+import pandas as pd
+
+from data_loader import dataset_parquet, dataset_version, get_dataset
+
+try:
+    import duckdb
+except ImportError:  # DuckDB is optional, the pandas code paths are used without it
+    duckdb = None
+
+# Set COVID_ENGINE=duckdb to run the heavy aggregates as SQL over the cached
+# Parquet copies of the datasets instead of as pandas groupbys.
+ENGINE = os.environ.get('COVID_ENGINE', 'pandas').lower()
+
+# Integer column types whose sums are cast back to the column's type
+_INTEGER_TYPES = {'TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT'}
+
+_connection = None
+_views = {}
+_lock = threading.RLock()
+
+
+def enabled():
+    return ENGINE == 'duckdb' and duckdb is not None
+
+
+def quote(identifier):
+    """Quote a column or table name for use in SQL (the datasets use '/', ' ' and '()' in names)."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def connection():
+    global _connection
+    with _lock:
+        if _connection is None:
+            if duckdb is None:
+                raise ImportError("the DuckDB engine requires the duckdb package")
+            _connection = duckdb.connect(database=':memory:')
+        return _connection
+
+
+def table(name):
+    """Register dataset ``name`` as a view (once per version of its source) and return the view name.
+
+    The view reads the cleaned Parquet copy from the cache directory, so
+    DuckDB scans only the columns and row groups a query needs. If there is
+    no Parquet copy the in-memory frame is registered instead.
+    """
+    version = dataset_version(name)
+    with _lock:
+        if _views.get(name) != version:
+            con = connection()
+            path = dataset_parquet(name)
+            if name in _views:
+                con.unregister(name)
+                con.execute(f"DROP VIEW IF EXISTS {quote(name)}")
+            if path is not None:
+                literal = path.replace("'", "''")
+                con.execute(f"CREATE OR REPLACE VIEW {quote(name)} AS SELECT * FROM read_parquet('{literal}')")
+            else:
+                con.register(name, get_dataset(name))
+            _views[name] = version
+        return name
+
+
+def query(sql, params=None):
+    """Run ``sql`` and return the result as a pandas frame.
+
+    Integer sums come back from DuckDB as 128-bit integers; they are returned
+    as int64, like pandas sums.
+    """
+    with _lock:
+        result = connection().sql(sql, params=params)
+        df = result.df()
+    for column, column_type in zip(result.columns, result.types):
+        if str(column_type) == 'HUGEINT':
+            df[column] = df[column].astype('int64')
+    return df
+
+
+def column_types(name):
+    """Return the DuckDB type of every column of dataset ``name``."""
+    with _lock:
+        relation = connection().sql(f"SELECT * FROM {quote(table(name))} LIMIT 0")
+        return {column: str(column_type) for column, column_type in zip(relation.columns, relation.types)}
+
+
+def _plain_labels(df):
+    # Text comes back as the string dtype; the pandas top-N helpers return plain object labels
+    return df.astype({column: object for column, dtype in df.dtypes.items() if isinstance(dtype, pd.StringDtype)})
+
+
+def aggregate(name, by, metrics, agg='sum', where=None, order_by=None, ascending=False, limit=None):
+    """Group dataset ``name`` by the ``by`` columns and apply ``agg`` to each metric.
+
+    ``where`` is an optional SQL predicate, ``order_by`` / ``limit`` turn the
+    result into a top-N. Sums of integer columns keep the column's type, as
+    pandas groupby sums do.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    metrics = [metrics] if isinstance(metrics, str) else list(metrics)
+    types = column_types(name)
+    columns = [quote(column) for column in by]
+    for metric in metrics:
+        expression = f"{agg}({quote(metric)})"
+        if agg == 'sum' and types[metric] in _INTEGER_TYPES:
+            expression = f"CAST({expression} AS {types[metric]})"
+        columns.append(f"{expression} AS {quote(metric)}")
+
+    sql = f"SELECT {', '.join(columns)} FROM {quote(table(name))}"
+    if where:
+        sql += f" WHERE {where}"
+    sql += f" GROUP BY {', '.join(quote(column) for column in by)}"
+    if order_by:
+        sql += f" ORDER BY {quote(order_by)} {'ASC' if ascending else 'DESC'}"
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    return query(sql)
+
+
+def top_n(name, by, metric, n, agg='max', ascending=False, where=None):
+    """Return the ``n`` groups with the largest (or smallest) ``agg`` of ``metric``; labels are plain objects."""
+    return _plain_labels(aggregate(name, by, metric, agg=agg, where=where, order_by=metric, ascending=ascending, limit=n))
+
+
+def top_k_per_group(name, by, metric, k, columns=None, ascending=False, where=None):
+    """Return whole rows: the ``k`` with the largest (or smallest) ``metric`` in every group of ``by``.
+
+    ``columns`` limits the columns returned; rows are ordered by ``metric``
+    and labels are plain objects.
+    """
+    selected = '*' if columns is None else ', '.join(quote(column) for column in columns)
+    direction = 'ASC' if ascending else 'DESC'
+    sql = f"SELECT {selected} FROM {quote(table(name))}"
+    if where:
+        sql += f" WHERE {where}"
+    sql += (f" QUALIFY row_number() OVER (PARTITION BY {quote(by)} ORDER BY {quote(metric)} {direction} NULLS LAST) <= {int(k)}"
+            f" ORDER BY {quote(metric)} {direction} NULLS LAST")
+    return _plain_labels(query(sql))
+
+
+def clear():
+    """Close the connection and forget every registered view."""
+    global _connection
+    with _lock:
+        if _connection is not None:
+            _connection.close()
+        _connection = None
+        _views.clear()
+
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+from data_loader import dataset_path, dataset_version
+
+# Rows read from a CSV at a time; bounds peak memory regardless of the file size.
+# Can be overridden with the COVID_CHUNK_ROWS environment variable.
+CHUNK_ROWS = int(os.environ.get('COVID_CHUNK_ROWS', 100_000))
+
+# Partial aggregates are merged once they hold more rows than this
+COMPACT_ROWS = 4 * CHUNK_ROWS
+
+# Sources of the animated heatmap: dataset name -> (source column -> heatmap column)
+HEATMAP_SOURCES = {
+    'india_complete': {'Date': 'Date', 'Latitude': 'Latitude', 'Longitude': 'Longitude',
+                       'Total Confirmed cases': 'Total Confirmed cases'},
+    'world_timeseries': {'Date': 'Date', 'Lat': 'Latitude', 'Long': 'Longitude',
+                         'Confirmed': 'Total Confirmed cases'},
+}
+HEATMAP_KEYS = ['Date', 'Latitude', 'Longitude']
+HEATMAP_VALUE = 'Total Confirmed cases'
+
+_store = {}
+_lock = threading.Lock()
+
+
+def read_chunks(path, columns, value, chunksize=CHUNK_ROWS, date_format='%Y-%m-%d'):
+    """Yield the rows of a CSV in chunks of at most ``chunksize`` rows.
+
+    Only the keys of ``columns`` are parsed and they are renamed to its
+    values. Rows whose ``value`` column is zero or missing, or whose Date
+    cannot be parsed, are dropped from each chunk before it is yielded.
+    """
+    dtypes = {column: 'float32' for column, renamed in columns.items() if renamed not in ('Date', value)}
+    dtypes.update({column: 'float64' for column, renamed in columns.items() if renamed == value})
+    reader = pd.read_csv(path, usecols=list(columns), dtype=dtypes, chunksize=chunksize)
+    for chunk in reader:
+        chunk = chunk.rename(columns=columns)
+        chunk = chunk[chunk[value] > 0]
+        chunk['Date'] = pd.to_datetime(chunk['Date'], format=date_format, errors='coerce')
+        yield chunk.dropna(subset=['Date'])
+
+
+def fold(chunks, keys, value, compact_rows=COMPACT_ROWS):
+    """Sum ``value`` per ``keys`` over a stream of chunks.
+
+    Each chunk is reduced to its per-key sums as soon as it is read, and the
+    partial sums are merged whenever they grow past ``compact_rows``, so
+    memory is bounded by the number of distinct keys rather than the number
+    of rows read.
+    """
+    partials = []
+    pending = 0
+    for chunk in chunks:
+        partial = chunk.groupby(keys, sort=False)[value].sum()
+        partials.append(partial)
+        pending += len(partial)
+        if pending > compact_rows and len(partials) > 1:
+            partials = [pd.concat(partials).groupby(level=keys, sort=False).sum()]
+            pending = len(partials[0])
+
+    if not partials:
+        return pd.DataFrame(columns=keys + [value])
+    return pd.concat(partials).groupby(level=keys).sum().reset_index()
+
+
+def heatmap_version():
+    versions = '|'.join(dataset_version(name) for name in HEATMAP_SOURCES)
+    return hashlib.sha1(versions.encode('utf-8')).hexdigest()[:16]
+
+
+def heatmap_points():
+    """Return the confirmed cases per date and location of every heatmap source.
+
+    The source CSVs are streamed in chunks of ``CHUNK_ROWS`` rows; the result
+    is kept in memory until one of them changes.
+    """
+    version = heatmap_version()
+    with _lock:
+        if _store.get('version') != version:
+            chunks = (chunk
+                      for name, columns in HEATMAP_SOURCES.items()
+                      for chunk in read_chunks(dataset_path(name), columns, HEATMAP_VALUE))
+            points = fold(chunks, HEATMAP_KEYS, HEATMAP_VALUE)
+            _store.update({'version': version, 'points': points})
+        return _store['points'].copy(deep=False)
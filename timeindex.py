@@ -0,0 +1,101 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+def _ordinal(date):
+    return np.datetime64(pd.Timestamp(date).date(), 'D').astype(np.int64)
+
+
+class TimeIndex:
+    """Prefix sums of daily values per entity and metric, for O(1) date-range queries.
+
+    ``prefix[d + 1, e, m]`` is the sum of the daily values of metric ``m``
+    for entity ``e`` up to and including the ``d``-th date, with a row of
+    zeros in front. All entities share one sorted array of day ordinals, so
+    a date range is two ``searchsorted`` calls and a range total is the
+    difference of two rows, whatever the length of the range.
+    """
+
+    def __init__(self, dates, entities, metrics, prefix):
+        self.dates = pd.DatetimeIndex(dates)
+        self.entities = pd.Index(entities)
+        self.metrics = list(metrics)
+        self.prefix = prefix
+        self.ordinals = self.dates.values.astype('datetime64[D]').astype(np.int64)
+
+    @classmethod
+    def from_cube(cls, cube, metrics=None):
+        """Build the index from a metrics cube (see ``metrics.derive``) for the cumulative ``metrics``.
+
+        The prefix sums run over the cube's ``daily_<m>`` values, where
+        corrections to the counts are already fixed, so ranges agree with
+        the daily charts. Whole daily values are summed as int64, anything
+        else as float64.
+        """
+        if metrics is None:
+            metrics = [metric for metric in cube.metrics if f"daily_{metric.lower()}" in cube.metrics]
+        metrics = list(metrics)
+        positions = [cube.metric_index(f"daily_{metric.lower()}") for metric in metrics]
+        daily = np.nan_to_num(np.asarray(cube.values[:, :, positions], dtype=np.float64))
+        dtype = np.int64 if np.array_equal(daily, np.round(daily)) else np.float64
+        prefix = np.zeros((len(cube.dates) + 1, len(cube.entities), len(metrics)), dtype=dtype)
+        np.cumsum(daily.astype(dtype), axis=0, out=prefix[1:])
+        return cls(cube.dates, cube.entities, metrics, prefix)
+
+    def bounds(self, start=None, end=None):
+        """Return the positions ``lo, hi`` of the dates between ``start`` and ``end`` (inclusive)."""
+        lo = 0 if start is None else int(np.searchsorted(self.ordinals, _ordinal(start), side='left'))
+        hi = len(self.ordinals) if end is None else int(np.searchsorted(self.ordinals, _ordinal(end), side='right'))
+        return lo, max(lo, hi)
+
+    def _entity_positions(self, entities):
+        if entities is None:
+            return np.arange(len(self.entities))
+        positions = self.entities.get_indexer(list(entities))
+        return positions[positions >= 0]
+
+    def total(self, metric, start=None, end=None, entities=None):
+        """Return the sum of the daily values of ``metric`` between ``start`` and ``end``, per entity."""
+        lo, hi = self.bounds(start, end)
+        positions = self._entity_positions(entities)
+        m = self.metrics.index(metric)
+        totals = self.prefix[hi, positions, m] - self.prefix[lo, positions, m]
+        return pd.Series(totals, index=self.entities[positions], name=metric)
+
+    def mean(self, metric, start=None, end=None, entities=None):
+        """Return the mean daily value of ``metric`` between ``start`` and ``end``, per entity."""
+        lo, hi = self.bounds(start, end)
+        return self.total(metric, start, end, entities) / max(hi - lo, 1)
+
+    def cumulative(self, metric, start=None, end=None, entities=None):
+        """Return the running totals of ``metric`` on the dates between ``start`` and ``end``.
+
+        The result has one row per date and one column per entity.
+        """
+        lo, hi = self.bounds(start, end)
+        positions = self._entity_positions(entities)
+        m = self.metrics.index(metric)
+        return pd.DataFrame(self.prefix[lo + 1:hi + 1, positions, m], index=self.dates[lo:hi],
+                            columns=self.entities[positions])
+
+    def daily(self, metric, start=None, end=None, entities=None):
+        """Return the daily values of ``metric`` on the dates between ``start`` and ``end``, as in the metrics cube."""
+        lo, hi = self.bounds(start, end)
+        positions = self._entity_positions(entities)
+        m = self.metrics.index(metric)
+        return pd.DataFrame(np.diff(self.prefix[lo:hi + 1, positions, m], axis=0), index=self.dates[lo:hi],
+                            columns=self.entities[positions])
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def load(name, version, load_cube, metrics=None):
+    """Return the index of cube ``name`` for ``version``, building it from ``load_cube()`` if needed."""
+    with _lock:
+        if name not in _indexes or _indexes[name][0] != version:
+            _indexes[name] = (version, TimeIndex.from_cube(load_cube(), metrics))
+        return _indexes[name][1]
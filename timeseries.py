@@ -0,0 +1,143 @@
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+import figure_cache
+
+# Width, in pixels, the line charts are downsampled to; each trace keeps at
+# most one point per pixel. Zooming in rebuilds the chart for the visible range.
+PIXEL_WIDTH = 1000
+
+# Points in a chart above which its lines are drawn with WebGL (Scattergl);
+# SVG lines slow the browser down well before this many points
+WEBGL_POINTS = 2000
+
+
+def lttb(x, y, n_out):
+    """Return the positions of the ``n_out`` points of ``(x, y)`` kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; each bucket in between keeps
+    the point forming the largest triangle with the point kept before it
+    and the mean of the next bucket, so peaks and troughs survive. ``x``
+    must be sorted and numeric; all positions are returned if there are
+    ``n_out`` points or fewer.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # n_out - 2 buckets between the first and the last point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            cx, cy = x[hi:edges[i + 2]].mean(), y[hi:edges[i + 2]].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def _numeric(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64)
+    return x.astype(np.float64)
+
+
+def _range_bounds(x, x_range):
+    # Plotly reports date ranges as strings
+    if np.issubdtype(np.asarray(x).dtype, np.datetime64):
+        return _numeric(np.array([pd.Timestamp(bound).to_datetime64() for bound in x_range]))
+    return np.asarray(x_range, dtype=np.float64)
+
+
+def downsample(x, y, width=PIXEL_WIDTH, x_range=None):
+    """Return ``x, y`` reduced to at most ``width`` points with ``lttb``.
+
+    Missing values are dropped. With ``x_range`` only the points inside it
+    (and one on either side, so the lines reach the edges of the chart)
+    are kept before downsampling, so zooming in shows full resolution.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    present = ~np.isnan(y)
+    x, y = x[present], y[present]
+    numeric = _numeric(x)
+    if x_range is not None and len(x):
+        lo, hi = _range_bounds(x, x_range)
+        start = max(int(np.searchsorted(numeric, lo, side='left')) - 1, 0)
+        end = int(np.searchsorted(numeric, hi, side='right')) + 1
+        x, y, numeric = x[start:end], y[start:end], numeric[start:end]
+    keep = lttb(numeric, y, width)
+    return x[keep], y[keep]
+
+
+def line_traces(series, width=PIXEL_WIDTH, x_range=None):
+    """Return one line trace per entry of ``series``, downsampled to ``width`` pixels.
+
+    Each entry is a dict with ``x``, ``y`` and any other Scatter properties
+    (``name``, ``line``, ``legendgroup``...). The traces are Scattergl once
+    the chart holds more than ``WEBGL_POINTS`` points after downsampling,
+    plain Scatter otherwise.
+    """
+    reduced = []
+    for entry in series:
+        x, y = downsample(entry['x'], entry['y'], width, x_range)
+        reduced.append(dict(entry, x=x, y=y))
+    trace = go.Scattergl if sum(len(entry['y']) for entry in reduced) > WEBGL_POINTS else go.Scatter
+    return [trace(**dict({'mode': 'lines'}, **entry)) for entry in reduced]
+
+
+def _build(build, x_range, width):
+    fig = build(x_range, width)
+    if fig is not None:
+        # Box selection is the zoom gesture: it asks the server for the range at full resolution
+        fig.update_layout(dragmode='select', selectdirection='h')
+        if x_range is not None:
+            fig.update_xaxes(range=list(x_range))
+    return fig
+
+
+def _selected_range(event):
+    boxes = event.selection.get('box', []) if event else []
+    return tuple(boxes[0]['x']) if boxes and len(boxes[0].get('x', [])) == 2 else None
+
+
+def show(view_id, version, build, key, width=PIXEL_WIDTH, **params):
+    """Show the line chart built by ``build(x_range, width)`` in the current Streamlit page.
+
+    ``build`` draws its lines with ``line_traces`` and returns the figure,
+    or None to show nothing. Selecting a range on the chart rebuilds it for
+    that range at full resolution; "Reset zoom" returns to the whole
+    series. Figures are cached like ``figure_cache.cached`` under
+    ``view_id``, ``version``, ``params`` and the zoomed range. ``key``
+    names the chart's state, and the chart must be shown from a fragment.
+    """
+    import streamlit as st
+
+    range_key, applied_key = f'{key}_x_range', f'{key}_applied_range'
+    x_range = st.session_state.get(range_key)
+    if x_range is not None and st.button("Reset zoom", key=f'{key}_reset'):
+        # The last selection stays applied, so the chart's stale selection is not zoomed into again
+        st.session_state[range_key] = x_range = None
+
+    fig = figure_cache.cached(view_id, version, partial(_build, build, x_range, width),
+                              x_range=x_range, width=width, **params)
+    if fig is None:
+        return
+    event = st.plotly_chart(fig, use_container_width=True, key=key, on_select='rerun', selection_mode='box')
+
+    selected = _selected_range(event)
+    if selected is not None and selected != st.session_state.get(applied_key):
+        st.session_state[range_key] = st.session_state[applied_key] = selected
+        st.rerun(scope='fragment')
@@ -0,0 +1,51 @@
+import pandas as pd
+
+
+def _plain_keys(df):
+    # Categorical keys keep every category of the full table, and charts draw
+    # one (empty) bar per category in category order; plain labels keep the ranking
+    categorical = [column for column, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    if categorical:
+        df = df.astype({column: object for column in categorical})
+    if isinstance(df.index.dtype, pd.CategoricalDtype):
+        df = df.set_axis(df.index.astype(object))
+    return df
+
+
+def top_n(df, metric, n, ascending=False):
+    """Return the ``n`` rows with the largest (or smallest) ``metric``, in order.
+
+    Uses a partial sort, so the cost is O(rows * log n) rather than a full
+    sort. Categorical columns and index come back as plain labels.
+    """
+    return _plain_keys(df.nsmallest(n, metric) if ascending else df.nlargest(n, metric))
+
+
+def top_k_per_group(df, by, metric, k, ascending=False):
+    """Return the ``k`` rows with the largest (or smallest) ``metric`` in every group of ``by``.
+
+    Whole rows are returned, so every column belongs to the selected row. The
+    result is ordered by ``metric``; ties go to the earlier row. Rows whose
+    metric is missing are never selected. Categorical columns come back as
+    plain labels.
+
+    One stable sort of all rows by ``metric``, then the first ``k`` rows of
+    every group in that order.
+    """
+    ranked = df[df[metric].notna()].sort_values(metric, ascending=ascending, kind='stable')
+    return _plain_keys(ranked.groupby(by, observed=True, sort=False).head(k))
+
+
+def max_rows(df, by, metric, n=None):
+    """Return, for every group of ``by``, the row where ``metric`` peaks.
+
+    The rows are ordered by ``metric`` from largest to smallest, so ``n``
+    keeps the top-``n`` groups.
+    """
+    rows = top_k_per_group(df, by, metric, 1)
+    return rows if n is None else rows.head(n)
+
+
+def latest_rows(df, by, date_column='Date'):
+    """Return the most recent row of every group of ``by``."""
+    return max_rows(df, by, date_column)
@@ -1,21 +1,19 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
 import plotly.express as px
-import pycountry
-import seaborn as sns
-import geopandas as gpd
-import streamlit as st
 import plotly.graph_objs as go
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-import numpy as np
 import folium
 from folium.plugins import HeatMapWithTime
-from streamlit_folium import st_folium
-import os
 import tempfile
+from functools import partial
+import choropleth
+import figure_cache
+import figures
+import heatmap
+import render_service
+import rendering
+import timeseries
+from frames import registry
 # Set page configuration
 st.set_page_config(
     page_title="Global COVID-19 Data Dashboard",
@@ -215,79 +213,132 @@ st.markdown("""
 
 
 
-# Load and prepare data
-@st.cache_data
-def load_and_prepare_data():
-    # Load global COVID-19 data
-    global_data = pd.read_csv('/Users/ayyalashriyatha/Desktop/covid_19_data.csv')
-    global_data['ObservationDate'] = pd.to_datetime(global_data['ObservationDate'])
-
-    # Fill missing values in global data
-    if 'Province/State' in global_data:
-        global_data['Province/State'] = global_data['Province/State'].fillna('Unknown')
-
-    # Clean negative values
-    for column in ['Confirmed', 'Deaths', 'Recovered']:
-        global_data[column] = global_data[column].clip(lower=0).fillna(0)
-
-    # Aggregate global data
-    global_totals = global_data.groupby('Country/Region').sum(numeric_only=True).reset_index()
-    global_totals_sum = global_totals[['Confirmed', 'Deaths', 'Recovered']].sum()
-    global_totals['Active'] = global_totals['Confirmed'] - (global_totals['Deaths'] + global_totals['Recovered'])
-    # Calculate Mortality Rate
-    global_totals['Mortality Rate'] = (global_totals['Deaths'] / global_totals['Confirmed']) * 1000
-
-    # Load India-specific COVID-19 data
-    india_data = pd.read_csv('/Users/ayyalashriyatha/Desktop/covid_19_india.csv')
-    india_data = india_data.drop(columns=["Sno", "Time", "ConfirmedIndianNational", "ConfirmedForeignNational"])
-    india_data['Active_cases'] = india_data['Confirmed'] - (india_data['Cured'] + india_data['Deaths'])
-    india_data['State/UnionTerritory'] = india_data['State/UnionTerritory'].replace({
-        'Maharashtra***': "Maharashtra",
-        'Bihar****': "Bihar",
-        'Madhya Pradesh***': "Madhya Pradesh",
-        'Karanataka': "Karnataka"
-    })
-
-    # State-wise summary data
-    statewise_data = pd.pivot_table(india_data, values=['Confirmed', 'Deaths', 'Cured'], 
-                                    index="State/UnionTerritory", aggfunc='max')
-    statewise_data['Recovery Rate'] = (statewise_data['Cured'] * 100) / statewise_data['Confirmed']
-    statewise_data['Mortality Rate'] = (statewise_data['Deaths'] * 100) / statewise_data['Confirmed']
-    statewise_data = statewise_data.sort_values(by="Confirmed", ascending=False)
-
-    return global_totals_sum, global_totals, statewise_data
-
-# Define plotting functions for professional look
-def plot_global_totals(global_totals_sum):
-    fig, ax = plt.subplots()
-    ax.bar(global_totals_sum.index, global_totals_sum.values, color=['blue', 'red', 'green'])
-    ax.set_title('Global COVID-19 Totals')
-    ax.set_xlabel('Metrics')
-    ax.set_ylabel('Count')
-    plt.xticks(rotation=45)
-    return fig
+@st.fragment
+def top_countries_view():
+    """Cumulative confirmed cases of the top 5 countries; its filters only rerun this view."""
+    global_cube = registry.get('global_cube')
 
-def plot_top_countries_active_cases(global_totals):
-    top_countries = global_totals.nlargest(10, 'Active')
-    fig, ax = plt.subplots()
-    ax.bar(top_countries['Country/Region'], top_countries['Active'], color='orange')
-    ax.set_title('Top 10 Countries by Active COVID-19 Cases')
-    plt.xticks(rotation=45)
-    return fig
+    # Top 5 affected countries by max confirmed cases
+    top_countries = global_cube.top_entities('Confirmed', 5)
+
+    # Streamlit App
+    st.title("COVID-19 Cumulative Confirmed Cases - Top 5 Countries")
+
+    # Filters sit above the chart: a fragment cannot add widgets to the sidebar
+    countries_col, start_col, end_col = st.columns([2, 1, 1])
+    selected_countries = countries_col.multiselect(
+        "Select Countries",
+        options=top_countries,
+        default=list(top_countries)
+    )
 
-def plot_top_countries_mortality(global_totals):
-    global_totals['Mortality Rate'] = (global_totals['Deaths'] / global_totals['Confirmed']).replace([float('inf'), -float('inf')], 0) * 100
-    # Drop any rows where confirmed cases are 0 to avoid infinite mortality rates
-    top_countries_mortality = global_totals[global_totals['Confirmed'] > 0].nlargest(10, 'Mortality Rate')
-    fig, ax = plt.subplots()
-    ax.bar(top_countries_mortality['Country/Region'], top_countries_mortality['Mortality Rate'], color='red')
-    ax.set_title('Top 10 Countries by Mortality Rate (%)')
-    ax.set_xlabel('Country')
-    ax.set_ylabel('Mortality Rate (%)')
-    plt.xticks(rotation=45)
+    start_date = start_col.date_input(
+        "Start Date",
+        value=global_cube.dates.min(),
+        min_value=global_cube.dates.min(),
+        max_value=global_cube.dates.max()
+    )
+
+    end_date = end_col.date_input(
+        "End Date",
+        value=global_cube.dates.max(),
+        min_value=global_cube.dates.min(),
+        max_value=global_cube.dates.max()
+    )
+
+    # Running totals of the selected countries and dates, read from the prefix-sum index
+    global_index = registry.get('global_index')
+
+    # Downsampled to the chart width; a range selected on the chart is drawn at full resolution
+    timeseries.show('world/top_cumulative', registry.version('global_index'),
+                    partial(top_cumulative_figure, global_index, selected_countries, start_date, end_date),
+                    key='top_cumulative', countries=tuple(selected_countries), start=start_date, end=end_date)
+
+    # New cases in the selected range, answered from two rows of the index per country
+    st.dataframe(pd.DataFrame({
+        'New cases': global_index.total('Confirmed', start_date, end_date, entities=selected_countries),
+        'Daily average': global_index.mean('Confirmed', start_date, end_date, entities=selected_countries),
+    }).round(0))
+
+
+def top_cumulative_figure(global_index, countries, start_date, end_date, x_range, width):
+    """Build the cumulative confirmed cases of ``countries`` between the two dates."""
+    cumulative = global_index.cumulative('Confirmed', start_date, end_date, entities=countries)
+
+    # Plot data
+    fig = go.Figure(timeseries.line_traces([
+        dict(x=cumulative.index, y=cumulative[country], name=country, line=dict(width=2))
+        for country in cumulative.columns
+    ], width, x_range))
+
+    # Customize layout
+    fig.update_layout(
+        title="Cumulative Confirmed COVID-19 Cases",
+        xaxis_title="Date",
+        yaxis_title="Confirmed Cases",
+        template="plotly_dark",
+        legend_title_text="Country",
+        hovermode="x unified",
+        margin=dict(t=50, l=20, r=20, b=50),
+        xaxis=dict(rangeselector=dict(buttons=[
+            dict(count=1, label="1m", step="month", stepmode="backward"),
+            dict(count=6, label="6m", step="month", stepmode="backward"),
+            dict(step="all")
+        ])),
+    )
     return fig
 
 
+@st.fragment
+def vaccination_bubble_view():
+    """Total vaccinations against vaccinations per 100 people; the region filter only reruns this view."""
+    df3 = registry.get('vaccination_bubbles')
+
+    # Streamlit app
+    st.title("Interactive Vaccination Data Bubble Chart")
+
+    # Dropdown to filter by WHO region
+    regions = df3['WHO_REGION'].unique()
+    selected_region = st.selectbox(
+        "Filter by WHO Region:",
+        options=['All'] + list(regions),
+        index=0
+    )
+
+    # Cached per region until the vaccination data changes
+    fig_bubble = figure_cache.cached('world/vaccination_bubbles', registry.version('vaccination_bubbles'),
+                                     lambda: vaccination_bubble_figure(df3, selected_region),
+                                     region=selected_region)
+
+    # Display the chart in Streamlit
+    st.plotly_chart(fig_bubble, use_container_width=True)
+
+
+def vaccination_bubble_figure(df3, selected_region):
+    """Build the bubble chart of the countries of ``selected_region`` ('All' for every region)."""
+    # Filter data based on the selected region
+    if selected_region != 'All':
+        filtered_df = df3[df3['WHO_REGION'] == selected_region]
+    else:
+        filtered_df = df3
+
+    # Create the bubble chart using Plotly
+    return px.scatter(
+        filtered_df, 
+        x='TOTAL_VACCINATIONS_PER100', 
+        y='TOTAL_VACCINATIONS', 
+        size='POPULATION', 
+        color='WHO_REGION', 
+        hover_name='COUNTRY', 
+        title="Vaccination Data: Total Vaccinations vs. Per 100 People",
+        labels={
+            'TOTAL_VACCINATIONS': 'Total Vaccinations',
+            'TOTAL_VACCINATIONS_PER100': 'Vaccinations per 100 People'
+        },
+        size_max=60,
+        height=600
+    )
+
 
 # Main function for dashboard
 def main():
@@ -316,92 +367,6 @@ def main():
             Use the options below to dive deep into real-time data and gain actionable insights. Stay informed, stay safe!
         </p>
     """, unsafe_allow_html=True)
-    global_totals_sum, global_totals, statewise_data = load_and_prepare_data()
-
-
-
-    df = pd.read_csv('/Users/ayyalashriyatha/Desktop/covid_19_data.csv')
-    df['ObservationDate'] = pd.to_datetime(df['ObservationDate'])
-
-    if 'Province/State' in df:
-        df['Province/State'] = df['Province/State'].fillna('Unknown')
-
-    for column in ['Confirmed', 'Deaths', 'Recovered']:
-        df[column] = df[column].clip(lower=0).fillna(0)
-    datewise_data = df.groupby('ObservationDate').sum(numeric_only=True)
-    datewise_data['Active'] = datewise_data['Confirmed'] - (datewise_data['Recovered'] + datewise_data['Deaths'])
-    datewise_data['daily_confirmed'] = datewise_data['Confirmed'].diff()
-    datewise_data['daily_recovered'] = datewise_data['Recovered'].diff()
-    datewise_data['daily_deaths'] = datewise_data['Deaths'].diff()
-    datewise_data['daily_active'] = datewise_data['Active'].diff()
-    columns_to_fix = ['daily_confirmed', 'daily_recovered', 'daily_deaths', 'daily_active']
-    for column in columns_to_fix:
-        datewise_data[column] = datewise_data[column].mask(datewise_data[column] < 0).ffill().fillna(0)
-
-    # Calculate 7-day moving average for daily cases
-    datewise_data['7_day_avg_confirmed'] = datewise_data['daily_confirmed'].rolling(window=7).mean()
-    datewise_data['7_day_avg_recovered'] = datewise_data['daily_recovered'].rolling(window=7).mean()
-    datewise_data['7_day_avg_deaths'] = datewise_data['daily_deaths'].rolling(window=7).mean()
-    datewise_data['7_day_avg_active'] = datewise_data['daily_active'].rolling(window=7).mean()
-
-    # Forward-fill any remaining NaN or negative values in the moving averages
-    columns_to_fix = ['7_day_avg_confirmed', '7_day_avg_recovered', '7_day_avg_deaths', '7_day_avg_active']
-    for column in columns_to_fix:
-        datewise_data[column] = datewise_data[column].mask(datewise_data[column] < 0).ffill().fillna(0)
-
-    # Optional: Reset the index if needed
-    datewise_data = datewise_data.reset_index()
-    df1 = pd.read_csv('/Users/ayyalashriyatha/Desktop/data.csv')
-    df1['year_week_date'] = pd.to_datetime(df1['year_week'] + '-1', format='%G-W%V-%u')
-    df1['new_cases'] = df1['new_cases'].fillna(0)
-    df1['tests_done'] = df1['tests_done'].fillna(0)
-    # Calculate positivity rate if missing
-    df1['calculated_positivity_rate'] = (df1['new_cases'] / df1['tests_done']) * 100
-
-    # Calculate positivity rate safely
-    df1['calculated_positivity_rate'] = (df1['new_cases'] / df1['tests_done']).replace([float('inf'), -float('inf')], 0) * 100
-
-    # Replace NaN or extreme positivity rates
-    df1['calculated_positivity_rate'] = df1['calculated_positivity_rate'].fillna(0)
-
-    # Optionally cap positivity rates to a reasonable maximum (e.g., 100%)
-    max_positivity_threshold = 100
-    df1['calculated_positivity_rate'] = df1['calculated_positivity_rate'].clip(upper=max_positivity_threshold)
-
-    aggregated_df = df1.groupby('year_week_date').agg(
-        tests_done=('tests_done', 'sum'),  # Sum of tests done for the week
-        calculated_positivity_rate=('calculated_positivity_rate', 'mean')  # Mean of positivity rate
-    ).reset_index()
-
-    # Calculate a rolling average for the positivity rate (e.g., 3-week rolling average)
-    aggregated_df['rolling_positivity_rate'] = aggregated_df['calculated_positivity_rate'].rolling(window=3).mean()
-    df_map = df.groupby(['ObservationDate', 'Country/Region']).agg({'Confirmed': 'sum', 'Deaths': 'sum', 'Recovered': 'sum'}).reset_index()
-
-    df_map.rename(columns={'ObservationDate': 'Date', 'Country/Region': 'Country_Region', 'Confirmed': 'ConfirmedCases', 'Deaths': 'TotalDeaths', 'Recovered': 'TotalRecovered'}, inplace=True)
-    country_iso_map = {country.name: country.alpha_3 for country in pycountry.countries}
-    df_map['iso_alpha'] = df_map['Country_Region'].map(country_iso_map)
-    df_map['Date'] = pd.to_datetime(df_map['Date'])
-
-
-    df_map['Recovery_Rate'] = (df_map['TotalRecovered'] / df_map['ConfirmedCases']) * 100
-    df_map['Mortality_Rate'] = (df_map['TotalDeaths'] / df_map['ConfirmedCases']) * 100 
-
-    df3 = pd.read_csv('/Users/ayyalashriyatha/Desktop/vaccination-data.csv')
-
-    df3 = df3.dropna(subset=['TOTAL_VACCINATIONS', 'PERSONS_VACCINATED_1PLUS_DOSE'])
-
-    # 2. Convert data types
-    # Convert 'DATE_UPDATED' to datetime format if necessary
-    if 'DATE_UPDATED' in df.columns:
-        df3['DATE_UPDATED'] = pd.to_datetime(df3['DATE_UPDATED'], errors='coerce')
-
-    # 3. Calculate additional metrics (if needed)
-    # For example, we can calculate the percentage of the population vaccinated
-    if 'PERSONS_VACCINATED_1PLUS_DOSE' in df.columns and 'PERSONS_LAST_DOSE' in df.columns:
-        df3['PERCENT_VACCINATED'] = df3['PERSONS_VACCINATED_1PLUS_DOSE'] / df3['TOTAL_VACCINATIONS'] * 100
-
-    # 4. Remove duplicates
-    df3 = df3.drop_duplicates()
 
     if option == "Home":
         # Title with a modern and engaging style
@@ -506,22 +471,7 @@ def main():
                         Explore the growth of cumulative COVID-19 cases globally over time. This section allows you to analyze the trends and rate of spread.
                     </p>
                 """, unsafe_allow_html=True)
-                plt.figure(figsize=(14, 8))
-                plt.plot(datewise_data['ObservationDate'], datewise_data['Confirmed'], label='Confirmed', color='blue')
-                plt.plot(datewise_data['ObservationDate'], datewise_data['Recovered'], label='Recovered', color='green')
-                plt.plot(datewise_data['ObservationDate'], datewise_data['Active'], label='Active', color='orange')
-                plt.plot(datewise_data['ObservationDate'], datewise_data['Deaths'], label='Deaths', color='red')
-
-                # Add labels and title
-                plt.xlabel('Date')
-                plt.ylabel('Cumulative Cases')
-                plt.title('Cumulative COVID-19 Cases Over Time')
-                plt.legend()
-                plt.grid()
-
-                # Use Streamlit to display the plot
-                st.pyplot(plt)
-                plt.close()  # Close the figure to avoid displaying it twice
+                figures.show('world/cumulative_cases')
             elif world_sub_option == "Global COVID-19 Totals":
                 st.markdown("<div class='sub-header'>Global COVID-19 Totals</div>", unsafe_allow_html=True)
                 st.markdown("""
@@ -530,8 +480,9 @@ def main():
                     </p>
                 """, unsafe_allow_html=True)
                 st.header("Global COVID-19 Totals")
+                global_totals_sum, global_totals = registry.get('global_totals')
                 st.write(global_totals_sum)
-                st.pyplot(plot_global_totals(global_totals_sum))
+                figures.show('world/global_totals')
 
         elif world_option == "COVID-19 Trends and Rates":
             st.markdown("<div class='sub-header'>COVID-19 Trends and Rates</div>", unsafe_allow_html=True)
@@ -561,65 +512,17 @@ def main():
                         Analyze the daily reported COVID-19 cases along with a 7-day moving average for smoother trend visualization. This helps understand the pattern of new cases over time.
                     </p>
                 """, unsafe_allow_html=True)
-                plt.figure(figsize=(14, 8))
-                plt.bar(datewise_data['ObservationDate'], datewise_data['daily_confirmed'], label='Daily New Cases', color='lightblue')
-                plt.bar(datewise_data['ObservationDate'], datewise_data['daily_recovered'], label='Daily Recoveries', color='lightgreen')
-                plt.bar(datewise_data['ObservationDate'], datewise_data['daily_deaths'], label='Daily Deaths', color='lightcoral')
-
-                # Plot the 7-day moving average on top of bars
-                plt.plot(datewise_data['ObservationDate'], datewise_data['7_day_avg_confirmed'], label='7-Day Avg New Cases', color='blue', linewidth=2)
-                plt.plot(datewise_data['ObservationDate'], datewise_data['7_day_avg_recovered'], label='7-Day Avg Recoveries', color='green', linewidth=2)
-                plt.plot(datewise_data['ObservationDate'], datewise_data['7_day_avg_deaths'], label='7-Day Avg Deaths', color='red', linewidth=2)
-
-                # Add labels and title
-                plt.xlabel('Date')
-                plt.ylabel('Daily Cases')
-                plt.title('Daily COVID-19 Cases with 7-Day Moving Average')
-                plt.legend()
-                plt.grid()
-
-                st.pyplot(plt)
-                plt.close()
+                figures.show('world/daily_cases')
             elif world_sub_option == "COVID-19 Cases Animated Heatmap":
             
-                                # Load the datasets
-                data_india = pd.read_csv("/Users/ayyalashriyatha/Desktop/complete.csv", encoding="cp1252")
-                data_world = pd.read_csv("/Users/ayyalashriyatha/Desktop/time-series-19-covid-combined (1).csv")
-
-                # Rename columns for consistency
-                data_world = data_world.rename(columns={
-                    "Lat": "Latitude",
-                    "Long": "Longitude",
-                    "Confirmed": "Total Confirmed cases",
-                    "Date": "Date"
-                })
-
-                # Ensure date columns are in datetime format
-                data_india["Date"] = pd.to_datetime(data_india["Date"])
-                data_world["Date"] = pd.to_datetime(data_world["Date"])
-
-                # Filter out rows with zero or missing cases
-                data_india = data_india[data_india["Total Confirmed cases"] > 0]
-                data_world = data_world[data_world["Total Confirmed cases"] > 0]
-
-                # Combine datasets
-                combined_data = pd.concat([
-                    data_india[["Latitude", "Longitude", "Total Confirmed cases", "Date"]],
-                    data_world[["Latitude", "Longitude", "Total Confirmed cases", "Date"]]
-                ], ignore_index=True)
-
-                # Group by date for HeatMapWithTime
-                grouped_data = combined_data.groupby("Date")
-
-                # Prepare heatmap data
-                heatmap_data = []
-                time_index = []
-
-                for date, group in grouped_data:
-                    heatmap_data.append(
-                        group[["Latitude", "Longitude", "Total Confirmed cases"]].values.tolist()
-                    )
-                    time_index.append(str(date.date()))  # Store date for time slider
+                # Temporal step and grid size of the animation; coarser settings give a smaller page
+                step = st.radio("Frame interval", list(heatmap.STEPS), horizontal=True)
+                grid = st.select_slider("Grid size (degrees)", options=[0, 0.5, 1, 2], value=0,
+                                        help="Merge nearby locations into cells of this size (0 keeps every location).")
+
+                # Confirmed cases per date and location, decimated and log-weighted for the map
+                prepared = registry.get('heatmap_frames', heatmap_freq=heatmap.STEPS[step], heatmap_grid=grid or None)
+                heatmap_data, time_index = heatmap.layers(prepared)
 
                 # Create base map
                 map = folium.Map(
@@ -630,7 +533,7 @@ def main():
                 )
 
                 # Add animated heatmap
-                heatmap = HeatMapWithTime(
+                heatmap_layer = HeatMapWithTime(
                     heatmap_data,
                     radius=7,  # Adjust the radius for better visualization
                     gradient={0.2: 'blue', 0.4: 'lime', 0.5: 'yellow', 0.6: 'red'},  # Color gradient
@@ -638,7 +541,7 @@ def main():
                     display_index=True,
                     index=time_index  # Pass the date information for the time slider
                 )
-                heatmap.add_to(map)
+                heatmap_layer.add_to(map)
 
                 # Streamlit app with download button to save the map
                 st.title("COVID-19 Visualization")
@@ -666,71 +569,8 @@ def main():
                         Explore the trend of weekly tests conducted and the positivity rate over time. This helps in understanding the correlation between testing and the spread of the virus.
                     </p>
                 """, unsafe_allow_html=True)
-                fig, ax1 = plt.subplots(figsize=(14, 8))
-                ax1.set_xlabel('Date', fontsize=14)
-                ax1.set_ylabel('Weekly Tests', color='blue', fontsize=14)
-                ax1.plot(aggregated_df['year_week_date'], aggregated_df['tests_done'], color='blue', label='Weekly Tests', linewidth=2)
-                ax1.tick_params(axis='y', labelcolor='blue')
-
-                # Configure grid lines for better readability
-                ax1.grid(visible=True, color='gray', linestyle='--', linewidth=0.5, alpha=0.5)
-
-                # Second y-axis for positivity rate
-                ax2 = ax1.twinx()
-                ax2.set_ylabel('Positivity Rate (%)', color='orange', fontsize=14)
-                ax2.plot(aggregated_df['year_week_date'], aggregated_df['rolling_positivity_rate'], color='orange', linestyle='-', marker='o', label='Positivity Rate (%)', linewidth=2)
-                ax2.tick_params(axis='y', labelcolor='orange')
-
-                # Set x-axis major locator and formatter for better date visibility
-                ax1.xaxis.set_major_locator(plt.MaxNLocator(nbins=10))  # Use 'nbins' instead of 'n'
-                plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')  # Rotate x-axis labels for better visibility
-
-                # Add legends
-                ax1.legend(loc='upper left')
-                ax2.legend(loc='upper right')
-
-                # Set title and layout
-                fig.suptitle('Weekly Tests and Positivity Rate Over Time', fontsize=16)
-                fig.tight_layout()
-
-                # Use Streamlit to display the plot
-                st.pyplot(fig)
-                plt.close(fig)  # Close the figure to avoid displaying it twice
-
-                fig, ax1 = plt.subplots(figsize=(16, 8))  # Adjusted size
-
-                # Plot weekly tests on the first y-axis as a bar chart
-                ax1.set_xlabel('Date', fontsize=14)
-                ax1.set_ylabel('Weekly Tests', color='blue', fontsize=14)
-                ax1.bar(aggregated_df['year_week_date'], aggregated_df['tests_done'], color='darkblue', alpha=0.6, label='Weekly Tests')
-                ax1.tick_params(axis='y', labelcolor='blue')
-
-                # Configure x-axis date format
-                ax1.xaxis.set_major_locator(mdates.MonthLocator())
-                ax1.xaxis.set_major_formatter(mdates.DateFormatter('%b %Y'))
-                plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')  # Rotate x-axis labels for better visibility
-
-                # Second y-axis for positivity rate
-                ax2 = ax1.twinx()
-                ax2.set_ylabel('Positivity Rate (%)', color='red', fontsize=14)
-
-                # Plot the rolling positivity rate with a dashed line style
-                ax2.plot(aggregated_df['year_week_date'], aggregated_df['rolling_positivity_rate'], color='red', marker='o', linestyle='--', label='Positivity Rate (%)', linewidth=2)
-                ax2.tick_params(axis='y', labelcolor='red')
-
-                # Optionally, set limits for the y-axis to improve clarity
-                ax2.set_ylim(0, aggregated_df['rolling_positivity_rate'].max() + 5)  # Adjust the limits as needed
-
-                # Add legends and grid
-                ax1.legend(loc='upper left')
-                ax2.legend(loc='upper right')
-                ax1.grid(True)
-
-                # Title and layout
-                fig.suptitle('Weekly Tests and Positivity Rate Over Time', fontsize=16)
-                fig.tight_layout()
-                st.pyplot(fig)
-                plt.close(fig)
+                # Both charts are drawn at once in worker processes
+                render_service.show('world/weekly_tests_line', 'world/weekly_tests_bar')
             elif world_sub_option == "Spread Of COVID-19 Over Time":
                 st.markdown("<div class='sub-header'>Spread of COVID-19 Over Time</div>", unsafe_allow_html=True)
                 st.markdown("""
@@ -738,32 +578,9 @@ def main():
                         Visualize the global spread of COVID-19 over time, with data on new cases and how the virus has spread across different regions.
                     </p>
                 """, unsafe_allow_html=True)
-                df['ObservationDate'] = pd.to_datetime(df['ObservationDate'])
-                df_grouped = df.groupby(['ObservationDate', 'Country/Region'], as_index=False).agg(
-                    {'Confirmed': 'sum', 'Deaths': 'sum', 'Recovered': 'sum'}
-                )
-
-                # Create the animated scatter map
-                fig = px.scatter_geo(
-                    df_grouped,
-                    locations="Country/Region",
-                    locationmode="country names",
-                    color="Confirmed",
-                    size="Confirmed",
-                    hover_name="Country/Region",
-                    animation_frame=df_grouped["ObservationDate"].dt.strftime('%Y-%m-%d'),
-                    title="Spread of COVID-19 Over Time",
-                    template="plotly_dark",
-                    color_continuous_scale="Reds",
-                )
-
-                fig.update_layout(
-                    geo=dict(showframe=False, showcoastlines=True, projection_type="natural earth"),
-                )
-
                 # Display the animation in Streamlit
                 st.title("COVID-19 Spread Over Time")
-                st.plotly_chart(fig)
+                figures.show('world/spread')
         
         elif world_option == "Top Countries by COVID-19 Metrics":
             st.markdown("<div class='sub-header'>Top Countries by COVID-19 Metrics</div>", unsafe_allow_html=True)
@@ -797,7 +614,7 @@ def main():
                     </p>
                 """, unsafe_allow_html=True)
                 st.header("Top 10 Countries by Active COVID-19 Cases")
-                st.pyplot(plot_top_countries_active_cases(global_totals))
+                figures.show('world/top_active')
 
             elif world_sub_option == "COVID-19 Confirmed Cases by Country":
                 st.markdown("<div class='sub-header'>COVID-19 Confirmed Cases by Country</div>", unsafe_allow_html=True)
@@ -807,25 +624,7 @@ def main():
                     </p>
                 """, unsafe_allow_html=True)
                 st.header("COVID-19 Confirmed Cases by Country (Latest Data)")
-                grouped_data = df.groupby(['ObservationDate', 'Country/Region']).agg({
-                    'Confirmed': 'sum',
-                    'Deaths': 'sum',
-                    'Recovered': 'sum'
-                }).reset_index()
-
-                latest_data = grouped_data[grouped_data['ObservationDate'] == grouped_data['ObservationDate'].max()]
-
-                fig = px.choropleth(
-                    latest_data,
-                    locations='Country/Region',
-                    locationmode='country names',
-                    color='Confirmed',
-                    hover_name='Country/Region',
-                    color_continuous_scale=px.colors.sequential.Plasma,
-                    labels={'Confirmed': 'Confirmed Cases'},
-                    title='COVID-19 Confirmed Cases by Country (Latest Data)'
-                )
-                st.plotly_chart(fig)
+                figures.show('world/confirmed_by_country')
 
             elif world_sub_option == "COVID-19 Cumulative Confirmed Cases in Top 5 Countries":
                 st.markdown("<div class='sub-header'>COVID-19 Cumulative Confirmed Cases in Top 5 Countries</div>", unsafe_allow_html=True)
@@ -834,77 +633,8 @@ def main():
                         See the cumulative number of confirmed COVID-19 cases in the top 5 countries, helping to understand the pandemic's overall spread.
                     </p>
                 """, unsafe_allow_html=True)
-                df['ObservationDate'] = pd.to_datetime(df['ObservationDate'])
-                df['Confirmed'] = pd.to_numeric(df['Confirmed'], errors='coerce').fillna(0)
-                df['Deaths'] = pd.to_numeric(df['Deaths'], errors='coerce').fillna(0)
-                df['Recovered'] = pd.to_numeric(df['Recovered'], errors='coerce').fillna(0)
-                df['Active Cases'] = df['Confirmed'] - df['Recovered'] - df['Deaths']
-
-                # Filter for the top 5 affected countries by max confirmed cases
-                top_countries = df.groupby('Country/Region')['Confirmed'].max().nlargest(5).index
-                df_top = df[df['Country/Region'].isin(top_countries)]
-
-                # Streamlit App
-                st.title("COVID-19 Cumulative Confirmed Cases - Top 5 Countries")
-
-                # Sidebar for filtering
-                selected_countries = st.sidebar.multiselect(
-                    "Select Countries",
-                    options=top_countries,
-                    default=list(top_countries)
-                )
-
-                start_date = st.sidebar.date_input(
-                    "Start Date",
-                    value=df['ObservationDate'].min(),
-                    min_value=df['ObservationDate'].min(),
-                    max_value=df['ObservationDate'].max()
-                )
-
-                end_date = st.sidebar.date_input(
-                    "End Date",
-                    value=df['ObservationDate'].max(),
-                    min_value=df['ObservationDate'].min(),
-                    max_value=df['ObservationDate'].max()
-                )
-
-                # Filter data based on user input
-                filtered_df = df_top[
-                    (df_top['Country/Region'].isin(selected_countries)) &
-                    (df_top['ObservationDate'] >= pd.to_datetime(start_date)) &
-                    (df_top['ObservationDate'] <= pd.to_datetime(end_date))
-                ]
-
-                # Plot data
-                fig = go.Figure()
-                for country in selected_countries:
-                    country_data = filtered_df[filtered_df['Country/Region'] == country]
-                    fig.add_trace(go.Scatter(
-                        x=country_data['ObservationDate'], 
-                        y=country_data['Confirmed'],
-                        mode='lines', 
-                        name=country,
-                        line=dict(width=2)
-                    ))
-
-                # Customize layout
-                fig.update_layout(
-                    title="Cumulative Confirmed COVID-19 Cases",
-                    xaxis_title="Date",
-                    yaxis_title="Confirmed Cases",
-                    template="plotly_dark",
-                    legend_title_text="Country",
-                    hovermode="x unified",
-                    margin=dict(t=50, l=20, r=20, b=50),
-                    xaxis=dict(rangeslider=dict(visible=True), rangeselector=dict(buttons=[
-                        dict(count=1, label="1m", step="month", stepmode="backward"),
-                        dict(count=6, label="6m", step="month", stepmode="backward"),
-                        dict(step="all")
-                    ])),
-                )
-
-                # Display the plot
-                st.plotly_chart(fig, use_container_width=True)
+                # Reruns on its own when a filter changes
+                top_countries_view()
 
             elif world_sub_option == "COVID-19 Mortality Rates by Country":
                 st.markdown("<div class='sub-header'>COVID-19 Mortality Rates by Country</div>", unsafe_allow_html=True)
@@ -913,17 +643,25 @@ def main():
                         Examine the mortality rates across countries to assess the impact of COVID-19 in different regions, which could inform health interventions.
                     </p>
                 """, unsafe_allow_html=True)
-                fig_mortality = px.choropleth(
-                    df_map,
-                    locations="iso_alpha",
-                    color="Mortality_Rate",
-                    hover_name="Country_Region",
-                    animation_frame="Date",
-                    color_continuous_scale=px.colors.sequential.Reds,
-                    title='COVID-19 Mortality Rates by Country',
-                    labels={'Mortality_Rate': 'Mortality Rate (%)'}
+
+                # One frame per day, week or month; only the z values of the selected page are sent
+                cadence = st.radio("Frame interval", list(choropleth.CADENCES), index=1, horizontal=True)
+                map_frames = registry.get('mortality_map_frames', map_freq=choropleth.CADENCES[cadence])
+                page_bounds = choropleth.pages(len(map_frames))
+                page = 0
+                if len(page_bounds) > 1:
+                    frame_labels = map_frames.index.strftime('%Y-%m-%d')
+                    page = st.select_slider(
+                        "Period",
+                        options=list(range(len(page_bounds))),
+                        format_func=lambda i: f"{frame_labels[page_bounds[i][0]]} to {frame_labels[page_bounds[i][1] - 1]}",
+                    )
+                fig = figure_cache.cached(
+                    'world/mortality_rates', registry.version('mortality_map_frames', map_freq=choropleth.CADENCES[cadence]),
+                    lambda: choropleth.build_figure(map_frames, 'COVID-19 Mortality Rates by Country', px.colors.sequential.Reds, 'Mortality Rate (%)', page=page),
+                    page=page,
                 )
-                st.plotly_chart(fig_mortality)
+                st.plotly_chart(fig, use_container_width=True)
             elif world_sub_option == "Country Clusters Based on COVID-19 Metrics":
                 st.markdown("<div class='sub-header'>Country Clusters Based on COVID-19 Metrics</div>", unsafe_allow_html=True)
                 st.markdown("""
@@ -933,33 +671,37 @@ def main():
                 """, unsafe_allow_html=True)
                 st.subheader("Country Clusters Based on COVID-19 Metrics")
 
-                # Prepare data for clustering
-                country_data = df.groupby("Country/Region")[['Confirmed', 'Deaths', 'Recovered']].sum()
-                
-                # Scale the data
-                scaler = StandardScaler()
-                scaled_data = scaler.fit_transform(country_data)
-                
-                # Apply KMeans clustering
-                kmeans = KMeans(n_clusters=4, random_state=42).fit(scaled_data)
-                country_data['Cluster'] = kmeans.labels_
+                # Number of clusters; fitted models are cached until the data or k changes
+                n_clusters = st.slider("Number of Clusters", min_value=2, max_value=10, value=4)
+                country_data = registry.get('country_clusters', n_clusters=n_clusters)
 
                 # Streamlit UI
-                st.write("The following clusters are created based on the similarity in COVID-19 metrics (Confirmed Cases, Deaths, and Recoveries):")
+                st.write("The following clusters are created based on the similarity in COVID-19 metrics (latest totals, rates per 100k people and per 100 cases, and the shape of the daily case curve):")
 
                 # Display country-wise cluster mapping
                 cluster_table = country_data.reset_index()[['Country/Region', 'Cluster']].sort_values(by='Cluster')
                 st.dataframe(cluster_table)
 
-                # Scatter Plot with Plotly
-                fig = px.scatter(
-                    country_data.reset_index(),
-                    x='Confirmed', y='Deaths',
-                    color='Cluster',
-                    hover_name='Country/Region',
-                    size='Recovered',  # Bubble size as recovery cases
-                    title="Country Clusters Based on COVID-19 Metrics",
-                    template="plotly_dark",
+                # Inertia and silhouette score for each number of clusters, to help choose k; the
+                # sweep fits a model per k, so it runs (or loads from the last build) only when asked for
+                if st.button("Compare numbers of clusters"):
+                    cluster_sweep = registry.get('cluster_sweep')
+                    st.line_chart(cluster_sweep.set_index('k')[['silhouette']])
+                    st.line_chart(cluster_sweep.set_index('k')[['inertia']])
+
+                # Scatter Plot with Plotly, cached until the data or k changes
+                fig = figure_cache.cached(
+                    'world/country_clusters', registry.version('country_clusters', n_clusters=n_clusters),
+                    lambda: px.scatter(
+                        country_data.reset_index(),
+                        x='Confirmed', y='Deaths',
+                        color='Cluster',
+                        hover_name='Country/Region',
+                        size='Recovered',  # Bubble size as recovery cases
+                        title="Country Clusters Based on COVID-19 Metrics",
+                        template="plotly_dark",
+                    ),
+                    n_clusters=n_clusters,
                 )
                 
                 # Display plot
@@ -972,18 +714,25 @@ def main():
                         Track recovery rates across countries to understand how effectively regions are managing and recovering from COVID-19.
                     </p>
                 """, unsafe_allow_html=True)
-                fig_recovery = px.choropleth(
-                    df_map,
-                    locations="iso_alpha",
-                    color="Recovery_Rate",
-                    hover_name="Country_Region",
-                    animation_frame="Date",
-                    color_continuous_scale=px.colors.sequential.Plasma,
-                    title='COVID-19 Recovery Rates by Country',
-                    labels={'Recovery_Rate': 'Recovery Rate (%)'}
-                )
 
-                st.plotly_chart(fig_recovery)
+                # One frame per day, week or month; only the z values of the selected page are sent
+                cadence = st.radio("Frame interval", list(choropleth.CADENCES), index=1, horizontal=True)
+                map_frames = registry.get('recovery_map_frames', map_freq=choropleth.CADENCES[cadence])
+                page_bounds = choropleth.pages(len(map_frames))
+                page = 0
+                if len(page_bounds) > 1:
+                    frame_labels = map_frames.index.strftime('%Y-%m-%d')
+                    page = st.select_slider(
+                        "Period",
+                        options=list(range(len(page_bounds))),
+                        format_func=lambda i: f"{frame_labels[page_bounds[i][0]]} to {frame_labels[page_bounds[i][1] - 1]}",
+                    )
+                fig = figure_cache.cached(
+                    'world/recovery_rates', registry.version('recovery_map_frames', map_freq=choropleth.CADENCES[cadence]),
+                    lambda: choropleth.build_figure(map_frames, 'COVID-19 Recovery Rates by Country', px.colors.sequential.Plasma, 'Recovery Rate (%)', page=page),
+                    page=page,
+                )
+                st.plotly_chart(fig, use_container_width=True)
 
             elif world_sub_option == "Top 10 Countries by Mortality Rate":
                 st.markdown("<div class='sub-header'>Top 10 Countries by Mortality Rate</div>", unsafe_allow_html=True)
@@ -993,9 +742,10 @@ def main():
                     </p>
                 """, unsafe_allow_html=True)
                 st.header("Top 10 Countries by Mortality Rate (%)")
-                st.pyplot(plot_top_countries_mortality(global_totals))
+                figures.show('world/top_mortality')
             
     elif option == "Vaccination Analysis":
+
     # Main option for selecting vaccination visualization type
         world_option = st.radio(
             "Select Visualization:",
@@ -1035,17 +785,7 @@ def main():
                         View the total number of COVID-19 vaccinations administered in the top 20 countries. This chart provides a comparison of vaccination efforts across regions.
                     </p>
                 """, unsafe_allow_html=True)
-                df3 = df3[df3['TOTAL_VACCINATIONS'].notna()]  # Filter out rows with NaN values in 'TOTAL_VACCINATIONS'
-                # Top 20 countries by total vaccinations
-                top_vaccinated_countries = df3.sort_values('TOTAL_VACCINATIONS', ascending=False).head(20)
-
-                fig = plt.figure(figsize=(14, 8))
-                sns.barplot(x='TOTAL_VACCINATIONS', y='COUNTRY', data=top_vaccinated_countries, hue="TOTAL_VACCINATIONS")
-                plt.title('Total Vaccinations Administered by Country (Top 20)', fontsize=18)
-                plt.xlabel('Total Vaccinations', fontsize=14)
-                plt.ylabel('Country', fontsize=14)
-                plt.grid(axis='x', linestyle='--', alpha=0.7)
-                st.pyplot(fig)
+                render_service.show('world/top_vaccinations')
 
             elif world_sub_option == "Total Vaccinations per 100 People by Country (Top 20)":
                 st.markdown("<div class='sub-header'>Top 20 Countries by Total Vaccinations per 100 People</div>", unsafe_allow_html=True)
@@ -1054,15 +794,7 @@ def main():
                         Explore the top 20 countries with the highest number of vaccinations administered per 100 people. This metric highlights the relative vaccination effort in each country.
                     </p>
                 """, unsafe_allow_html=True)
-                top_vaccination_rate_countries = df3.sort_values('TOTAL_VACCINATIONS_PER100', ascending=False).head(20)
-
-                fig = plt.figure(figsize=(14, 8))
-                sns.barplot(x='TOTAL_VACCINATIONS_PER100', y='COUNTRY', data=top_vaccination_rate_countries, hue="TOTAL_VACCINATIONS_PER100")
-                plt.title('Total Vaccinations per 100 People by Country (Top 20)', fontsize=18)
-                plt.xlabel('Total Vaccinations per 100 People', fontsize=14)
-                plt.ylabel('Country', fontsize=14)
-                plt.grid(axis='x', linestyle='--', alpha=0.7)
-                st.pyplot(fig)
+                render_service.show('world/top_vaccination_rates')
             
             elif world_sub_option == "Choropleth Map of Percentage Vaccinated with at Least One Dose by Country":
                 st.markdown("<div class='sub-header'>Choropleth Map of Vaccination Percentage by Country</div>", unsafe_allow_html=True)
@@ -1071,28 +803,7 @@ def main():
                         Visualize a choropleth map showing the percentage of people vaccinated with at least one dose across countries. This map provides a global overview of vaccination progress.
                     </p>
                 """, unsafe_allow_html=True)
-                df3 = df3[df3['TOTAL_VACCINATIONS'].notnull()]  # Keep only rows with total vaccinations
-                df3 = df3[df3['COUNTRY'].notnull()]  # Ensure country names are present
-
-                # Optionally, convert 'WHO_REGION' to a categorical type for better visualization
-                df3['WHO_REGION'] = df3['WHO_REGION'].astype('category')
-
-                df3['PERCENT_VACCINATED_1PLUS_DOSE'] = (df3['PERSONS_VACCINATED_1PLUS_DOSE'] / df3['TOTAL_VACCINATIONS']) * 100
-
-                # Create a choropleth map
-                fig = px.choropleth(
-                    df3,
-                    locations='ISO3',  # Use ISO3 codes for location matching
-                    color='PERCENT_VACCINATED_1PLUS_DOSE',  # Data to be represented
-                    hover_name='COUNTRY',  # Hover data
-                    color_continuous_scale=px.colors.sequential.Plasma,  # Color scale
-                    labels={'PERCENT_VACCINATED_1PLUS_DOSE': 'Percentage Vaccinated (1+ Dose)'},
-                    title='Choropleth Map of Percentage Vaccinated with at Least One Dose by Country'
-                )
-
-                # Show the figure
-                fig.update_geos(showcoastlines=True, coastlinecolor="Black", showland=True, landcolor="LightGreen")
-                st.plotly_chart(fig)
+                figures.show('world/vaccination_coverage')
             elif world_sub_option == "Total Vaccinations vs Per 100 People":
                 st.markdown("<div class='sub-header'>Total Vaccinations vs Vaccinations per 100 People</div>", unsafe_allow_html=True)
                 st.markdown("""
@@ -1100,47 +811,8 @@ def main():
                         Compare the total number of vaccinations administered against the number of vaccinations per 100 people. This visualization helps identify the countries with the highest absolute and relative vaccination coverage.
                     </p>
                 """, unsafe_allow_html=True)
-                df3.dropna(subset=['TOTAL_VACCINATIONS', 'TOTAL_VACCINATIONS_PER100'], inplace=True)
-
-                # Add a 'Population' column (assumed from 'Total Vaccinations' and 'Vaccinations per 100 people')
-                df3['POPULATION'] = (df3['TOTAL_VACCINATIONS'] / df3['TOTAL_VACCINATIONS_PER100']) * 100
-
-                # Streamlit app
-                st.title("Interactive Vaccination Data Bubble Chart")
-
-                # Dropdown to filter by WHO region
-                regions = df3['WHO_REGION'].unique()
-                selected_region = st.selectbox(
-                    "Filter by WHO Region:",
-                    options=['All'] + list(regions),
-                    index=0
-                )
-
-                # Filter data based on the selected region
-                if selected_region != 'All':
-                    filtered_df = df3[df3['WHO_REGION'] == selected_region]
-                else:
-                    filtered_df = df3
-
-                # Create the bubble chart using Plotly
-                fig_bubble = px.scatter(
-                    filtered_df, 
-                    x='TOTAL_VACCINATIONS_PER100', 
-                    y='TOTAL_VACCINATIONS', 
-                    size='POPULATION', 
-                    color='WHO_REGION', 
-                    hover_name='COUNTRY', 
-                    title="Vaccination Data: Total Vaccinations vs. Per 100 People",
-                    labels={
-                        'TOTAL_VACCINATIONS': 'Total Vaccinations',
-                        'TOTAL_VACCINATIONS_PER100': 'Vaccinations per 100 People'
-                    },
-                    size_max=60,
-                    height=600
-                )
-
-                # Display the chart in Streamlit
-                st.plotly_chart(fig_bubble, use_container_width=True)
+                # Reruns on its own when the region changes
+                vaccination_bubble_view()
 
         
         elif world_option == "Global Vaccination Insights":
@@ -1165,14 +837,7 @@ def main():
                         Explore the total number of COVID-19 vaccinations administered by WHO region. This visualization breaks down vaccination efforts globally, highlighting progress by region.
                     </p>
                 """, unsafe_allow_html=True)
-                region_vaccinations = df3.groupby('WHO_REGION')['TOTAL_VACCINATIONS'].sum().reset_index()
-                fig = plt.figure(figsize=(10, 6))
-                sns.barplot(x='TOTAL_VACCINATIONS', y='WHO_REGION', data=region_vaccinations, hue='TOTAL_VACCINATIONS')
-                plt.title('Total Vaccinations by WHO Region', fontsize=18)
-                plt.xlabel('Total Vaccinations', fontsize=14)
-                plt.ylabel('WHO Region', fontsize=14)
-                plt.grid(axis='x', linestyle='--', alpha=0.7)
-                st.pyplot(fig)
+                render_service.show('world/who_region_vaccinations')
 
             elif world_sub_option == "Vaccination Stages by Top 10 Countries":
                 st.markdown("<div class='sub-header'>Vaccination Stages by Top 10 Countries</div>", unsafe_allow_html=True)
@@ -1181,20 +846,7 @@ def main():
                         See the current vaccination stages for the top 10 countries with the highest vaccination totals. This visualization provides a clear comparison of the stages each country is in regarding vaccinations (e.g., first dose, second dose, fully vaccinated).
                     </p>
                 """, unsafe_allow_html=True)
-                top_countries = df3.nlargest(10, 'TOTAL_VACCINATIONS')
-                # Select necessary columns for stacked bar chart
-                df_stacked = top_countries[['COUNTRY', 'PERSONS_VACCINATED_1PLUS_DOSE', 'PERSONS_LAST_DOSE', 'PERSONS_BOOSTER_ADD_DOSE']]
-                df_stacked.set_index('COUNTRY').plot(kind='bar', stacked=True, figsize=(14, 7), color=['skyblue', 'orange', 'green'])
-
-                # Customize chart
-                plt.title('Vaccination Stages by Top 10 Countries')
-                plt.xlabel('Country')
-                plt.ylabel('Number of Vaccinations')
-                plt.legend(title='Vaccination Type', labels=['1+ Dose', 'Last Dose', 'Booster Dose'])
-                plt.xticks(rotation=45)
-
-                # Display chart in Streamlit
-                st.pyplot(plt.gcf())
+                figures.show('world/vaccination_stages')
             
         elif world_option == "Vaccination Trends and Totals":
             st.markdown("<div class='sub-header'>Vaccination Trends and Totals</div>", unsafe_allow_html=True)
@@ -1220,19 +872,7 @@ def main():
                         This visualization tracks the global cumulative total of COVID-19 vaccinations over time. It allows you to observe the overall progress in vaccination campaigns worldwide and identify key milestones.
                     </p>
                 """, unsafe_allow_html=True)
-                if 'DATE_UPDATED' in df3.columns:
-                    df3['DATE_UPDATED'] = pd.to_datetime(df3['DATE_UPDATED'], errors='coerce')
-                    df3.set_index('DATE_UPDATED', inplace=True)
-
-                fig = plt.figure(figsize=(14, 8))
-                cumulative_vaccinations = df3['TOTAL_VACCINATIONS'].resample('ME').sum().cumsum()
-                sns.lineplot(x=cumulative_vaccinations.index, y=cumulative_vaccinations, color='blue')
-                plt.title('Cumulative Vaccinations Over Time', fontsize=18)
-                plt.xlabel('Date', fontsize=14)
-                plt.ylabel('Cumulative Total Vaccinations', fontsize=14)
-                plt.xticks(rotation=45)
-                plt.grid()
-                st.pyplot(fig)
+                figures.show('world/cumulative_vaccinations')
 
             elif world_sub_option == "Booster Doses Administered by Country (Top 20)":
                 st.markdown("<div class='sub-header'>Booster Doses Administered by Country (Top 20)</div>", unsafe_allow_html=True)
@@ -1241,17 +881,11 @@ def main():
                         Explore the number of booster doses administered by the top 20 countries. This visualization highlights countries leading in booster dose campaigns, showcasing their commitment to increasing immunity and addressing variants.
                     </p>
                 """, unsafe_allow_html=True)
-                top_booster_countries = df3.sort_values('PERSONS_BOOSTER_ADD_DOSE', ascending=False).head(20)
-                fig = plt.figure(figsize=(14, 8))
-                sns.barplot(x='PERSONS_BOOSTER_ADD_DOSE', y='COUNTRY', data=top_booster_countries, hue="PERSONS_BOOSTER_ADD_DOSE")
-                plt.title('Booster Doses Administered by Country (Top 20)', fontsize=18)
-                plt.xlabel('Number of Booster Doses Administered', fontsize=14)
-                plt.ylabel('Country', fontsize=14)
-                plt.grid(axis='x', linestyle='--', alpha=0.7)
-                st.pyplot(fig)
-            
+                render_service.show('world/top_boosters')
+
+    # Live figure count and cache statistics, to spot leaks under load
+    rendering.show_diagnostics()
 
 
-        
 if __name__ == "__main__":
     main()